@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Adaptive Limits - AIMD concurrency control for scrapes and searches
+
+Each kind of outbound work (browser scrapes, web searches) gets its own
+limit on how many run at once. After every window of completed calls the
+limit is adjusted from what that window saw:
+
+    errors above max_error_rate, or median latency well above the
+    baseline (or p95 above a set target)  ->  limit x backoff (halve)
+    otherwise, if the limit was actually reached  ->  limit + 1
+
+The baseline is the lowest median latency seen recently; it drifts up a
+little every window so a slow evening doesn't pin the limit at minimum.
+
+Only batch and worker runs turn limits on (set_limits); without them,
+limited() doesn't wait for anything.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+# Default bounds for batch runs
+SCRAPE_LIMIT_MAX = 6
+SEARCH_LIMIT_MAX = 24
+
+# Completed calls per adjustment
+WINDOW = 20
+
+# Overloaded when more than this fraction fails...
+MAX_ERROR_RATE = 0.1
+# ...or the window's median latency exceeds the baseline by this factor
+LATENCY_TOLERANCE = 2.0
+# Multiplicative decrease
+BACKOFF = 0.5
+# Baseline creep per window, so it follows slow changes in latency
+BASELINE_DRIFT = 1.05
+
+class SlotTimeout(TimeoutError):
+    """No slot came free within the caller's timeout"""
+
+class AdaptiveLimit:
+    """Concurrency limit for one kind of call, adjusted additively up and multiplicatively down"""
+
+    def __init__(self, name, initial, minimum=1, maximum=16, target_latency=None, window=WINDOW,
+                 max_error_rate=MAX_ERROR_RATE, latency_tolerance=LATENCY_TOLERANCE, backoff=BACKOFF):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = max(minimum, min(initial, maximum))
+        self.target_latency = target_latency
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self._samples = []
+        self._saturated = False
+        self.baseline = None
+        self.last_window = {}
+        self._counters = {'calls': 0, 'errors': 0, 'increases': 0, 'decreases': 0, 'waits': 0}
+
+    def acquire(self, timeout=None):
+        """Wait for a free slot; returns the start time to pass to release(), None on timeout"""
+
+        with self._cond:
+            if self.in_flight >= self.limit:
+                self._counters['waits'] += 1
+                self._saturated = True
+            if not self._cond.wait_for(lambda: self.in_flight < self.limit, timeout):
+                return None
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+        return time.monotonic()
+
+    def release(self, started, ok=True):
+        """Free a slot and record how the call went"""
+
+        latency = time.monotonic() - started
+
+        with self._cond:
+            self.in_flight -= 1
+            self._counters['calls'] += 1
+            self._counters['errors'] += not ok
+            self._samples.append((latency, ok))
+            if len(self._samples) >= self.window:
+                self._adjust()
+            self._cond.notify_all()
+
+    def mark_saturated(self):
+        """Count this window as limit-bound when callers queue for it elsewhere (e.g. worker claims)"""
+
+        with self._cond:
+            self._saturated = True
+
+    def _adjust(self):
+        latencies = sorted(latency for latency, _ in self._samples)
+        errors = sum(not ok for _, ok in self._samples)
+        error_rate = errors / len(self._samples)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+        # Baseline from successful windows only: failures are often fast
+        if error_rate <= self.max_error_rate:
+            self.baseline = p50 if self.baseline is None else min(p50, self.baseline * BASELINE_DRIFT)
+
+        overloaded = (
+            error_rate > self.max_error_rate
+            or (self.baseline is not None and p50 > self.baseline * self.latency_tolerance)
+            or (self.target_latency is not None and p95 > self.target_latency)
+        )
+
+        if overloaded and self.limit > self.minimum:
+            self.limit = max(self.minimum, int(self.limit * self.backoff))
+            self._counters['decreases'] += 1
+        elif not overloaded and self._saturated and self.limit < self.maximum:
+            self.limit += 1
+            self._counters['increases'] += 1
+
+        self.last_window = {'p50': round(p50, 3), 'p95': round(p95, 3), 'error_rate': round(error_rate, 3)}
+        self._samples = []
+        self._saturated = False
+
+    def metrics(self):
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'in_flight': self.in_flight,
+                'min': self.minimum,
+                'max': self.maximum,
+                'baseline': round(self.baseline, 3) if self.baseline is not None else None,
+                **self.last_window,
+                **self._counters,
+            }
+
+def make_limits(scrapes=2, searches=8, max_scrapes=SCRAPE_LIMIT_MAX, max_searches=SEARCH_LIMIT_MAX,
+                fixed=False):
+    """
+    Separate scrape and search limits starting at the given concurrency
+
+    fixed: pin both at the starting concurrency (still measured and reported)
+    """
+
+    if fixed:
+        return {
+            'scrape': AdaptiveLimit('scrape', scrapes, minimum=scrapes, maximum=scrapes),
+            'search': AdaptiveLimit('search', searches, minimum=searches, maximum=searches),
+        }
+
+    return {
+        'scrape': AdaptiveLimit('scrape', scrapes, maximum=max(scrapes, max_scrapes)),
+        'search': AdaptiveLimit('search', searches, maximum=max(searches, max_searches)),
+    }
+
+# ============================================================================
+# PROCESS-WIDE LIMITS
+# ============================================================================
+
+_limits = None
+
+def set_limits(limits):
+    """Make limits (from make_limits) the ones limited() uses; None = unlimited"""
+
+    global _limits
+    _limits = limits
+
+def get_limits():
+    return _limits
+
+def limits_metrics():
+    """Current limit, latency and counters per kind ({} when not active)"""
+
+    limits = _limits
+    return {kind: limit.metrics() for kind, limit in limits.items()} if limits else {}
+
+class Outcome:
+    """Set ok = False inside limited() when the call failed without raising"""
+
+    def __init__(self):
+        self.ok = True
+
+@contextmanager
+def limited(kind, timeout=None):
+    """Hold a slot of the active `kind` limit (if any) around a call; SlotTimeout after timeout seconds"""
+
+    limit = _limits.get(kind) if _limits else None
+    outcome = Outcome()
+
+    if limit is None:
+        yield outcome
+        return
+
+    started = limit.acquire(timeout)
+    if started is None:
+        raise SlotTimeout(f"No {kind} slot free within {timeout:.1f}s")
+    try:
+        yield outcome
+    except BaseException:
+        outcome.ok = False
+        raise
+    finally:
+        limit.release(started, outcome.ok)
+
+def format_limits(metrics):
+    """One-line summary, e.g. for periodic progress output"""
+
+    return '   '.join(
+        f"{kind} {m['limit']}/{m['max']} (in flight {m['in_flight']}, "
+        f"p95 {m.get('p95', 0):.1f}s, errors {m.get('error_rate', 0):.0%})"
+        for kind, m in metrics.items()
+    )
+
+def report_periodically(interval, stop_event, output=print):
+    """Print format_limits() every interval seconds until stop_event is set"""
+
+    def run():
+        while not stop_event.wait(interval):
+            metrics = limits_metrics()
+            if metrics:
+                output(f"[limits] {format_limits(metrics)}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Scanner HTTP API - JSON service for other applications
+
+Endpoints:
+    POST /scan          {"url": "<any LinkedIn job URL>", "wait": 0}
+    POST /scan/batch    {"urls": [...]}
+    GET  /scans/<id>    poll a queued scan
+    GET  /health        capacity and queue depth
+    GET  /metrics       browsers and their memory use, launch times, queue waits, research refreshes
+
+Stored results are returned immediately (200). Anything else is queued and
+answered with 202 plus a poll URL; pass "wait" (seconds) to hold the request
+open briefly for fast scans. When the queue is full the API answers 503 with
+Retry-After, so a load balancer can send the request to another instance.
+
+POST /scan is interactive and /scan/batch is batch work (scan_scheduler.py):
+queued interactive scans start before batch scans, and batch submissions
+can't fill the last pending entries.
+
+Usage:
+    python api.py --port 8080 --max-concurrent-scans 2 --max-pending 50
+    python api.py --queue sqlite:///tasks.db     # hand scans to worker.py instead
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from job_urls import normalize_job_url
+from scan_scheduler import BATCH, INTERACTIVE, PriorityScheduler, scan_priority
+from scan_store import get_default_store
+
+# Serve stored results younger than this without re-scanning (seconds)
+RESULT_MAX_AGE = int(os.environ.get('API_RESULT_MAX_AGE', 24 * 3600))
+
+# Longest a client may hold a request open with "wait"
+MAX_WAIT = 30
+
+# Most URLs accepted in one batch request
+MAX_BATCH_SIZE = 100
+
+# ============================================================================
+# SCAN RUNNERS
+# ============================================================================
+
+class LocalScanRunner:
+    """Runs scans in this process, max_concurrent_scans at a time, interactive first"""
+
+    def __init__(self, max_concurrent_scans=2, max_pending=50, store=None, scan_deadline=None):
+        self.max_concurrent_scans = max_concurrent_scans
+        self.max_pending = max_pending
+        # Pending entries only interactive scans may take (never all of them,
+        # or batch scans could never be queued)
+        self.interactive_reserve = min(max(1, max_pending // 10), max_pending - 1)
+        self.store = store
+        self.scan_deadline = scan_deadline
+        self._scheduler = PriorityScheduler('scans', max_concurrent_scans)
+        self._lock = threading.Lock()
+        self._scans = {}
+
+    def _active(self):
+        return sum(1 for scan in self._scans.values() if scan['status'] in ('queued', 'running'))
+
+    def submit(self, job_id, job_url, priority=INTERACTIVE):
+        """Queue a scan; returns False when at capacity"""
+
+        with self._lock:
+            scan = self._scans.get(job_id)
+            if scan and scan['status'] in ('queued', 'running'):
+                return True
+            limit = self.max_pending if priority == INTERACTIVE else self.max_pending - self.interactive_reserve
+            if self._active() >= limit:
+                return False
+
+            scan = {'status': 'queued', 'done': threading.Event(), 'result': None,
+                    'error': None, 'finished_at': None}
+            self._scans[job_id] = scan
+
+        # One thread per pending scan (at most max_pending); the scheduler
+        # decides which of them run
+        threading.Thread(target=self._run, args=(job_id, job_url, scan, priority), daemon=True).start()
+        return True
+
+    def _run(self, job_id, job_url, scan, priority):
+        from detector_scam import scan_linkedin_job
+
+        try:
+            with self._scheduler.slot(priority), scan_priority(priority):
+                scan['status'] = 'running'
+                scan['result'] = scan_linkedin_job(
+                    job_url, verbose=False, store=self.store, deadline=self.scan_deadline
+                )
+            if scan['result']:
+                scan['status'] = 'done'
+            else:
+                # e.g. "expired: Posting has expired or ..." (see ScrapeFailure)
+                scan['status'] = 'failed'
+                scan['error'] = str(scan['result']) if scan['result'] is not None else 'error: Could not scrape job data'
+                scan['result'] = None
+        except Exception as e:
+            scan['status'] = 'failed'
+            scan['error'] = str(e)
+        finally:
+            scan['finished_at'] = time.time()
+            scan['done'].set()
+            self._evict_finished()
+
+    def _evict_finished(self, keep_seconds=3600):
+        cutoff = time.time() - keep_seconds
+        with self._lock:
+            for job_id in [job_id for job_id, scan in self._scans.items()
+                           if scan['finished_at'] and scan['finished_at'] < cutoff]:
+                del self._scans[job_id]
+
+    def status(self, job_id, wait=0):
+        """{'status', 'result', 'error'} for a submitted scan, or None"""
+
+        scan = self._scans.get(job_id)
+        if not scan:
+            return None
+        if wait:
+            scan['done'].wait(wait)
+
+        return {'status': scan['status'], 'result': scan['result'], 'error': scan['error']}
+
+    def health(self):
+        with self._lock:
+            active = self._active()
+        return {'mode': 'local', 'max_concurrent_scans': self.max_concurrent_scans,
+                'pending': active, 'max_pending': self.max_pending,
+                'scheduler': self._scheduler.metrics()}
+
+class QueueScanRunner:
+    """Hands scans to distributed workers through the shared task queue"""
+
+    STATUS_NAMES = {'pending': 'queued', 'claimed': 'running', 'done': 'done', 'dead': 'failed'}
+
+    def __init__(self, queue_url):
+        from task_queue import open_task_queue
+        self.task_queue = open_task_queue(queue_url)
+
+    def submit(self, job_id, job_url, priority=INTERACTIVE):
+        # Workers claim tasks in queue order; priority only applies locally
+        self.task_queue.enqueue(job_id, job_url)
+        return True
+
+    def status(self, job_id, wait=0):
+        deadline = time.time() + wait
+
+        while True:
+            task = self.task_queue.get_task(job_id)
+            if not task:
+                return None
+
+            status = self.STATUS_NAMES.get(task['status'], task['status'])
+            if status in ('done', 'failed') or time.time() >= deadline:
+                return {'status': status, 'result': task['result'], 'error': task['last_error']}
+            time.sleep(0.5)
+
+    def health(self):
+        return {'mode': 'queue', 'tasks': self.task_queue.stats()}
+
+# ============================================================================
+# REQUEST HANDLING
+# ============================================================================
+
+class ScanService:
+    """Normalization, cache lookups and submission shared by all endpoints"""
+
+    def __init__(self, runner, store=None):
+        self.runner = runner
+        self.store = store
+
+    def cached_result(self, job_id):
+        if not self.store:
+            return None
+
+        previous = self.store.get_scan(job_id)
+        if previous and time.time() - previous['scanned_at'] <= RESULT_MAX_AGE:
+            return previous['result']
+        return None
+
+    def request_scan(self, job_url, wait=0, priority=INTERACTIVE):
+        """Returns (http_status, body) for one URL"""
+
+        # JSON bodies can hold anything: numbers, lists, null
+        job_id, view_url = normalize_job_url(job_url) if isinstance(job_url, str) else (None, None)
+        if not job_id or 'linkedin.com/jobs' not in job_url:
+            return 400, {'status': 'invalid', 'url': job_url,
+                         'error': 'Could not extract a LinkedIn job ID from URL'}
+
+        poll_url = f"/scans/{job_id}"
+
+        cached = self.cached_result(job_id)
+        if cached:
+            return 200, {'status': 'done', 'job_id': job_id, 'url': view_url, 'cached': True, 'result': cached}
+
+        if not self.runner.submit(job_id, view_url, priority):
+            return 503, {'status': 'busy', 'job_id': job_id, 'url': view_url,
+                         'error': 'Scan queue is full, retry later'}
+
+        if wait:
+            return self.scan_status(job_id, wait)
+
+        return 202, {'status': 'queued', 'job_id': job_id, 'url': view_url, 'poll_url': poll_url}
+
+    def scan_status(self, job_id, wait=0):
+        """Returns (http_status, body) for GET /scans/<id>"""
+
+        scan = self.runner.status(job_id, wait=wait)
+
+        if scan is None:
+            cached = self.cached_result(job_id)
+            if cached:
+                return 200, {'status': 'done', 'job_id': job_id, 'cached': True, 'result': cached}
+            return 404, {'status': 'unknown', 'job_id': job_id}
+
+        body = {'status': scan['status'], 'job_id': job_id}
+
+        if scan['status'] == 'done':
+            body['result'] = scan['result']
+            return 200, body
+        if scan['status'] == 'failed':
+            body['error'] = scan['error']
+            return 200, body
+
+        body['poll_url'] = f"/scans/{job_id}"
+        return 202, body
+
+def make_handler(service):
+    """HTTP handler class bound to a ScanService"""
+
+    class ScanHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            if status == 202 and body.get('poll_url'):
+                self.send_header('Location', body['poll_url'])
+            if status == 503:
+                self.send_header('Retry-After', '30')
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                return None
+            return body if isinstance(body, dict) else None
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0].rstrip('/')
+
+            if path == '/health':
+                self.send_json(200, {'status': 'ok', **service.runner.health()})
+            elif path == '/metrics':
+                from browser_launch import launch_stats
+                from browser_supervisor import get_supervisor
+                from detector_scam import research_refresh_stats
+                from scan_scheduler import scheduler_metrics
+                self.send_json(200, {'browsers': get_supervisor().metrics(), 'launches': launch_stats(),
+                                     'queue_wait': scheduler_metrics(),
+                                     'research_refresh': research_refresh_stats(), **service.runner.health()})
+            elif path.startswith('/scans/'):
+                self.send_json(*service.scan_status(path[len('/scans/'):]))
+            else:
+                self.send_json(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            path = self.path.split('?', 1)[0].rstrip('/')
+            body = self.read_json()
+
+            if body is None:
+                self.send_json(400, {'error': 'Request body must be a JSON object'})
+                return
+
+            if path == '/scan':
+                try:
+                    wait = min(max(float(body.get('wait') or 0), 0), MAX_WAIT)
+                except (TypeError, ValueError):
+                    self.send_json(400, {'error': "'wait' must be a number of seconds"})
+                    return
+                self.send_json(*service.request_scan(body.get('url'), wait=wait))
+
+            elif path == '/scan/batch':
+                urls = body.get('urls')
+                if not isinstance(urls, list) or not urls or len(urls) > MAX_BATCH_SIZE:
+                    self.send_json(400, {'error': f"'urls' must be a list of 1-{MAX_BATCH_SIZE} URLs"})
+                    return
+
+                items = [service.request_scan(url, priority=BATCH)[1] for url in urls]
+                pending = any(item['status'] in ('queued', 'busy') for item in items)
+                self.send_json(202 if pending else 200, {'results': items})
+
+            else:
+                self.send_json(404, {'error': 'Not found'})
+
+    return ScanHandler
+
+def create_server(runner, store=None, host='0.0.0.0', port=8080):
+    """Build the API server (call serve_forever() to run it)"""
+
+    server = ThreadingHTTPServer((host, port), make_handler(ScanService(runner, store)))
+    server.daemon_threads = True
+    return server
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP JSON API for the scam scanner')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-concurrent-scans', type=int, default=2, help='browsers running at once')
+    parser.add_argument('--max-pending', type=int, default=50, help='queued + running scans before 503')
+    parser.add_argument('--queue', help='send scans to worker.py via this task queue URL')
+    parser.add_argument('--scan-deadline', type=float,
+                        help='seconds per scan before returning a partial result (default SCAN_DEADLINE)')
+    args = parser.parse_args()
+
+    store = get_default_store()
+
+    if args.queue:
+        runner = QueueScanRunner(args.queue)
+    else:
+        runner = LocalScanRunner(args.max_concurrent_scans, args.max_pending, store=store,
+                                 scan_deadline=args.scan_deadline)
+
+    server = create_server(runner, store, args.host, args.port)
+    print(f"[*] Scanner API listening on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
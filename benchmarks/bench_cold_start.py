@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: browser cold start, default Selenium launch vs browser_launch
+
+Launches the browser --launches times in each mode and measures:
+    ready       launch start until the driver accepts commands
+    navigated   launch start until the first page (--url) has loaded
+    default     webdriver.Chrome(options) - driver discovery on every launch,
+                Chromium creates its own profile on disk
+    pinned      chromedriver path resolved once, default profile
+    fast        pinned driver + profile copied from a tmpfs template
+
+Usage:
+    python benchmarks/bench_cold_start.py --launches 10
+    python benchmarks/bench_cold_start.py --url http://127.0.0.1:8766/jobs/view/1/   # python mock_servers.py jobs
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+import browser_launch
+from detector_scam import build_chrome_options
+
+MODES = ('default', 'pinned', 'fast')
+
+def launch(mode):
+    options = build_chrome_options()
+    if mode == 'default':
+        return webdriver.Chrome(options=options)
+    if mode == 'pinned':
+        return webdriver.Chrome(options=options, service=Service(
+            browser_launch.chromedriver_path(options.binary_location or None)
+        ))
+    return browser_launch.launch_browser(options, fast=True)
+
+def measure(mode, url):
+    start = time.perf_counter()
+    driver = launch(mode)
+    ready = time.perf_counter()
+    try:
+        driver.get(url)
+        navigated = time.perf_counter()
+    finally:
+        driver.quit()
+        browser_launch.discard_profile(driver)
+    return ready - start, navigated - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Browser cold-start latency by launch mode')
+    parser.add_argument('--launches', type=int, default=10, help='launches per mode')
+    parser.add_argument('--url', default='about:blank', help='first page to load')
+    parser.add_argument('--output', help='write the samples as JSON')
+    args = parser.parse_args()
+
+    # One-off costs (driver lookup, template seeding) aren't part of a launch
+    seed_start = time.perf_counter()
+    options = build_chrome_options()
+    browser_launch.chromedriver_path(options.binary_location or None)
+    template = browser_launch.profile_template(options.binary_location or None)
+    print(f"Driver: {browser_launch.chromedriver_path(options.binary_location or None)}")
+    print(f"Profile template: {template or 'unavailable'} (set up in {time.perf_counter() - seed_start:.2f}s)\n")
+
+    results = {}
+    # Interleave modes so drift on the host affects all of them alike
+    for _ in range(args.launches):
+        for mode in MODES:
+            results.setdefault(mode, []).append(measure(mode, args.url))
+
+    print(f"{'mode':<10} {'ready p50':>10} {'ready p95':>10} {'nav p50':>9} {'nav p95':>9}")
+    for mode in MODES:
+        ready = sorted(sample[0] for sample in results[mode])
+        navigated = sorted(sample[1] for sample in results[mode])
+        p95 = min(len(ready) - 1, int(0.95 * len(ready)))
+        print(f"{mode:<10} {statistics.median(ready):>9.2f}s {ready[p95]:>9.2f}s "
+              f"{statistics.median(navigated):>8.2f}s {navigated[p95]:>8.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({mode: [{'ready': round(r, 3), 'navigated': round(n, 3)} for r, n in samples]
+                       for mode, samples in results.items()}, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: in-browser field extraction vs page_source + BeautifulSoup
+
+Loads each job page once in a single browser, then measures both ways of
+getting the six job fields out of it:
+    page_source   transfer full HTML over WebDriver, parse in Python
+    script        run EXTRACT_FIELDS_SCRIPT, transfer only the field texts
+
+Usage:
+    python benchmarks/bench_extraction.py https://www.linkedin.com/jobs/view/1234567890/ ...
+    python benchmarks/bench_extraction.py --pages-dir saved_jobs/   # offline, via mock_servers.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+
+from detector_scam import (
+    build_chrome_options,
+    parse_job_html,
+    build_job_data,
+    EXTRACT_FIELDS_SCRIPT,
+    JOB_FIELD_SELECTORS,
+)
+
+def measure_page(driver, job_url, repeat):
+    """Best-of-N bytes and milliseconds for both extraction modes"""
+
+    source = {'bytes': 0, 'transfer_ms': float('inf'), 'parse_ms': float('inf')}
+    script = {'bytes': 0, 'transfer_ms': float('inf'), 'parse_ms': float('inf')}
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = driver.page_source
+        transferred = time.perf_counter()
+        source_data = parse_job_html(html, job_url)
+        parsed = time.perf_counter()
+
+        source['bytes'] = len(html.encode('utf-8'))
+        source['transfer_ms'] = min(source['transfer_ms'], (transferred - start) * 1000)
+        source['parse_ms'] = min(source['parse_ms'], (parsed - transferred) * 1000)
+
+        start = time.perf_counter()
+        fields = driver.execute_script(EXTRACT_FIELDS_SCRIPT, JOB_FIELD_SELECTORS)
+        transferred = time.perf_counter()
+        script_data = build_job_data(fields or {}, job_url)
+        parsed = time.perf_counter()
+
+        script['bytes'] = len(json.dumps(fields, ensure_ascii=False).encode('utf-8'))
+        script['transfer_ms'] = min(script['transfer_ms'], (transferred - start) * 1000)
+        script['parse_ms'] = min(script['parse_ms'], (parsed - transferred) * 1000)
+
+    return source, script, source_data == script_data
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare job field extraction modes')
+    parser.add_argument('urls', nargs='*', help='job page URLs')
+    parser.add_argument('--pages-dir', help='serve saved <job_id>.html pages locally instead')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.pages_dir:
+        from mock_servers import start_job_server
+        _, base_url = start_job_server(args.pages_dir)
+        urls += [
+            f"{base_url}/jobs/view/{name[:-5]}/"
+            for name in sorted(os.listdir(args.pages_dir)) if name.endswith('.html')
+        ]
+
+    if not urls:
+        parser.error('give job URLs or --pages-dir')
+
+    driver = webdriver.Chrome(options=build_chrome_options())
+    totals = {'page_source': [0, 0.0], 'script': [0, 0.0]}
+
+    print(f"{'mode':<12} {'bytes':>10} {'transfer ms':>12} {'parse ms':>9} {'total ms':>9}  url")
+
+    try:
+        for job_url in urls:
+            driver.get(job_url)
+            time.sleep(1)
+
+            source, script, same = measure_page(driver, job_url, args.repeat)
+
+            for mode, stats in (('page_source', source), ('script', script)):
+                total_ms = stats['transfer_ms'] + stats['parse_ms']
+                totals[mode][0] += stats['bytes']
+                totals[mode][1] += total_ms
+                print(f"{mode:<12} {stats['bytes']:>10,} {stats['transfer_ms']:>12.1f} "
+                      f"{stats['parse_ms']:>9.1f} {total_ms:>9.1f}  {job_url}")
+
+            if not same:
+                print("   [!] modes extracted different field values for this page")
+    finally:
+        driver.quit()
+
+    pages = len(urls)
+    print(f"\nPer page average over {pages} page(s):")
+    for mode, (total_bytes, total_ms) in totals.items():
+        print(f"   {mode:<12} {total_bytes / pages:>12,.0f} bytes  {total_ms / pages:>8.1f} ms")
+
+    if totals['script'][0]:
+        print(f"   bytes reduced {totals['page_source'][0] / totals['script'][0]:.0f}x, "
+              f"latency reduced {totals['page_source'][1] / max(totals['script'][1], 0.001):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML parsing throughput, inline vs a process pool, by core count
+
+Simulates a batch run's fetch side: --fetchers threads each "fetch" a page
+(sleep --fetch-ms), then parse it. Inline, every thread parses under the
+one GIL; with a ParsePool the HTML goes to worker processes and only the
+parsed fields come back. Each configuration parses the same mix of job
+pages and search result pages.
+
+Synthetic job pages are padded with filler markup to --page-kb, roughly
+the size of a real LinkedIn guest page; --pages-dir uses saved pages.
+
+Usage:
+    python benchmarks/bench_parse_pool.py
+    python benchmarks/bench_parse_pool.py --workers 1 2 4 8 --pages 2000 --fetchers 32
+    python benchmarks/bench_parse_pool.py --pages-dir saved_jobs/ --output parse_scaling.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detector_scam import parse_job_html
+from mock_servers import fake_job_page, fake_search_results, render_html_results
+from parse_pool import ParsePool, offload, set_parse_pool
+from search_providers import parse_html_results
+
+# One search result page per this many job pages (two searches per company,
+# companies repeat across postings)
+SEARCH_PAGES_PER_JOB = 0.5
+
+FILLER = ('<div class="base-card"><a class="base-card__full-link" href="/jobs/view/{i}">'
+          '<span class="sr-only">Related job {i}</span></a><ul class="job-criteria">'
+          '<li><h3>Seniority level</h3><span>Mid-Senior level</span></li>'
+          '<li><h3>Employment type</h3><span>Full-time</span></li></ul></div>\n')
+
+def synthetic_pages(count, page_kb):
+    """(kind, html, arg) tasks: padded job pages plus search result pages"""
+
+    tasks = []
+    for index in range(count):
+        job_id = str(4000000000 + index)
+        html = fake_job_page(job_id)
+        filler = []
+        size = len(html)
+        while size < page_kb * 1024:
+            block = FILLER.format(i=index * 1000 + len(filler))
+            filler.append(block)
+            size += len(block)
+        html = html.replace('</body>', ''.join(filler) + '</body>')
+        tasks.append(('job', html, f'https://www.linkedin.com/jobs/view/{job_id}'))
+
+        if index % int(1 / SEARCH_PAGES_PER_JOB) == 0:
+            query = f'"Company {index}" scam reviews'
+            tasks.append(('search', render_html_results(fake_search_results(query, 10)), 10))
+    return tasks
+
+def saved_pages(pages_dir):
+    tasks = []
+    for name in sorted(os.listdir(pages_dir)):
+        with open(os.path.join(pages_dir, name), encoding='utf-8') as f:
+            tasks.append(('job', f.read(), f'https://www.linkedin.com/jobs/view/{os.path.splitext(name)[0]}'))
+    return tasks
+
+def run(tasks, fetchers, fetch_ms, pool):
+    """Seconds to fetch-and-parse every task; returns (seconds, parsed bytes returned)"""
+
+    set_parse_pool(pool)
+
+    def fetch_and_parse(task):
+        kind, html, arg = task
+        time.sleep(fetch_ms / 1000)
+        if kind == 'job':
+            return offload(parse_job_html, html, arg)
+        return offload(parse_html_results, html, arg)
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=fetchers) as executor:
+            results = list(executor.map(fetch_and_parse, tasks))
+        elapsed = time.perf_counter() - start
+    finally:
+        set_parse_pool(None)
+
+    return elapsed, len(json.dumps(results).encode('utf-8'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Parsing throughput: inline vs process pool')
+    parser.add_argument('--pages', type=int, default=200, help='synthetic job pages')
+    parser.add_argument('--page-kb', type=int, default=150, help='synthetic job page size')
+    parser.add_argument('--pages-dir', help='parse saved job pages (<job_id>.html) instead')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='pool sizes to try (default: 1, 2, 4, ... up to the CPU count)')
+    parser.add_argument('--fetchers', type=int, default=16, help='fetching threads')
+    parser.add_argument('--fetch-ms', type=float, default=20, help='simulated fetch latency')
+    parser.add_argument('--output', help='write the measurements as JSON')
+    args = parser.parse_args()
+
+    tasks = saved_pages(args.pages_dir) if args.pages_dir else synthetic_pages(args.pages, args.page_kb)
+    html_bytes = sum(len(html.encode('utf-8')) for _, html, _ in tasks)
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({2 ** power for power in range(cores.bit_length()) if 2 ** power <= cores} | {cores})
+
+    print(f"{len(tasks)} pages ({html_bytes / 1e6:.1f} MB of HTML), {args.fetchers} fetching threads, "
+          f"{args.fetch_ms:g}ms simulated fetch, {cores} CPU(s)\n")
+    print(f"{'mode':<12} {'seconds':>8} {'pages/s':>9} {'speedup':>8} {'returned':>10}")
+
+    measurements = []
+    baseline = None
+
+    for size in [0] + workers:
+        pool = ParsePool(size) if size else None
+        try:
+            if pool:
+                # Warm up: spawn the workers and import the parsers in them
+                with ThreadPoolExecutor(max_workers=size) as warmup:
+                    list(warmup.map(lambda _: pool.run(parse_job_html, '<html></html>', ''), range(size * 2)))
+            elapsed, returned = run(tasks, args.fetchers, args.fetch_ms, pool)
+        finally:
+            if pool:
+                pool.close()
+
+        rate = len(tasks) / elapsed
+        baseline = baseline or rate
+        mode = f"pool x{size}" if size else 'inline'
+        measurements.append({'mode': mode, 'workers': size, 'seconds': round(elapsed, 3),
+                             'pages_per_second': round(rate, 1), 'speedup': round(rate / baseline, 2)})
+        print(f"{mode:<12} {elapsed:>8.2f} {rate:>9.1f} {rate / baseline:>7.2f}x {returned / 1e3:>8.0f} kB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'pages': len(tasks), 'html_bytes': html_bytes, 'cpus': cores,
+                       'fetchers': args.fetchers, 'fetch_ms': args.fetch_ms,
+                       'measurements': measurements}, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
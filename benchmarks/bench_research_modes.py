@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-query vs two-query company research on recorded searches
+
+record   runs the scam, review and combined queries for each company once
+         and saves the results and latencies as JSON lines (a fixture)
+compare  replays a fixture through search_company in both modes, with no
+         network, and reports how often the single query agrees with the
+         two-query baseline, accuracy against labels (if given), and the
+         search latency each mode would have spent
+
+Usage:
+    python benchmarks/bench_research_modes.py record companies.csv --output research_fixture.jsonl
+    python benchmarks/bench_research_modes.py compare research_fixture.jsonl
+
+companies.csv holds one company per line, optionally followed by a label
+(scam or legit): "Acme Corp,legit". --search-url records from a local
+stand-in instead (python mock_servers.py ddg).
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import detector_scam
+import search_providers
+from detector_scam import COMBINED_QUERY, REVIEW_QUERY, SCAM_QUERY
+
+MODES = ('two_query', 'single')
+
+# Queries each research mode sends, in order
+MODE_QUERIES = {
+    'two_query': (SCAM_QUERY, REVIEW_QUERY),
+    'single': (COMBINED_QUERY,),
+}
+
+# Results requested per query, as search_company does
+NUM_RESULTS = {SCAM_QUERY: 10, REVIEW_QUERY: 10, COMBINED_QUERY: 20}
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# ============================================================================
+# RECORD
+# ============================================================================
+
+def read_companies(path):
+    """(company, label or None) pairs from a CSV/text file"""
+
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].startswith('#'):
+                continue
+            label = row[1].strip().lower() if len(row) > 1 and row[1].strip() else None
+            yield row[0].strip(), label
+
+def record(companies_path, output_path, delay):
+    recorded = 0
+
+    with open(output_path, 'a', encoding='utf-8') as out:
+        for company, label in read_companies(companies_path):
+            searches = {}
+            for template in (SCAM_QUERY, REVIEW_QUERY, COMBINED_QUERY):
+                query = template.format(company=company)
+                start = time.perf_counter()
+                try:
+                    results = search_providers.hedged_search(query, num_results=NUM_RESULTS[template])
+                    error = None
+                except search_providers.SearchError as e:
+                    results, error = [], str(e)
+                searches[template] = {
+                    'query': query,
+                    'results': results,
+                    'latency': round(time.perf_counter() - start, 3),
+                    'error': error,
+                }
+                time.sleep(delay)
+
+            out.write(json.dumps({'company': company, 'label': label, 'searches': searches},
+                                 ensure_ascii=False) + '\n')
+            out.flush()
+            recorded += 1
+            print(f"[*] {company}: " + ', '.join(
+                f"{len(search['results'])} results in {search['latency']:.2f}s" for search in searches.values()
+            ))
+
+    print(f"\n✅ Recorded {recorded} companies to {output_path}")
+
+# ============================================================================
+# COMPARE
+# ============================================================================
+
+def replay(fixture, mode):
+    """search_company on recorded results; returns (research, search seconds)"""
+
+    by_query = {search['query']: search for search in fixture['searches'].values()}
+    spent = []
+
+    def recorded_search(query, num_results=10, verbose=True, timeout=15, deadline=None):
+        search = by_query[query]
+        spent.append(search['latency'])
+        return search['results'][:num_results]
+
+    # Searches only: the reputation index would answer listed companies
+    research = detector_scam.search_company(
+        fixture['company'], verbose=False, mode=mode, search=recorded_search
+    )
+    return research, sum(spent)
+
+def research_points(research):
+    """Risk points analyze_job would add from research alone"""
+
+    points = research['scam_mentions'] * 20
+    if not research['review_sites']:
+        points += 15
+    return points
+
+def compare(fixture_path, flag_points):
+    with open(fixture_path, encoding='utf-8') as f:
+        fixtures = [json.loads(line) for line in f if line.strip()]
+
+    if not fixtures:
+        sys.exit(f"{fixture_path} has no recorded companies")
+
+    outcomes = {mode: [] for mode in MODES}
+    latencies = {mode: [] for mode in MODES}
+
+    for fixture in fixtures:
+        for mode in MODES:
+            research, seconds = replay(fixture, mode)
+            outcomes[mode].append(research)
+            latencies[mode].append(seconds)
+
+    total = len(fixtures)
+    baseline, single = outcomes['two_query'], outcomes['single']
+
+    def agreement(check):
+        return sum(check(a) == check(b) for a, b in zip(baseline, single)) / total
+
+    print(f"Companies: {total}\n")
+    print("Single-query agreement with the two-query baseline:")
+    checks = [
+        ('scam mentions found', lambda r: r['scam_mentions'] > 0),
+        ('review sites found', lambda r: bool(r['review_sites'])),
+        (f'research flag (>= {flag_points} pts)', lambda r: research_points(r) >= flag_points),
+    ]
+    for name, check in checks:
+        print(f"   {name:<28} {agreement(check):>7.1%}")
+    mean_difference = sum(abs(research_points(a) - research_points(b)) for a, b in zip(baseline, single)) / total
+    print(f"   {'mean |points difference|':<28} {mean_difference:>7.1f}")
+
+    labeled = [(index, fixture['label']) for index, fixture in enumerate(fixtures)
+               if fixture.get('label') in ('scam', 'legit')]
+    if labeled:
+        print(f"\nAccuracy on {len(labeled)} labeled companies (scam = research flag >= {flag_points} pts):")
+        for mode in MODES:
+            correct = sum(
+                (research_points(outcomes[mode][index]) >= flag_points) == (label == 'scam')
+                for index, label in labeled
+            )
+            print(f"   {mode:<10} {correct / len(labeled):>7.1%}")
+
+    print("\nSearch time per company (recorded latencies, searches run back to back):")
+    for mode in MODES:
+        print(f"   {mode:<10} {len(MODE_QUERIES[mode])} search(es)  "
+              f"p50 {percentile(latencies[mode], 0.5):.2f}s  p95 {percentile(latencies[mode], 0.95):.2f}s  "
+              f"total {sum(latencies[mode]):.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare single- and two-query company research')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='record live searches for a list of companies')
+    record_parser.add_argument('companies', help='CSV: company[,scam|legit]')
+    record_parser.add_argument('--output', default='research_fixture.jsonl')
+    record_parser.add_argument('--delay', type=float, default=2.0, help='seconds between searches')
+    record_parser.add_argument('--search-url', help='base URL of a DuckDuckGo stand-in')
+
+    compare_parser = subparsers.add_parser('compare', help='replay a fixture in both modes')
+    compare_parser.add_argument('fixture')
+    compare_parser.add_argument('--flag-points', type=int, default=20,
+                                help='research points that count as flagging a company')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        if args.search_url:
+            base = args.search_url.rstrip('/')
+            search_providers.set_backends(search_providers.make_backends(
+                html_url=f"{base}/html/", lite_url=f"{base}/lite/",
+            ))
+        record(args.companies, args.output, args.delay)
+    else:
+        compare(args.fixture, args.flag_points)
+
+
+if __name__ == "__main__":
+    main()
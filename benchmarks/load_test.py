@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent scans against local LinkedIn and DuckDuckGo stand-ins
+
+Starts the mock job server (synthetic postings) and the mock DuckDuckGo
+server from mock_servers.py, each with configurable latency and error rate,
+then drives scan_linkedin_job from N concurrent simulated users. A batch
+run through pipeline.run_pipeline can go alongside to mimic bulk traffic.
+A sampler records the memory and process count of this process and every
+browser it started.
+
+Reports throughput, p50/p95/p99 scan latency, error and partial-result
+rates, queue wait per priority class (users are interactive, the batch is
+batch; see scan_scheduler.py), and peak RSS / process count with a timeline.
+
+Usage:
+    python benchmarks/load_test.py --users 4 --duration 120
+    python benchmarks/load_test.py --users 8 --batch 50 --job-delay 1 --search-delay 0.5 \\
+        --search-error-rate 0.05 --output load.json
+    python benchmarks/load_test.py --users 16 --scrape http   # no browsers: fetch + parse only
+
+--scrape http swaps the browser for a plain HTTP fetch + parse_job_html
+so search and analysis capacity can be measured on their own.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import detector_scam
+import pipeline
+import search_providers
+from browser_supervisor import tree_usage
+from mock_servers import Faults, start_ddg_server, start_job_server
+from scan_scheduler import format_waits, scheduler_metrics
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def http_scrape(job_url, verbose=True, extraction=None, deadline=None):
+    """Browserless stand-in for scrape_linkedin_job (--scrape http)"""
+
+    try:
+        response = requests.get(job_url, timeout=30)
+    except requests.Timeout as e:
+        return detector_scam.ScrapeFailure('timeout', str(e))
+    except requests.RequestException as e:
+        return detector_scam.ScrapeFailure('error', str(e))
+
+    if response.status_code == 404:
+        return detector_scam.ScrapeFailure('not_found', response.url)
+    if response.status_code != 200:
+        return detector_scam.ScrapeFailure('error', f"HTTP {response.status_code}")
+
+    reason = detector_scam.page_failure(response.url, response.text)
+    if reason:
+        return detector_scam.ScrapeFailure(reason, response.url)
+
+    job_data = detector_scam.parse_job_html(response.text, job_url)
+    if job_data['company'] == 'N/A':
+        return detector_scam.ScrapeFailure('error', 'no job details on the page')
+    return job_data
+
+class ResourceSampler(threading.Thread):
+    """Samples RSS and process count of this process tree on an interval"""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        start = time.monotonic()
+        while not self._stop_event.is_set():
+            processes, rss_bytes = tree_usage(os.getpid())
+            self.samples.append({
+                't': round(time.monotonic() - start, 1),
+                'processes': processes,
+                'rss_mb': round(rss_bytes / 1024 / 1024, 1),
+                'threads': threading.active_count(),
+            })
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class Recorder:
+    """Thread-safe scan outcome log"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.scans = []
+
+    def add(self, source, latency, outcome):
+        with self._lock:
+            self.scans.append({'source': source, 'latency': latency, 'outcome': outcome})
+
+def outcome_of(result):
+    if not result:
+        return 'failed'
+    return 'partial' if result.get('incomplete') else 'ok'
+
+def run_user(user, job_urls, recorder, stop_at, deadline):
+    """One simulated user: scan back-to-back until time runs out"""
+
+    index = user
+    while time.monotonic() < stop_at:
+        job_url = job_urls[index % len(job_urls)]
+        index += 1
+
+        start = time.monotonic()
+        try:
+            result = detector_scam.scan_linkedin_job(job_url, verbose=False, store=False, deadline=deadline)
+            outcome = outcome_of(result)
+        except Exception:
+            outcome = 'error'
+        recorder.add('user', time.monotonic() - start, outcome)
+
+def run_batch(job_urls, recorder, workers):
+    """One pipeline batch; per-item latency is measured from batch start"""
+
+    start = time.monotonic()
+    for _, result in pipeline.run_pipeline(job_urls, scrape_workers=workers, store=False):
+        recorder.add('batch', time.monotonic() - start, outcome_of(result))
+
+def summarize(scans, elapsed):
+    latencies = [scan['latency'] for scan in scans]
+    outcomes = {}
+    for scan in scans:
+        outcomes[scan['outcome']] = outcomes.get(scan['outcome'], 0) + 1
+
+    def rounded(value):
+        return round(value, 2) if value is not None else None
+
+    total = len(scans)
+    return {
+        'scans': total,
+        'throughput_per_min': round(total / elapsed * 60, 2) if elapsed else 0,
+        'p50': rounded(percentile(latencies, 0.50)),
+        'p95': rounded(percentile(latencies, 0.95)),
+        'p99': rounded(percentile(latencies, 0.99)),
+        'error_rate': round((outcomes.get('failed', 0) + outcomes.get('error', 0)) / total, 3) if total else 0,
+        'partial_rate': round(outcomes.get('partial', 0) / total, 3) if total else 0,
+        'outcomes': outcomes,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the scanner against local mock servers')
+    parser.add_argument('--users', type=int, default=4, help='concurrent interactive scanners')
+    parser.add_argument('--duration', type=float, default=60, help='seconds the users keep scanning')
+    parser.add_argument('--batch', type=int, default=0, help='also run a pipeline batch of this many URLs')
+    parser.add_argument('--batch-workers', type=int, default=pipeline.SCRAPE_WORKERS)
+    parser.add_argument('--jobs', type=int, default=500, help='distinct synthetic job IDs')
+    parser.add_argument('--scrape', choices=['browser', 'http'], default='browser')
+    parser.add_argument('--deadline', type=float, default=0, help='per-scan deadline (0 = none)')
+    parser.add_argument('--job-delay', type=float, default=0.0)
+    parser.add_argument('--job-jitter', type=float, default=0.0)
+    parser.add_argument('--job-error-rate', type=float, default=0.0)
+    parser.add_argument('--search-delay', type=float, default=0.3)
+    parser.add_argument('--search-jitter', type=float, default=0.2)
+    parser.add_argument('--search-error-rate', type=float, default=0.0)
+    parser.add_argument('--sample-interval', type=float, default=1.0)
+    parser.add_argument('--output', help='write the full report (with timeline) as JSON')
+    args = parser.parse_args()
+
+    _, job_base = start_job_server(faults=Faults(args.job_delay, args.job_jitter, args.job_error_rate))
+    search_faults = Faults(args.search_delay, args.search_jitter, args.search_error_rate)
+    _, ddg_base = start_ddg_server(search_faults, search_faults)
+    search_providers.set_backends(search_providers.make_backends(
+        html_url=f"{ddg_base}/html/", lite_url=f"{ddg_base}/lite/",
+    ))
+
+    if args.scrape == 'http':
+        detector_scam.scrape_linkedin_job = http_scrape
+
+    job_urls = [f"{job_base}/jobs/view/{4000000000 + n}/" for n in range(args.jobs)]
+    recorder = Recorder()
+    sampler = ResourceSampler(args.sample_interval)
+
+    print(f"[*] {args.users} user(s) for {args.duration:.0f}s"
+          + (f" + batch of {args.batch}" if args.batch else "")
+          + f", scrape={args.scrape}, jobs at {job_base}, search at {ddg_base}")
+
+    start = time.monotonic()
+    stop_at = start + args.duration
+    sampler.start()
+
+    threads = [
+        threading.Thread(target=run_user, args=(user, job_urls, recorder, stop_at, args.deadline or None))
+        for user in range(args.users)
+    ]
+    if args.batch:
+        batch_urls = [job_urls[n % len(job_urls)] for n in range(args.batch)]
+        threads.append(threading.Thread(target=run_batch, args=(batch_urls, recorder, args.batch_workers)))
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - start
+    sampler.stop()
+
+    report = {
+        'config': vars(args),
+        'elapsed_seconds': round(elapsed, 1),
+        'overall': summarize(recorder.scans, elapsed),
+        'users': summarize([scan for scan in recorder.scans if scan['source'] == 'user'], elapsed),
+        'batch': summarize([scan for scan in recorder.scans if scan['source'] == 'batch'], elapsed),
+        'peak_rss_mb': max((sample['rss_mb'] for sample in sampler.samples), default=0),
+        'peak_processes': max((sample['processes'] for sample in sampler.samples), default=0),
+        'search_backends': search_providers.backend_stats(),
+        'queue_wait': scheduler_metrics(),
+        'timeline': sampler.samples,
+    }
+
+    print(f"\n{'source':<8} {'scans':>6} {'per min':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'errors':>7} {'partial':>8}")
+    for source in ('overall', 'users', 'batch'):
+        stats = report[source]
+        if not stats['scans']:
+            continue
+        print(f"{source:<8} {stats['scans']:>6} {stats['throughput_per_min']:>8} "
+              f"{stats['p50']:>7} {stats['p95']:>7} {stats['p99']:>7} "
+              f"{stats['error_rate']:>7.1%} {stats['partial_rate']:>8.1%}")
+
+    print(f"\nQueue wait: {format_waits(report['queue_wait'])}")
+
+    print(f"\nPeak: {report['peak_rss_mb']} MB RSS, {report['peak_processes']} processes "
+          f"(this process + browsers)")
+
+    # Coarse timeline: about ten evenly spaced samples
+    step = max(1, len(sampler.samples) // 10)
+    print(f"\n{'t (s)':>7} {'processes':>10} {'rss MB':>8} {'threads':>8}")
+    for sample in sampler.samples[::step]:
+        print(f"{sample['t']:>7} {sample['processes']:>10} {sample['rss_mb']:>8} {sample['threads']:>8}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[*] Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Browser Launch - cold-start optimized Chromium startup
+
+Two costs come before a new browser can load its first page:
+    driver discovery   webdriver.Chrome() without a driver path asks
+                       Selenium Manager (a subprocess) on every launch
+    profile creation   Chromium builds a fresh profile directory on disk
+
+launch_browser() resolves the chromedriver path once per process and pins
+it in the Service, and starts each browser from a copy of a pre-seeded
+profile template kept on tmpfs (/dev/shm, unless it has less than
+SHM_MIN_FREE bytes free, as in containers with the default 64 MB; then
+the system temp dir). Profile copies are removed when the browser is
+released; copies left by dead processes are reaped.
+
+Every launch is timed from the start of launch_browser() until
+webdriver.Chrome() returns, i.e. the session is up and can navigate
+(launch_stats()). The first page load itself isn't included.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service
+
+from browser_supervisor import HAS_PROC
+
+# Set BROWSER_FAST_LAUNCH=0 to launch the way Selenium does by default
+FAST_LAUNCH = os.environ.get('BROWSER_FAST_LAUNCH', '1') != '0'
+
+# Pinned driver (otherwise found once on PATH or via Selenium Manager)
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH', '')
+
+DRIVER_LOCATIONS = (
+    '/usr/bin/chromedriver',
+    '/usr/lib/chromium/chromedriver',
+    '/usr/lib/chromium-browser/chromedriver',
+    '/usr/local/bin/chromedriver',
+)
+
+BROWSER_NAMES = ('chromium', 'chromium-browser', 'google-chrome', 'chrome')
+
+# Least free space on /dev/shm for profiles to go there (a template plus a
+# copy per browser); containers often mount only 64 MB
+SHM_MIN_FREE = 512 * 1024 * 1024
+
+def _default_profile_base():
+    """/dev/shm if it's there with room to spare, otherwise the temp dir"""
+
+    try:
+        if shutil.disk_usage('/dev/shm').free >= SHM_MIN_FREE:
+            return '/dev/shm'
+    except OSError:
+        pass
+    return tempfile.gettempdir()
+
+# Where the profile template and per-browser copies live
+PROFILE_ROOT = os.environ.get('BROWSER_PROFILE_ROOT') or os.path.join(
+    _default_profile_base(), 'scam-detector-profiles'
+)
+
+# Files in a seeded profile that belong to the process that wrote them
+VOLATILE_PROFILE_ENTRIES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile',
+                            'Crashpad', 'BrowserMetrics', 'ShaderCache', 'GrShaderCache')
+
+SEED_TIMEOUT = 30
+
+# ============================================================================
+# DRIVER PATH
+# ============================================================================
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_path(binary_location=None):
+    """
+    chromedriver to use with this browser binary, resolved once per process
+
+    CHROMEDRIVER_PATH, then PATH and the usual package locations, then
+    Selenium Manager. None if nothing was found (Selenium then tries again
+    on every launch, as it does by default).
+    """
+
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+
+    found = shutil.which('chromedriver')
+    if found:
+        return found
+
+    for path in DRIVER_LOCATIONS:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+
+    try:
+        from selenium.webdriver.common.driver_finder import DriverFinder
+        options = ChromeOptions()
+        if binary_location:
+            options.binary_location = binary_location
+        return DriverFinder.get_path(Service(), options)
+    except Exception:
+        return None
+
+# ============================================================================
+# PROFILE TEMPLATE
+# ============================================================================
+
+_template_lock = threading.Lock()
+
+def _browser_binary(binary_location):
+    if binary_location:
+        return binary_location
+    for name in BROWSER_NAMES:
+        found = shutil.which(name)
+        if found:
+            return found
+    return None
+
+def _reap_dead_copies():
+    """Remove profile copies whose owning process has exited (Linux)"""
+
+    if not HAS_PROC:
+        return
+
+    for entry in os.listdir(PROFILE_ROOT):
+        if entry.isdigit() and int(entry) != os.getpid() and not os.path.isdir(f'/proc/{entry}'):
+            shutil.rmtree(os.path.join(PROFILE_ROOT, entry), ignore_errors=True)
+
+@functools.lru_cache(maxsize=None)
+def profile_template(binary_location=None):
+    """
+    Path of a seeded profile template for this browser binary, or None
+
+    Seeded once (per host, reused across processes) by letting a headless
+    browser create its profile and exit, then dropping the lock files and
+    caches that belong to that run.
+    """
+
+    binary = _browser_binary(binary_location)
+    if not binary:
+        return None
+
+    template = os.path.join(PROFILE_ROOT, 'template-' + uuid.uuid5(uuid.NAMESPACE_URL, binary).hex[:12])
+
+    with _template_lock:
+        os.makedirs(PROFILE_ROOT, exist_ok=True)
+        _reap_dead_copies()
+
+        if os.path.isdir(template):
+            return template
+
+        seeding = f"{template}.seed-{os.getpid()}"
+        try:
+            subprocess.run(
+                [binary, '--headless=new', '--no-sandbox', '--disable-gpu', '--no-first-run',
+                 '--no-default-browser-check', f'--user-data-dir={seeding}', '--dump-dom', 'about:blank'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=SEED_TIMEOUT, check=True,
+            )
+            for entry in VOLATILE_PROFILE_ENTRIES:
+                path = os.path.join(seeding, entry)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                elif os.path.lexists(path):
+                    os.remove(path)
+            os.rename(seeding, template)
+        except (OSError, subprocess.SubprocessError):
+            shutil.rmtree(seeding, ignore_errors=True)
+            # Another process may have won the race
+            return template if os.path.isdir(template) else None
+
+    return template
+
+def _copy_profile(template):
+    """Fresh profile for one browser: a copy of the template"""
+
+    profile_dir = os.path.join(PROFILE_ROOT, str(os.getpid()), uuid.uuid4().hex)
+    shutil.copytree(template, profile_dir, symlinks=True)
+    return profile_dir
+
+def discard_profile(driver):
+    """Delete the profile copy a browser was launched with (after quit)"""
+
+    profile_dir = getattr(driver, 'profile_dir', None)
+    if profile_dir:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+# ============================================================================
+# LAUNCH
+# ============================================================================
+
+class LaunchStats:
+    """Launch-to-ready timings (seconds, until the driver can navigate), most recent first"""
+
+    def __init__(self, keep=500):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._samples = []
+        self.launches = 0
+
+    def record(self, seconds, profile_seconds):
+        with self._lock:
+            self.launches += 1
+            self._samples.insert(0, (seconds, profile_seconds))
+            del self._samples[self.keep:]
+
+    def summary(self):
+        with self._lock:
+            samples = list(self._samples)
+
+        def percentile(values, fraction):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+        totals = [seconds for seconds, _ in samples]
+        profiles = [profile for _, profile in samples]
+        return {
+            'launches': self.launches,
+            'fast_launch': FAST_LAUNCH,
+            'p50': percentile(totals, 0.5),
+            'p95': percentile(totals, 0.95),
+            'profile_copy_p50': percentile(profiles, 0.5),
+        }
+
+_stats = LaunchStats()
+
+def launch_stats():
+    """p50/p95 launch-to-ready seconds for this process"""
+    return _stats.summary()
+
+def launch_browser(options, fast=None):
+    """
+    Start Chrome with these options; returns the driver, ready to navigate
+
+    fast (default FAST_LAUNCH): pinned driver path and a tmpfs profile
+    copy. The profile copy (if any) is in driver.profile_dir; pass the
+    driver to discard_profile() once it has quit.
+    """
+
+    fast = FAST_LAUNCH if fast is None else fast
+    start = time.perf_counter()
+    profile_dir = None
+
+    if not fast:
+        driver = webdriver.Chrome(options=options)
+    else:
+        binary_location = options.binary_location or None
+
+        template = profile_template(binary_location)
+        if template:
+            try:
+                profile_dir = _copy_profile(template)
+            except OSError:
+                # Out of space: let Chromium create its own profile
+                profile_dir = None
+            else:
+                options.add_argument(f'--user-data-dir={profile_dir}')
+        profile_seconds = time.perf_counter() - start
+
+        try:
+            driver = webdriver.Chrome(options=options, service=Service(chromedriver_path(binary_location)))
+        except Exception:
+            if profile_dir:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+    driver.profile_dir = profile_dir
+    _stats.record(time.perf_counter() - start, profile_seconds if fast else 0.0)
+    return driver
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Browser Supervisor - keeps chromedriver/Chromium processes from leaking
+
+Tracks the process tree of every browser the scanner starts and
+- kills a browser whose tree exceeds the RSS cap or wall-clock limit
+- makes sure quit() really removes every process (killing stragglers)
+- reaps browsers left behind by dead scanner processes, at startup and
+  periodically, using a PID registry plus a command-line owner tag
+- reports live browser count and memory use via metrics()
+
+Process inspection uses /proc, so limits and reaping only apply on Linux;
+elsewhere the supervisor just makes quit() best-effort as before.
+"""
+
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+
+# Limits (override with environment variables)
+MAX_BROWSER_RSS_MB = int(os.environ.get('MAX_BROWSER_RSS_MB', 1024))
+MAX_BROWSER_LIFETIME = int(os.environ.get('MAX_BROWSER_LIFETIME', 180))
+
+# Where each scanner process records the browser PIDs it owns
+REGISTRY_DIR = os.environ.get(
+    'BROWSER_REGISTRY_DIR',
+    os.path.join(tempfile.gettempdir(), 'scam-detector-browsers'),
+)
+
+# Chromium argument that marks a browser as ours (value = owner PID)
+OWNER_FLAG = '--scam-detector-owner'
+
+# Only processes whose command line mentions one of these are ever killed
+BROWSER_NAMES = ('chromedriver', 'chromium', 'chrome', 'brave')
+
+HAS_PROC = os.path.isdir('/proc/self')
+
+# ============================================================================
+# /PROC HELPERS
+# ============================================================================
+
+def _read_cmdline(pid):
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode('utf-8', 'replace')
+    except OSError:
+        return ''
+
+def _read_ppid(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # The command name can contain spaces; fields resume after ')'
+            return int(f.read().rsplit(')', 1)[1].split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+def _read_start_time(pid):
+    """Process start time (clock ticks since boot), so a reused PID can be told apart"""
+
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+def _rss_bytes(pid):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError):
+        return 0
+
+def _all_pids():
+    if not HAS_PROC:
+        return []
+    return [int(name) for name in os.listdir('/proc') if name.isdigit()]
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _is_browser_process(pid):
+    cmdline = _read_cmdline(pid).lower()
+    return any(name in cmdline for name in BROWSER_NAMES)
+
+def process_tree(root_pid):
+    """root_pid plus all of its descendants"""
+
+    children = {}
+    for pid in _all_pids():
+        ppid = _read_ppid(pid)
+        if ppid is not None:
+            children.setdefault(ppid, []).append(pid)
+
+    tree = []
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+
+    return tree
+
+def tree_usage(root_pid):
+    """(process count, total RSS bytes) for root_pid and its descendants"""
+
+    if not HAS_PROC:
+        return 0, 0
+    pids = process_tree(root_pid)
+    return len(pids), sum(_rss_bytes(pid) for pid in pids)
+
+def kill_pids(pids):
+    """SIGKILL browser processes (skips PIDs that no longer look like browsers)"""
+
+    killed = 0
+    for pid in pids:
+        if pid == os.getpid() or not _is_browser_process(pid):
+            continue
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    return killed
+
+# ============================================================================
+# SUPERVISOR
+# ============================================================================
+
+class BrowserSupervisor:
+    """Tracks, limits and cleans up the browsers this process starts"""
+
+    def __init__(self, max_rss_mb=MAX_BROWSER_RSS_MB, max_lifetime=MAX_BROWSER_LIFETIME,
+                 check_interval=5, reap_interval=60, registry_dir=REGISTRY_DIR):
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+        self.reap_interval = reap_interval
+        self.registry_dir = registry_dir
+        self.registry_path = os.path.join(registry_dir, f'{os.getpid()}.json')
+
+        self._lock = threading.Lock()
+        self._browsers = {}
+        self._counters = {'launched': 0, 'killed_rss': 0, 'killed_timeout': 0,
+                          'stragglers_killed': 0, 'orphans_reaped': 0}
+        self._started = False
+
+    @property
+    def owner_arg(self):
+        """Chromium argument tagging a browser as owned by this process"""
+        return f'{OWNER_FLAG}={os.getpid()}'
+
+    def start(self):
+        """Reap orphans from earlier runs and start the watchdog (idempotent)"""
+
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        self.reap_orphans()
+        threading.Thread(target=self._watchdog, daemon=True).start()
+
+    # ---- tracking ----------------------------------------------------------
+
+    def register(self, driver):
+        """Start supervising a freshly launched webdriver"""
+
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is None:
+            return
+
+        with self._lock:
+            self._browsers[process.pid] = {
+                'started_at': time.time(),
+                'pids': set(process_tree(process.pid)) if HAS_PROC else {process.pid},
+                'rss_bytes': 0,
+                'killed': None,
+            }
+            self._counters['launched'] += 1
+        self._write_registry()
+
+    def killed_reason(self, driver):
+        """'rss' / 'timeout' if the watchdog killed this driver, else None"""
+
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        browser = self._browsers.get(process.pid) if process else None
+        return browser['killed'] if browser else None
+
+    def release(self, driver, quit_timeout=15):
+        """Quit a driver and make sure none of its processes survive"""
+
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        root_pid = process.pid if process else None
+
+        # Snapshot the tree first: once chromedriver exits, Chromium is
+        # re-parented and can no longer be found from the driver PID.
+        pids = set(process_tree(root_pid)) if root_pid and HAS_PROC else set()
+        with self._lock:
+            browser = self._browsers.get(root_pid)
+            if browser:
+                pids |= browser['pids']
+
+        quitter = threading.Thread(target=self._quiet_quit, args=(driver,), daemon=True)
+        quitter.start()
+        quitter.join(quit_timeout)
+
+        survivors = [pid for pid in pids if _pid_alive(pid)]
+        if survivors:
+            stragglers = kill_pids(survivors)
+            with self._lock:
+                self._counters['stragglers_killed'] += stragglers
+
+        with self._lock:
+            self._browsers.pop(root_pid, None)
+        self._write_registry()
+
+    @staticmethod
+    def _quiet_quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # ---- enforcement -------------------------------------------------------
+
+    def _watchdog(self):
+        last_reap = time.time()
+
+        while True:
+            time.sleep(self.check_interval)
+            self.enforce_limits()
+
+            if time.time() - last_reap >= self.reap_interval:
+                self.reap_orphans()
+                last_reap = time.time()
+
+    def enforce_limits(self):
+        """Kill browsers over the RSS cap or wall-clock limit"""
+
+        if not HAS_PROC:
+            return
+
+        now = time.time()
+        with self._lock:
+            browsers = list(self._browsers.items())
+
+        for root_pid, browser in browsers:
+            if browser['killed']:
+                continue
+
+            pids = set(process_tree(root_pid)) | browser['pids']
+            browser['pids'] = pids
+            browser['rss_bytes'] = sum(_rss_bytes(pid) for pid in pids)
+
+            reason = None
+            if browser['rss_bytes'] > self.max_rss_bytes:
+                reason = 'rss'
+            elif now - browser['started_at'] > self.max_lifetime:
+                reason = 'timeout'
+
+            if reason:
+                browser['killed'] = reason
+                kill_pids(pids)
+                with self._lock:
+                    self._counters[f'killed_{reason}'] += 1
+
+    def reap_orphans(self):
+        """Kill browsers whose owning scanner process is gone"""
+
+        if not HAS_PROC:
+            return 0
+
+        orphans = set()
+
+        # 1) PID registries left by dead scanner processes. A PID may have
+        # been reused since, so it's only killed if it's the same process
+        # (same start time, or tagged if the registry predates start times)
+        if os.path.isdir(self.registry_dir):
+            for name in os.listdir(self.registry_dir):
+                owner = name.split('.', 1)[0]
+                if not owner.isdigit() or _pid_alive(int(owner)):
+                    continue
+
+                path = os.path.join(self.registry_dir, name)
+                try:
+                    with open(path) as f:
+                        entries = json.load(f)
+                except (OSError, ValueError):
+                    entries = []
+                for entry in entries:
+                    pid, started = entry if isinstance(entry, list) else (entry, None)
+                    if started is None:
+                        if OWNER_FLAG in _read_cmdline(pid):
+                            orphans.add(pid)
+                    elif _read_start_time(pid) == started:
+                        orphans.add(pid)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        # 2) Tagged Chromium processes whose owner PID is dead
+        for pid in _all_pids():
+            cmdline = _read_cmdline(pid)
+            if OWNER_FLAG not in cmdline:
+                continue
+            owner = cmdline.split(f'{OWNER_FLAG}=', 1)[1].split(' ', 1)[0]
+            if owner.isdigit() and not _pid_alive(int(owner)):
+                orphans.add(pid)
+
+        reaped = kill_pids(orphans)
+        with self._lock:
+            self._counters['orphans_reaped'] += reaped
+        return reaped
+
+    def _write_registry(self):
+        """Record [pid, start time] for every process we own"""
+
+        with self._lock:
+            pids = sorted(pid for browser in self._browsers.values() for pid in browser['pids'])
+
+        try:
+            os.makedirs(self.registry_dir, exist_ok=True)
+            if pids:
+                tmp_path = f'{self.registry_path}.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump([[pid, _read_start_time(pid)] for pid in pids], f)
+                os.replace(tmp_path, self.registry_path)
+            elif os.path.exists(self.registry_path):
+                os.remove(self.registry_path)
+        except OSError:
+            pass
+
+    # ---- metrics -----------------------------------------------------------
+
+    def metrics(self):
+        """Live browser count, memory use and kill counters"""
+
+        now = time.time()
+        with self._lock:
+            browsers = [
+                {
+                    'driver_pid': root_pid,
+                    'processes': len(browser['pids']),
+                    'rss_mb': round(browser['rss_bytes'] / 1024 / 1024, 1),
+                    'age_seconds': round(now - browser['started_at'], 1),
+                }
+                for root_pid, browser in self._browsers.items()
+                if not browser['killed']
+            ]
+            counters = dict(self._counters)
+
+        return {
+            'live_browsers': len(browsers),
+            'total_rss_mb': round(sum(browser['rss_mb'] for browser in browsers), 1),
+            'max_rss_mb': self.max_rss_bytes // (1024 * 1024),
+            'max_lifetime_seconds': self.max_lifetime,
+            'browsers': browsers,
+            **counters,
+        }
+
+
+_supervisor = None
+_supervisor_lock = threading.Lock()
+
+def get_supervisor():
+    """Process-wide supervisor, started on first use"""
+
+    global _supervisor
+
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = BrowserSupervisor()
+            _supervisor.start()
+        return _supervisor
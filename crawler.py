@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Search Results Crawler - harvest job IDs from a LinkedIn search listing
+Pages through the public (guest) search results, de-duplicates job IDs and
+checkpoints progress so an interrupted crawl resumes where it stopped.
+
+Usage:
+    python crawler.py "https://www.linkedin.com/jobs/search/?keywords=data%20entry" \\
+        --checkpoint crawl.json --output queue.txt
+    python crawler.py URL --scan                          # scan jobs via pipeline.py
+    python crawler.py URL --base-url http://127.0.0.1:8765  # saved pages (mock_servers.py)
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+
+import requests
+
+from detector_scam import USER_AGENTS
+from job_urls import extract_job_id, normalize_job_url
+
+LINKEDIN_BASE_URL = 'https://www.linkedin.com'
+GUEST_SEARCH_PATH = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+
+# Query parameters of a search URL that describe the search itself
+# (paging / selection parameters like start and currentJobId are dropped)
+SEARCH_PARAMS_DROPPED = {'start', 'currentJobId', 'refresh', 'trk', 'originalSubdomain'}
+
+# Every way a job ID shows up in listing markup
+JOB_ID_PATTERN = re.compile(
+    r'urn:li:jobPosting:(\d+)'
+    r'|data-job-id="(\d+)"'
+    r'|/jobs/view/(?:[^"\'/?]*-)?(\d+)'
+    r'|currentJobId=(\d+)'
+)
+
+# ============================================================================
+# LISTING PAGE HELPERS
+# ============================================================================
+
+def build_listing_url(search_url, start, base_url=LINKEDIN_BASE_URL):
+    """Guest listing URL for one page of a LinkedIn search"""
+
+    parsed = urllib.parse.urlparse(search_url)
+    params = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parsed.query)
+        if key not in SEARCH_PARAMS_DROPPED
+    ]
+    params.append(('start', str(start)))
+
+    return f"{base_url.rstrip('/')}{GUEST_SEARCH_PATH}?{urllib.parse.urlencode(params)}"
+
+def extract_job_ids(html):
+    """All job IDs on a listing page, in page order, without repeats"""
+
+    job_ids = []
+    seen = set()
+
+    for match in JOB_ID_PATTERN.finditer(html):
+        job_id = next(group for group in match.groups() if group)
+        if job_id not in seen:
+            seen.add(job_id)
+            job_ids.append(job_id)
+
+    return job_ids
+
+def fetch_listing_page(session, url, timeout=15):
+    """Fetch a listing page; returns HTML or None when the listing is exhausted"""
+
+    response = session.get(url, timeout=timeout)
+
+    # LinkedIn answers 400/404 past the last page
+    if response.status_code in (400, 404):
+        return None
+    response.raise_for_status()
+
+    return response.text
+
+# ============================================================================
+# CHECKPOINTS
+# ============================================================================
+
+def load_checkpoint(path, search_url):
+    """Resume state for a search URL (fresh state if none saved)"""
+
+    if path and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('search_url') == search_url:
+            state['seen_ids'] = set(state.get('seen_ids', []))
+            return state
+
+    return {'search_url': search_url, 'next_start': 0, 'seen_ids': set(), 'done': False}
+
+def save_checkpoint(path, state):
+    """Atomically write crawl state"""
+
+    if not path:
+        return
+
+    payload = dict(state, seen_ids=sorted(state['seen_ids']))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+# ============================================================================
+# CRAWLER
+# ============================================================================
+
+def crawl_search_results(search_url, checkpoint_path=None, base_url=LINKEDIN_BASE_URL,
+                         max_pages=None, delay=(2, 4), verbose=True, settled=None):
+    """
+    Yield every new job ID found while paging through a search listing
+
+    The checkpoint for a page is written only after all of its IDs have
+    been handled, so a crash re-yields that page's IDs on resume
+    (at-least-once delivery). An ID counts as handled once the consumer
+    asks for the next one, unless settled is given: a callable(job_ids)
+    that blocks until those IDs are really done (e.g. scanned by a
+    pipeline that queues them first).
+    """
+
+    state = load_checkpoint(checkpoint_path, search_url)
+
+    if state['done']:
+        if verbose:
+            print(f"[*] Crawl already complete ({len(state['seen_ids'])} job IDs)")
+        return
+
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': random.choice(USER_AGENTS),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+    })
+
+    pages = 0
+
+    while max_pages is None or pages < max_pages:
+        url = build_listing_url(search_url, state['next_start'], base_url)
+
+        if verbose:
+            print(f"[*] Fetching listing page at start={state['next_start']}...")
+
+        html = fetch_listing_page(session, url)
+        page_ids = extract_job_ids(html) if html else []
+
+        if not page_ids:
+            state['done'] = True
+            save_checkpoint(checkpoint_path, state)
+            break
+
+        new_ids = [job_id for job_id in page_ids if job_id not in state['seen_ids']]
+
+        if verbose:
+            print(f"   {len(page_ids)} jobs on page, {len(new_ids)} new")
+
+        for job_id in new_ids:
+            yield job_id
+
+        if settled:
+            settled(new_ids)
+
+        state['seen_ids'].update(new_ids)
+        state['next_start'] += len(page_ids)
+        save_checkpoint(checkpoint_path, state)
+        pages += 1
+
+        # Pace requests like a person paging through results
+        time.sleep(random.uniform(*delay))
+
+    if verbose:
+        print(f"✅ Crawl stopped after {pages} page(s), {len(state['seen_ids'])} job IDs seen")
+
+class InFlightJobs:
+    """Job IDs handed to a scanner whose results haven't come back yet"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = set()
+
+    def add(self, job_id):
+        with self._cond:
+            self._pending.add(job_id)
+
+    def done(self, job_id):
+        with self._cond:
+            self._pending.discard(job_id)
+            self._cond.notify_all()
+
+    def wait_for(self, job_ids):
+        """Block until none of job_ids is still in flight"""
+
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending.isdisjoint(job_ids))
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Harvest job IDs from a LinkedIn search listing')
+    parser.add_argument('search_url', help='LinkedIn jobs search URL')
+    parser.add_argument('--checkpoint', default='crawl_checkpoint.json', help='resume state file')
+    parser.add_argument('--output', help='append new job view URLs to this file')
+    parser.add_argument('--scan', action='store_true', help='scan each new job as it is found')
+    parser.add_argument('--base-url', default=LINKEDIN_BASE_URL, help='listing server (for saved pages)')
+    parser.add_argument('--max-pages', type=int, help='stop after this many pages')
+    parser.add_argument('--min-delay', type=float, default=2.0)
+    parser.add_argument('--max-delay', type=float, default=4.0)
+    args = parser.parse_args()
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    in_flight = InFlightJobs() if args.scan else None
+
+    def harvested_urls():
+        for job_id in crawl_search_results(
+            args.search_url,
+            checkpoint_path=args.checkpoint,
+            base_url=args.base_url,
+            max_pages=args.max_pages,
+            delay=(args.min_delay, args.max_delay),
+            settled=in_flight.wait_for if in_flight else None,
+        ):
+            _, view_url = normalize_job_url(job_id)
+
+            if output:
+                output.write(view_url + '\n')
+                output.flush()
+            elif not args.scan:
+                print(view_url)
+
+            if in_flight:
+                in_flight.add(job_id)
+            yield view_url
+
+    try:
+        if args.scan:
+            # Harvested jobs stream straight into the staged pipeline
+            from pipeline import run_pipeline
+
+            # The crawl checkpoints a page only once its jobs come back here
+            for job_url, result in run_pipeline(harvested_urls()):
+                score = f"{result['analysis']['risk_score']:>3}/100" if result else "  ❌   "
+                print(f"{score}  {job_url}")
+                in_flight.done(extract_job_id(job_url))
+        else:
+            for _ in harvested_urls():
+                pass
+    finally:
+        if output:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,54 @@ Combines LinkedIn job scraping + DuckDuckGo research
 STREAMLIT CLOUD COMPATIBLE - Uses standard Selenium
 """
 
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
-import requests
-import urllib.parse
 import time
 import random
 import os
 import platform
+import urllib.parse
+
+from browser_launch import discard_profile, launch_browser
+from browser_supervisor import get_supervisor
+from job_urls import extract_job_id
+from page_archive import get_default_archive
+from parse_pool import offload
+from reputation_index import get_reputation_index
+from research_refresh import ResearchRefresher, mark_stale
+from scan_profiler import profile_scan
+from scan_scheduler import BATCH, SlotTimeout, scan_priority, scheduled
+from scan_store import RESEARCH_MAX_AGE, get_default_store, hash_job_data
+from search_providers import hedged_search
+
+try:
+    from text_classifier import score_postings
+except ImportError:  # numpy not installed - rules only
+    score_postings = None
+
+# Default overall time budget for one scan in seconds (0 = no limit)
+SCAN_DEADLINE = float(os.environ.get('SCAN_DEADLINE', 0))
+
+# Longest a single search may take when time is left over
+SEARCH_TIMEOUT = 15
+
+class Deadline:
+    """Time budget shared by the stages of one scan"""
+    
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+    
+    def remaining(self, cap=None):
+        """Seconds left (capped), or cap when there is no limit"""
+        
+        if self.expires_at is None:
+            return cap
+        left = max(0.0, self.expires_at - time.monotonic())
+        return min(left, cap) if cap is not None else left
+    
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
 
 # User agents for DuckDuckGo
 USER_AGENTS = [
@@ -105,14 +143,8 @@ def get_browser_config():
 # LINKEDIN JOB SCRAPER
 # ============================================================================
 
-def scrape_linkedin_job(job_url, verbose=True):
-    """Scrape a single LinkedIn job posting"""
-    
-    if verbose:
-        print(f"\n{'='*70}")
-        print(f"📋 STEP 1: SCRAPING JOB POSTING")
-        print(f"{'='*70}")
-        print(f"URL: {job_url}\n")
+def build_chrome_options(verbose=False):
+    """Chrome options for the current environment"""
     
     # Get browser configuration for current environment
     config = get_browser_config()
@@ -131,89 +163,355 @@ def scrape_linkedin_job(job_url, verbose=True):
     # Add user agent
     options.add_argument(f'user-agent={random.choice(USER_AGENTS)}')
     
+    return options
+
+# Fallback CSS selectors for each job field, tried in order.
+# Shared by the in-browser script and the BeautifulSoup parser.
+JOB_FIELD_SELECTORS = {
+    'job_title': [
+        'h1.top-card-layout__title',
+        'h1.topcard__title',
+        'h2.topcard__title',
+    ],
+    'company': [
+        'a.topcard__org-name-link',
+        'span.topcard__flavor',
+        'a[data-tracking-control-name="public_jobs_topcard-org-name"]',
+    ],
+    'location': [
+        'span.topcard__flavor--bullet',
+        'span.topcard__flavor.topcard__flavor--bullet',
+    ],
+    'posted': ['span.posted-time-ago__text'],
+    'applicants': ['span.num-applicants__caption'],
+    'description': [
+        'div.show-more-less-html__markup',
+        'div.description__text',
+        'section.description',
+    ],
+}
+
+# Runs inside the page: returns only the text of the first matching node
+# per field, instead of shipping the whole page_source over WebDriver
+EXTRACT_FIELDS_SCRIPT = """
+const selectors = arguments[0];
+const fields = {};
+for (const [field, candidates] of Object.entries(selectors)) {
+    fields[field] = null;
+    for (const selector of candidates) {
+        const node = document.querySelector(selector);
+        if (node) {
+            fields[field] = node.textContent;
+            break;
+        }
+    }
+}
+return fields;
+"""
+
+# 'script' (in-browser extraction) or 'page_source' (full HTML + BeautifulSoup)
+SCRAPE_EXTRACTION = os.environ.get('SCRAPE_EXTRACTION', 'script')
+
+# ============================================================================
+# SCRAPE FAILURES
+# ============================================================================
+
+FAILURE_MESSAGES = {
+    'expired': 'Posting has expired or is no longer accepting applications',
+    'auth_wall': 'LinkedIn redirected to a login wall',
+    'not_found': 'Posting not found',
+    'timeout': 'Page load timed out',
+    'error': 'Could not scrape job data',
+}
+
+# Failures that won't go away by retrying the same job ID
+PERMANENT_FAILURES = ('expired', 'not_found')
+
+# How long a failure is remembered per job ID (seconds); failures not
+# listed (timeouts, errors) are retried on the next request
+FAILURE_CACHE_TTL = int(os.environ.get('FAILURE_CACHE_TTL', 3600))
+AUTH_WALL_CACHE_TTL = int(os.environ.get('AUTH_WALL_CACHE_TTL', 300))
+NEGATIVE_CACHE_TTLS = {
+    'expired': FAILURE_CACHE_TTL,
+    'not_found': FAILURE_CACHE_TTL,
+    'auth_wall': AUTH_WALL_CACHE_TTL,
+}
+
+# Signs of a page that isn't a live posting, checked in order: the final
+# URL after redirects, then elements and the document title
+PAGE_FAILURE_MARKERS = {
+    'auth_wall': {
+        'url_parts': ['/authwall', '/login', '/checkpoint/', '/signup'],
+        'selectors': ['form.join-form', '.authwall-join-form'],
+        'titles': ['linkedin login', 'sign up | linkedin'],
+    },
+    'not_found': {
+        'url_parts': ['/404'],
+        'selectors': ['.not-found-404', 'main.page-not-found'],
+        'titles': ['page not found'],
+    },
+    'expired': {
+        'url_parts': ['expired_jd_redirect'],
+        'selectors': ['.closed-job', '.closed-job__flavor--closed'],
+        'titles': [],
+    },
+}
+
+# Browser-side marker check: first failure reason whose markers are present
+PAGE_FAILURE_SCRIPT = """
+const title = document.title.toLowerCase();
+for (const [reason, markers] of Object.entries(arguments[0])) {
+    if (markers.selectors.some(selector => document.querySelector(selector))) {
+        return reason;
+    }
+    if (markers.titles.some(text => title.includes(text))) {
+        return reason;
+    }
+}
+return null;
+"""
+
+class ScrapeFailure:
+    """
+    Why a posting couldn't be scraped (reason is a FAILURE_MESSAGES key)
+    
+    Falsy, so callers that only check `if not job_data` keep working.
+    cached is True when the failure came from the negative cache.
+    """
+    
+    def __init__(self, reason, detail='', cached=False):
+        self.reason = reason
+        self.detail = detail
+        self.cached = cached
+    
+    def __bool__(self):
+        return False
+    
+    @property
+    def permanent(self):
+        return self.reason in PERMANENT_FAILURES
+    
+    def __str__(self):
+        return f"{self.reason}: {FAILURE_MESSAGES[self.reason]}"
+    
+    def __repr__(self):
+        return f"ScrapeFailure({self.reason!r}, {self.detail!r})"
+    
+    def to_dict(self):
+        return {
+            'reason': self.reason,
+            'message': FAILURE_MESSAGES[self.reason],
+            'detail': self.detail,
+            'cached': self.cached
+        }
+
+def _url_failure(final_url):
+    url = (final_url or '').lower()
+    for reason, markers in PAGE_FAILURE_MARKERS.items():
+        if any(part in url for part in markers['url_parts']):
+            return reason
+    return None
+
+def page_failure(final_url, html):
+    """Failure reason for a fetched page (final URL + HTML), or None if it looks live"""
+    
+    reason = _url_failure(final_url)
+    if reason:
+        return reason
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.title.get_text().lower() if soup.title else ''
+    for reason, markers in PAGE_FAILURE_MARKERS.items():
+        if any(soup.select_one(selector) for selector in markers['selectors']):
+            return reason
+        if any(text in title for text in markers['titles']):
+            return reason
+    return None
+
+def detect_page_failure(driver):
+    """page_failure for the page loaded in a live browser"""
+    
+    return _url_failure(driver.current_url) or driver.execute_script(
+        PAGE_FAILURE_SCRIPT, PAGE_FAILURE_MARKERS
+    )
+
+# ============================================================================
+# JOB PAGE EXTRACTION
+# ============================================================================
+
+def build_job_data(fields, job_url):
+    """job_data dict from raw field texts (None = not found)"""
+    
+    result = {
+        field: fields[field].strip() if fields.get(field) else 'N/A'
+        for field in ('job_title', 'company', 'location', 'posted', 'applicants', 'description')
+    }
+    result['url'] = job_url
+    return result
+
+def parse_job_html(html, job_url):
+    """Extract job details from a full job page HTML"""
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    fields = {}
+    
+    for field, selectors in JOB_FIELD_SELECTORS.items():
+        node = None
+        for selector in selectors:
+            node = soup.select_one(selector)
+            if node:
+                break
+        fields[field] = node.text if node else None
+    
+    return build_job_data(fields, job_url)
+
+def extract_job_fields(driver, job_url):
+    """Extract job details inside the browser with one script call"""
+    
+    fields = driver.execute_script(EXTRACT_FIELDS_SCRIPT, JOB_FIELD_SELECTORS)
+    return build_job_data(fields or {}, job_url)
+
+def scrape_linkedin_job(job_url, verbose=True, extraction=None, deadline=None):
+    """
+    Scrape a single LinkedIn job posting
+    
+    extraction: 'script' pulls just the six fields out of the live page;
+    'page_source' downloads the full HTML and parses it with BeautifulSoup
+    (defaults to SCRAPE_EXTRACTION). With PAGE_ARCHIVE_PATH set the full
+    HTML is always fetched so it can be archived. HTML is parsed in the
+    active parse pool, if any (see parse_pool.py).
+    
+    deadline: Deadline for the page load and content wait; when it runs out
+    the load is stopped and fields are taken from what has rendered so far
+    
+    Returns job_data, or a (falsy) ScrapeFailure. Expired, missing and
+    login-walled postings are recognised right after the page loads, before
+    waiting for content.
+    """
+    
+    extraction = extraction or SCRAPE_EXTRACTION
+    deadline = deadline or Deadline(None)
+    
+    if verbose:
+        print(f"\n{'='*70}")
+        print(f"📋 STEP 1: SCRAPING JOB POSTING")
+        print(f"{'='*70}")
+        print(f"URL: {job_url}\n")
+    
+    options = build_chrome_options(verbose=verbose)
+    
+    # Tag the browser so the supervisor can find it if we die
+    supervisor = get_supervisor()
+    options.add_argument(supervisor.owner_arg)
+    
     driver = None
+    result = html = None
+    timed_out = False
     
     try:
-        # Initialize Chrome driver
-        driver = webdriver.Chrome(options=options)
+        # Pinned driver path + tmpfs profile copy (see browser_launch.py)
+        driver = launch_browser(options)
+        supervisor.register(driver)
+        
+        if deadline.expires_at is not None:
+            driver.set_page_load_timeout(max(deadline.remaining(), 1))
         
         if verbose:
             print("[*] Loading job page...")
-        driver.get(job_url)
+        try:
+            driver.get(job_url)
+        except TimeoutException:
+            # Out of time: keep whatever has rendered
+            if verbose:
+                print("[!] Page load ran past the deadline - using partial page")
+            driver.execute_script('window.stop();')
+            timed_out = True
+        
+        # Dead or walled postings: don't wait for content that won't come
+        reason = detect_page_failure(driver)
+        if reason:
+            if verbose:
+                print(f"[!] {FAILURE_MESSAGES[reason]}")
+            return ScrapeFailure(reason, driver.current_url)
         
         if verbose:
             print("[*] Waiting for content...")
-        time.sleep(random.uniform(4, 6))
-        
-        # Parse HTML
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        
-        # Extract job details
-        job_title = (
-            soup.find('h1', class_='top-card-layout__title') or
-            soup.find('h1', class_='topcard__title') or
-            soup.find('h2', class_='topcard__title')
-        )
+        time.sleep(deadline.remaining(cap=random.uniform(4, 6)))
         
-        company = (
-            soup.find('a', class_='topcard__org-name-link') or
-            soup.find('span', class_='topcard__flavor') or
-            soup.find('a', {'data-tracking-control-name': 'public_jobs_topcard-org-name'})
-        )
-        
-        location = (
-            soup.find('span', class_='topcard__flavor--bullet') or
-            soup.find('span', class_='topcard__flavor topcard__flavor--bullet')
-        )
-        
-        description = (
-            soup.find('div', class_='show-more-less-html__markup') or
-            soup.find('div', class_='description__text') or
-            soup.find('section', class_='description')
-        )
-        
-        posted = soup.find('span', class_='posted-time-ago__text')
-        applicants = soup.find('span', class_='num-applicants__caption')
-        
-        result = {
-            'job_title': job_title.text.strip() if job_title else 'N/A',
-            'company': company.text.strip() if company else 'N/A',
-            'location': location.text.strip() if location else 'N/A',
-            'posted': posted.text.strip() if posted else 'N/A',
-            'applicants': applicants.text.strip() if applicants else 'N/A',
-            'description': description.text.strip() if description else 'N/A',
-            'url': job_url
-        }
+        # Extract job details (archiving needs the full HTML anyway)
+        archive = get_default_archive()
+        if extraction == 'script' and not archive:
+            result = extract_job_fields(driver, job_url)
+        else:
+            html = driver.page_source
+            if archive:
+                archive.put('job', extract_job_id(job_url) or job_url, job_url, html)
         
+    except TimeoutException as e:
         if verbose:
-            print(f"✅ Extracted job data:")
-            print(f"   Title: {result['job_title']}")
-            print(f"   Company: {result['company']}")
-            print(f"   Location: {result['location']}")
-        
-        return result
+            print(f"[!] Scraping timed out: {e}")
+        return ScrapeFailure('timeout', str(e).strip())
         
     except Exception as e:
+        killed = supervisor.killed_reason(driver) if driver else None
         if verbose:
-            print(f"[!] Scraping error: {e}")
-        return None
+            if killed:
+                print(f"[!] Browser killed by supervisor ({killed} limit)")
+            else:
+                print(f"[!] Scraping error: {e}")
+        return ScrapeFailure('error', f"browser killed ({killed} limit)" if killed else str(e).strip())
         
     finally:
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            # Quits the driver and kills any process that outlives quit()
+            supervisor.release(driver)
+            discard_profile(driver)
+    
+    # Raw HTML is parsed after the browser is gone (in the parse pool if
+    # one is active), so the browser isn't held while BeautifulSoup runs
+    if result is None:
+        try:
+            result = offload(parse_job_html, html, job_url)
+        except Exception as e:
+            if verbose:
+                print(f"[!] Parsing error: {e}")
+            return ScrapeFailure('error', f"parsing failed: {e}")
+    
+    if result['company'] == 'N/A':
+        if verbose:
+            print("[!] No job details found on the page")
+        return ScrapeFailure('timeout' if timed_out else 'error', 'no job details on the page')
+    
+    # A page cut off by the deadline may be missing fields: the analysis
+    # is marked incomplete (and never stored) rather than scored as whole
+    if timed_out:
+        result['missing_checks'] = ['posting']
+    
+    if verbose:
+        print(f"✅ Extracted job data:")
+        print(f"   Title: {result['job_title']}")
+        print(f"   Company: {result['company']}")
+        print(f"   Location: {result['location']}")
+    
+    return result
 
 # ============================================================================
 # DUCKDUCKGO SEARCH ENGINE
 # ============================================================================
 
-def search_duckduckgo(query, num_results=10, verbose=True):
-    """Search DuckDuckGo and return results"""
+def search_duckduckgo(query, num_results=10, verbose=True, timeout=15, deadline=None):
+    """
+    Search DuckDuckGo and return results
     
-    encoded_query = urllib.parse.quote_plus(query)
-    url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
+    Queries go through search_providers.hedged_search: the fastest endpoint
+    is asked first and a second endpoint is tried if it runs past its p95.
+    Each search waits for a slot of the search scheduler in the scan's
+    priority class (scan_scheduler.py); in batch runs failed searches
+    count against the adaptive search limit.
+    
+    deadline: the scan's Deadline; waiting for a slot ends with it (and
+    the search returns []), and the search gets what's left of it
+    """
     
     headers = {
         'User-Agent': random.choice(USER_AGENTS),
@@ -223,39 +521,15 @@ def search_duckduckgo(query, num_results=10, verbose=True):
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code != 200:
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        results = []
-        result_divs = soup.find_all('div', class_='result')
-        
-        for div in result_divs[:num_results]:
-            link = div.find('a', class_='result__a')
-            if link:
-                title = link.get_text(strip=True)
-                href = link.get('href', '')
-                
-                # Extract actual URL from DuckDuckGo redirect
-                if 'uddg=' in href:
-                    parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
-                    if 'uddg' in parsed:
-                        href = parsed['uddg'][0]
-                
-                if href.startswith('http'):
-                    snippet_elem = div.find('a', class_='result__snippet')
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-                    
-                    results.append({
-                        'title': title,
-                        'url': href,
-                        'snippet': snippet[:200] if snippet else ""
-                    })
-        
-        return results
+        with scheduled('search', timeout=deadline.remaining() if deadline else None):
+            if deadline:
+                timeout = deadline.remaining(cap=timeout)
+            return hedged_search(query, num_results=num_results, headers=headers, timeout=timeout)
         
+    except SlotTimeout:
+        if verbose:
+            print("   [!] No search slot came free before the deadline")
+        return []
     except Exception as e:
         if verbose:
             print(f"   [!] Search error: {e}")
@@ -265,12 +539,121 @@ def search_duckduckgo(query, num_results=10, verbose=True):
 # COMPANY RESEARCH & SCAM DETECTION
 # ============================================================================
 
-def research_company(company_name, verbose=True):
+# Research queries: two targeted searches, or one combined search
+SCAM_QUERY = '"{company}" scam reviews'
+REVIEW_QUERY = '"{company}" glassdoor trustpilot reviews'
+COMBINED_QUERY = '"{company}" scam reviews glassdoor trustpilot'
+
+# 'two_query' (default) or 'single' (one combined search, half the traffic)
+RESEARCH_MODE = os.environ.get('RESEARCH_MODE', 'two_query')
+
+# Web searches research_company makes for one company
+RESEARCH_SEARCHES = 1 if RESEARCH_MODE == 'single' else 2
+
+SCAM_KEYWORDS = ['scam', 'fraud', 'fake', 'beware', 'warning', 'avoid', 'suspicious']
+
+# Review sites by registrable name: any country domain counts
+# (glassdoor.de, indeed.com.sg, trustpilot.co.uk, ...)
+REVIEW_SITE_NAMES = {'glassdoor', 'indeed', 'trustpilot'}
+# ...and by full domain where only one is real
+REVIEW_SITE_DOMAINS = {'reddit.com'}
+
+# Second-level labels under country codes (co.uk, com.au, ...)
+_SECOND_LEVEL_LABELS = {'co', 'com', 'net', 'org'}
+_GENERIC_TLDS = {'com', 'net', 'org'}
+
+def _public_suffix_length(labels):
+    """Labels in a plausible public suffix at the end of labels (0 if none)"""
+    
+    if not labels:
+        return 0
+    tld = labels[-1]
+    if tld in _GENERIC_TLDS:
+        return 1
+    if len(tld) != 2 or not tld.isalpha():
+        return 0
+    if len(labels) >= 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return 2
+    return 1
+
+def review_site_domain(url):
+    """Review site domain (e.g. 'glassdoor.de') a result URL belongs to, or None"""
+    
+    host = (urllib.parse.urlsplit(url).hostname or '').rstrip('.')
+    labels = host.split('.')
+    
+    suffix = _public_suffix_length(labels)
+    if suffix and len(labels) > suffix:
+        domain = '.'.join(labels[-suffix - 1:])
+        if labels[-suffix - 1] in REVIEW_SITE_NAMES or domain in REVIEW_SITE_DOMAINS:
+            return domain
+    return None
+
+def find_scam_mentions(results):
+    """(results mentioning a scam keyword, red flag per mention)"""
+    
+    mentions = []
+    red_flags = []
+    
+    for result in results:
+        title_lower = result['title'].lower()
+        snippet_lower = result['snippet'].lower()
+        
+        for keyword in SCAM_KEYWORDS:
+            if keyword in title_lower or keyword in snippet_lower:
+                mentions.append(result)
+                red_flags.append(f"Found '{keyword}' in: {result['title'][:60]}...")
+                break
+    
+    return mentions, red_flags
+
+def find_review_sites(results):
+    """Results hosted on a known review site"""
+    
+    return [
+        {'title': result['title'], 'url': result['url']}
+        for result in results
+        if review_site_domain(result['url'])
+    ]
+
+def reputation_research(company_name, reputation):
+    """Research result for a company found in the offline reputation index"""
+    
+    known_scam = reputation['status'] == 'scam'
+    
+    return {
+        'company': company_name,
+        'scam_mentions': 0,
+        'review_sites': [],
+        'red_flags': [f"Listed as a known scam: {reputation['note'] or reputation['name']}"] if known_scam else [],
+        'trust_score': 0 if known_scam else 100,
+        'missing_checks': [],
+        'skipped_checks': ['scam_mentions', 'review_sites'],
+        'reputation': reputation
+    }
+
+def indexed_research(company_name, verbose=True):
+    """Research from the offline reputation index, or None if the company isn't listed"""
+    
+    index = get_reputation_index()
+    reputation = index.lookup(company_name) if index else None
+    if not reputation:
+        return None
+    
+    if verbose:
+        print(f"📚 Known {reputation['status']} employer: {reputation['name']} (offline reputation index)")
+    return reputation_research(company_name, reputation)
+
+def research_company(company_name, verbose=True, deadline=None, mode=None, search=None):
     """
     Research a company for scam indicators
     
+    Companies in the bundled reputation index (see reputation_index.py)
+    are answered from it without any web search; everyone else goes
+    through search_company (same arguments).
+    
     Returns:
-        dict with scam_mentions, red_flags, trust_score
+        dict with scam_mentions, red_flags, trust_score, missing_checks
     """
     
     if verbose:
@@ -279,42 +662,77 @@ def research_company(company_name, verbose=True):
         print(f"{'='*70}")
         print(f"Company: {company_name}\n")
     
-    red_flags = []
-    scam_mentions = 0
-    review_sites = []
+    # Known employers and known scams: no need to search
+    company_research = indexed_research(company_name, verbose=verbose)
+    if company_research:
+        return company_research
     
-    # SEARCH 1: Look for scam mentions
-    if verbose:
-        print("[*] Searching for scam mentions...")
-    scam_results = search_duckduckgo(f'"{company_name}" scam reviews', verbose=False)
+    return search_company(company_name, verbose=verbose, deadline=deadline, mode=mode, search=search)
+
+def search_company(company_name, verbose=True, deadline=None, mode=None, search=None):
+    """
+    Research a company by web search alone (no reputation index)
     
-    scam_keywords = ['scam', 'fraud', 'fake', 'beware', 'warning', 'avoid', 'suspicious']
+    mode: 'two_query' searches for scam mentions and review sites
+    separately; 'single' gets both from one combined search (default
+    RESEARCH_MODE)
     
-    for result in scam_results:
-        title_lower = result['title'].lower()
-        snippet_lower = result['snippet'].lower()
+    search: function with search_duckduckgo's signature (e.g. to replay
+    archived or recorded result pages), deadline keyword included
+    
+    Each search gets whatever is left of the deadline (at most
+    SEARCH_TIMEOUT). Searches skipped or cut off by the deadline are listed
+    in missing_checks so their absence isn't scored as a red flag.
+    
+    Returns:
+        dict with scam_mentions, red_flags, trust_score, missing_checks
+    """
+    
+    deadline = deadline or Deadline(None)
+    mode = mode or RESEARCH_MODE
+    search = search or search_duckduckgo
+    
+    missing_checks = []
+    
+    def timed_search(query, checks, num_results=10):
+        if deadline.expired():
+            missing_checks.extend(checks)
+            return []
+        results = search(
+            query, num_results=num_results, verbose=False, timeout=deadline.remaining(cap=SEARCH_TIMEOUT),
+            deadline=deadline,
+        )
+        if not results and deadline.expired():
+            missing_checks.extend(checks)
+        return results
+    
+    if mode == 'single':
+        # ONE SEARCH: scam mentions and review sites from the same results
+        if verbose:
+            print("[*] Searching for scam mentions and reviews...")
+        scam_results = review_results = timed_search(
+            COMBINED_QUERY.format(company=company_name), ['scam_mentions', 'review_sites'], num_results=20
+        )
+    else:
+        # SEARCH 1: Look for scam mentions
+        if verbose:
+            print("[*] Searching for scam mentions...")
+        scam_results = timed_search(SCAM_QUERY.format(company=company_name), ['scam_mentions'])
         
-        for keyword in scam_keywords:
-            if keyword in title_lower or keyword in snippet_lower:
-                scam_mentions += 1
-                red_flags.append(f"Found '{keyword}' in: {result['title'][:60]}...")
-                if verbose:
-                    print(f"   🚩 {result['title'][:70]}...")
-                break
+        # SEARCH 2: Find review sites
+        if verbose:
+            print(f"\n[*] Searching for reviews...")
+        review_results = timed_search(REVIEW_QUERY.format(company=company_name), ['review_sites'])
+    
+    mentions, red_flags = find_scam_mentions(scam_results)
+    scam_mentions = len(mentions)
+    review_sites = find_review_sites(review_results)
     
-    # SEARCH 2: Find review sites
     if verbose:
-        print(f"\n[*] Searching for reviews...")
-    review_results = search_duckduckgo(f'"{company_name}" glassdoor trustpilot reviews', verbose=False)
-    
-    for result in review_results:
-        if any(site in result['url'].lower() for site in ['glassdoor', 'indeed', 'trustpilot', 'reddit']):
-            review_sites.append({
-                'title': result['title'],
-                'url': result['url']
-            })
-            if verbose:
-                print(f"   📋 {result['title'][:60]}...")
+        for result in mentions:
+            print(f"   🚩 {result['title'][:70]}...")
+        for site in review_sites:
+            print(f"   📋 {site['title'][:60]}...")
     
     # Calculate trust score (inverted - more scam mentions = lower trust)
     trust_score = max(0, 100 - (scam_mentions * 20))
@@ -323,23 +741,62 @@ def research_company(company_name, verbose=True):
         print(f"\n✅ Research complete:")
         print(f"   Scam mentions: {scam_mentions}")
         print(f"   Trust score: {trust_score}/100")
+        if missing_checks:
+            print(f"   Out of time for: {', '.join(missing_checks)}")
     
     return {
         'company': company_name,
         'scam_mentions': scam_mentions,
         'review_sites': review_sites[:5],
         'red_flags': red_flags,
-        'trust_score': trust_score
+        'trust_score': trust_score,
+        'missing_checks': missing_checks
     }
 
 # ============================================================================
 # SCAM DETECTOR - ANALYZE JOB + COMPANY DATA
 # ============================================================================
 
-def analyze_job(job_data, company_research, verbose=True):
+# Verdict bands
+HIGH_RISK_SCORE = 70
+MEDIUM_RISK_SCORE = 40
+
+# Points for a company on the offline known-scam list (HIGH RISK alone)
+KNOWN_SCAM_POINTS = 70
+
+# Trained text classifier (see text_classifier.py): flag postings above
+# this probability, adding up to MODEL_MAX_POINTS to the risk score
+MODEL_FLAG_THRESHOLD = 0.5
+MODEL_MAX_POINTS = 30
+
+def model_probability_for(job_data):
+    """Scam probability from the trained text model, or None without one"""
+    
+    if score_postings is None:
+        return None
+    
+    probabilities = score_postings([job_data])
+    return probabilities[0] if probabilities else None
+
+def applicant_surge(job_data):
+    """Over 100 applicants on a posting only hours or days old"""
+    
+    if job_data['applicants'] == 'N/A':
+        return False
+    
+    applicants_text = job_data['applicants'].lower()
+    posted_text = job_data['posted'].lower()
+    return ('100' in applicants_text or 'over' in applicants_text) and \
+        ('day' in posted_text or 'hour' in posted_text)
+
+def analyze_job(job_data, company_research, verbose=True, model_probability=None, use_model=True):
     """
     Analyze job posting for scam indicators
     
+    model_probability: precomputed text model score (batch callers score
+    many postings at once); computed here when omitted
+    use_model: False scores the rules alone, without the text model
+    
     Returns:
         dict with risk_score, red_flags, verdict
     """
@@ -360,6 +817,15 @@ def analyze_job(job_data, company_research, verbose=True):
         if verbose:
             print(f"🚩 {flag}")
     
+    # RED FLAG 1b: Company is on the offline known-scam list
+    reputation = company_research.get('reputation')
+    if reputation and reputation['status'] == 'scam':
+        flag = f"Company is listed as a known job scam ({reputation['name']})"
+        red_flags.append(flag)
+        risk_score += KNOWN_SCAM_POINTS
+        if verbose:
+            print(f"🚩 {flag}")
+    
     # RED FLAG 2: Suspiciously high pay for entry-level/intern
     title_lower = job_data['job_title'].lower()
     if ('intern' in title_lower or 'entry' in title_lower or 'junior' in title_lower):
@@ -370,9 +836,13 @@ def analyze_job(job_data, company_research, verbose=True):
             if verbose:
                 print(f"🚩 {flag}")
     
+    # Checks that ran out of time (a cut-off page, partial research) or were skipped
+    missing_checks = job_data.get('missing_checks', []) + company_research.get('missing_checks', [])
+    unchecked = missing_checks + company_research.get('skipped_checks', [])
+    
     # RED FLAG 3: Vague or very short job description
     desc_length = len(job_data['description'])
-    if desc_length < 300:
+    if desc_length < 300 and 'posting' not in unchecked:
         flag = f"Very short job description ({desc_length} characters)"
         red_flags.append(flag)
         risk_score += 15
@@ -380,17 +850,12 @@ def analyze_job(job_data, company_research, verbose=True):
             print(f"🚩 {flag}")
     
     # RED FLAG 4: High applicants + recently posted = suspicious
-    if job_data['applicants'] != 'N/A':
-        applicants_text = job_data['applicants'].lower()
-        posted_text = job_data['posted'].lower()
-        
-        if ('100' in applicants_text or 'over' in applicants_text) and \
-           ('day' in posted_text or 'hour' in posted_text):
-            flag = f"Too many applicants ({job_data['applicants']}) for recently posted job ({job_data['posted']})"
-            red_flags.append(flag)
-            risk_score += 20
-            if verbose:
-                print(f"🚩 {flag}")
+    if applicant_surge(job_data):
+        flag = f"Too many applicants ({job_data['applicants']}) for recently posted job ({job_data['posted']})"
+        red_flags.append(flag)
+        risk_score += 20
+        if verbose:
+            print(f"🚩 {flag}")
     
     # RED FLAG 5: Remote + High pay + Intern = Classic scam pattern
     if 'remote' in title_lower and 'intern' in title_lower and '$' in job_data['job_title']:
@@ -401,21 +866,32 @@ def analyze_job(job_data, company_research, verbose=True):
             print(f"🚩 {flag}")
     
     # RED FLAG 6: Company has no review sites
-    if len(company_research['review_sites']) == 0:
+    if len(company_research['review_sites']) == 0 and 'review_sites' not in unchecked:
         flag = "No Glassdoor/Trustpilot reviews found for company"
         red_flags.append(flag)
         risk_score += 15
         if verbose:
             print(f"🚩 {flag}")
     
+    # RED FLAG 7: Posting text reads like known scams (trained model)
+    if model_probability is None and use_model:
+        model_probability = model_probability_for(job_data)
+    
+    if model_probability is not None and model_probability >= MODEL_FLAG_THRESHOLD:
+        flag = f"Posting text resembles known scams ({model_probability:.0%} model probability)"
+        red_flags.append(flag)
+        risk_score += round(model_probability * MODEL_MAX_POINTS)
+        if verbose:
+            print(f"🚩 {flag}")
+    
     # Cap risk score at 100
     risk_score = min(risk_score, 100)
     
     # Determine verdict
-    if risk_score >= 70:
+    if risk_score >= HIGH_RISK_SCORE:
         verdict = "🔴 HIGH RISK - Likely Scam"
         recommendation = "AVOID - Multiple red flags detected"
-    elif risk_score >= 40:
+    elif risk_score >= MEDIUM_RISK_SCORE:
         verdict = "🟡 MEDIUM RISK - Proceed with Caution"
         recommendation = "RESEARCH FURTHER - Some concerning signs"
     else:
@@ -426,6 +902,8 @@ def analyze_job(job_data, company_research, verbose=True):
         print(f"\n{'='*70}")
         print(f"VERDICT: {verdict}")
         print(f"Risk Score: {risk_score}/100")
+        if missing_checks:
+            print(f"⏱️  Incomplete - not checked: {', '.join(missing_checks)}")
         print(f"{'='*70}")
     
     return {
@@ -433,78 +911,403 @@ def analyze_job(job_data, company_research, verbose=True):
         'red_flags': red_flags,
         'verdict': verdict,
         'recommendation': recommendation,
-        'total_flags': len(red_flags)
+        'total_flags': len(red_flags),
+        'model_probability': model_probability,
+        'incomplete': bool(missing_checks),
+        'missing_checks': missing_checks
     }
 
 # ============================================================================
 # MAIN PIPELINE - FULL SCAM DETECTION
 # ============================================================================
 
-def scan_linkedin_job(job_url, verbose=True):
+def scrape_job(job_url, store, verbose=True, deadline=None):
+    """
+    scrape_linkedin_job behind the store's negative cache
+    
+    A job ID that failed recently with a cacheable reason (see
+    NEGATIVE_CACHE_TTLS) gets the same ScrapeFailure back at once, without
+    launching a browser.
+    """
+    
+    job_id = extract_job_id(job_url)
+    
+    cached = store.get_failure(job_id) if store and job_id else None
+    if cached:
+        failure = ScrapeFailure(cached['reason'], cached['detail'], cached=True)
+        if verbose:
+            print(f"\n⏩ Recently failed ({FAILURE_MESSAGES[failure.reason]}) - not scraping again yet")
+        return failure
+    
+    # Browser slot in the scan's priority class, waited for no longer than
+    # the deadline allows. Timeouts, errors and login walls mean LinkedIn
+    # or the host is struggling; dead postings don't
+    try:
+        with scheduled('scrape', timeout=deadline.remaining() if deadline else None) as outcome:
+            job_data = scrape_linkedin_job(job_url, verbose=verbose, deadline=deadline)
+            outcome.ok = job_data is not None and getattr(job_data, 'reason', None) not in ('timeout', 'error', 'auth_wall')
+    except SlotTimeout as e:
+        if verbose:
+            print("\n⏱️  No browser came free before the deadline")
+        return ScrapeFailure('timeout', str(e))
+    
+    if isinstance(job_data, ScrapeFailure) and job_data.reason in NEGATIVE_CACHE_TTLS and store and job_id:
+        store.save_failure(job_id, job_data.reason, job_data.detail, NEGATIVE_CACHE_TTLS[job_data.reason])
+    
+    return job_data
+
+def research_still_fresh(previous, company_name, store):
+    """
+    Whether a stored scan's research is still current: it skipped research,
+    or the company's cached research is within RESEARCH_MAX_AGE and no newer
+    than the scan (so the stored verdict already reflects it). Reputation
+    index answers aren't cached, so they're looked up again (instantly).
+    """
+    
+    research = previous['result'].get('company_research', {})
+    if research.get('skipped_checks') and not research.get('reputation'):
+        return True
+    
+    entry = store.get_company_research_entry(company_name, RESEARCH_MAX_AGE)
+    return entry is not None and entry['researched_at'] <= previous['scanned_at']
+
+def check_unchanged(job_url, job_data, store, verbose=True):
+    """
+    Hash scraped job data and compare with the last stored scan
+    
+    The hash leaves out 'posted' and 'applicants', which change daily. The
+    stored result is only reused while the rules that read them
+    (applicant_surge) come out the same, and while its company research is
+    still fresh (see research_still_fresh); otherwise the posting is
+    researched and analyzed again. A reused result shows the new values.
+    
+    Returns:
+        (job_id, content_hash, previous_result or None)
+    """
+    
+    job_id = extract_job_id(job_url)
+    content_hash = hash_job_data(job_data)
+    
+    if store and job_id:
+        previous = store.get_scan(job_id)
+        if (previous and previous['content_hash'] == content_hash
+                and applicant_surge(previous['result']['job_data']) == applicant_surge(job_data)
+                and research_still_fresh(previous, job_data['company'], store)):
+            if verbose:
+                print(f"\n♻️  Posting unchanged since last scan - reusing stored result")
+            result = previous['result']
+            result['job_data'] = {**result['job_data'], 'posted': job_data['posted'],
+                                  'applicants': job_data['applicants']}
+            result['unchanged'] = True
+            return job_id, content_hash, result
+    
+    return job_id, content_hash, None
+
+def save_research(company_name, company_research, store):
+    """Cache complete research; returns False if it wasn't cacheable"""
+    
+    # Research cut short by a deadline is used once but never cached, and
+    # index answers are instant (and follow index updates) without caching
+    if not store or company_research['missing_checks'] or company_research.get('reputation'):
+        return False
+    store.save_company_research(company_name, company_research)
+    return True
+
+def _refresh_research(company_name, store):
+    # Background work: queue behind interactive scans for searches
+    with scan_priority(BATCH):
+        company_research = research_company(company_name, verbose=False)
+    return save_research(company_name, company_research, store)
+
+_research_refresher = ResearchRefresher(_refresh_research)
+
+def research_refresh_stats():
+    """Stale entries served and background refreshes in this process"""
+    return _research_refresher.stats()
+
+def cached_research(company_name, store, verbose=True):
+    """
+    Cached research for a company, or None if there is none young enough
+    
+    Past RESEARCH_MAX_AGE (but within RESEARCH_HARD_MAX_AGE) the entry is
+    returned marked 'stale' and a background refresh is started (see
+    research_refresh.py), so the scan doesn't wait for the searches.
+    """
+    
+    entry = store.get_company_research_entry(company_name) if store else None
+    if not entry:
+        return None
+    
+    if time.time() - entry['researched_at'] <= RESEARCH_MAX_AGE:
+        if verbose:
+            print(f"\n♻️  Reusing cached research for {company_name}")
+        return entry['research']
+    
+    started = _research_refresher.refresh(company_name, store)
+    if verbose:
+        days = (time.time() - entry['researched_at']) / 86400
+        print(f"\n♻️  Reusing {days:.0f}-day-old research for {company_name}"
+              + (" - refreshing in the background" if started else ""))
+    return mark_stale(entry['research'], entry['researched_at'])
+
+def get_company_research(company_name, store, verbose=True, deadline=None):
+    """Cached company research if fresh (or only a little stale), otherwise research now"""
+    
+    company_research = cached_research(company_name, store, verbose=verbose)
+    if company_research:
+        return company_research
+    
+    company_research = research_company(company_name, verbose=verbose, deadline=deadline)
+    save_research(company_name, company_research, store)
+    
+    return company_research
+
+# Why a company wasn't researched, as shown in the report
+SKIP_REASONS = {
+    'high_risk': "the posting alone is HIGH RISK",
+    'not_requested': "not requested for this scan",
+    'not_cached': "no earlier research for this company",
+    'not_archived': "its searches weren't archived",
+}
+
+def skipped_research(company_name, reason):
+    """Stand-in research for a company that wasn't looked up (reason: a SKIP_REASONS key)"""
+    
+    return {
+        'company': company_name,
+        'scam_mentions': 0,
+        'review_sites': [],
+        'red_flags': [],
+        'trust_score': None,
+        'missing_checks': [],
+        'skipped_checks': ['scam_mentions', 'review_sites'],
+        'skip_reason': reason
+    }
+
+def tiered_research(job_data, store, verbose=True, deadline=None, full_research=False, research=None):
+    """
+    Company research, skipped when it can't change the verdict band
+    
+    Cached research (even stale, see cached_research) is always used.
+    Otherwise the posting-only rules run first: research only ever adds
+    points, so a posting already at HIGH_RISK_SCORE stays HIGH RISK and
+    the searches are skipped. The text model is left out here; it's scored
+    once, in the final analyze_job (batched in pipeline.py).
+
+    full_research: research regardless
+    research: callable that researches a company (defaults to
+    get_company_research)
+    """
+    
+    company_name = job_data['company']
+    
+    cached = cached_research(company_name, store, verbose=verbose)
+    if cached:
+        return cached
+    
+    if not full_research:
+        posting_only = analyze_job(job_data, skipped_research(company_name, 'high_risk'), verbose=False,
+                                   use_model=False)
+        if posting_only['risk_score'] >= HIGH_RISK_SCORE:
+            if verbose:
+                print(f"\n⏩ Posting alone scores {posting_only['risk_score']}/100 - skipping company research")
+            return skipped_research(company_name, 'high_risk')
+    
+    if research:
+        return research(company_name)
+    return get_company_research(company_name, store, verbose=verbose, deadline=deadline)
+
+def print_report(job_data, company_research, analysis):
+    """Print the final scan report"""
+    
+    print(f"\n{'='*70}")
+    print("📊 FINAL REPORT")
+    print(f"{'='*70}\n")
+    
+    print(f"🏢 Company: {job_data['company']}")
+    print(f"💼 Position: {job_data['job_title']}")
+    print(f"📍 Location: {job_data['location']}")
+    print(f"📅 Posted: {job_data['posted']}")
+    if job_data['applicants'] != 'N/A':
+        print(f"👥 Applicants: {job_data['applicants']}")
+    
+    print(f"\n{analysis['verdict']}")
+    if analysis.get('incomplete'):
+        print(f"⏱️  Partial result - ran out of time for: {', '.join(analysis['missing_checks'])}")
+    print(f"📊 Risk Score: {analysis['risk_score']}/100")
+    print(f"🚩 Red Flags: {analysis['total_flags']}")
+    if company_research.get('reputation'):
+        print(f"📚 Known {company_research['reputation']['status']} employer (offline reputation index)")
+    elif company_research.get('skipped_checks'):
+        reason = SKIP_REASONS.get(company_research.get('skip_reason'))
+        print("⏩ Company research skipped" + (f" - {reason}" if reason else ""))
+    
+    print(f"\n💡 Recommendation: {analysis['recommendation']}")
+    
+    if analysis['red_flags']:
+        print(f"\n⚠️  DETECTED RED FLAGS:")
+        for i, flag in enumerate(analysis['red_flags'], 1):
+            print(f"   {i}. {flag}")
+    
+    if company_research['review_sites']:
+        print(f"\n📋 REVIEW SITES TO CHECK:")
+        for site in company_research['review_sites'][:3]:
+            print(f"   • {site['title']}")
+            print(f"     {site['url']}")
+    
+    print(f"\n{'='*70}\n")
+
+def build_result(job_id, content_hash, job_data, company_research, analysis, store):
+    """Assemble the scan result and record it in the store"""
+    
+    result = {
+        'job_id': job_id,
+        'content_hash': content_hash,
+        'job_data': job_data,
+        'company_research': company_research,
+        'analysis': analysis,
+        'unchanged': False,
+        'incomplete': analysis.get('incomplete', False)
+    }
+    
+    # Partial results aren't stored, so the next scan finishes the job
+    if store and job_id and not result['incomplete']:
+        store.save_scan(job_id, content_hash, result)
+    
+    return result
+
+def scan_linkedin_job(job_url, verbose=True, store=None, deadline=None, full_research=False,
+                      profile=None, profile_dir=None):
     """
     Complete scam detection pipeline:
     1. Scrape job posting
-    2. Research company
+    2. Research company (unless the posting alone is already HIGH RISK,
+       see tiered_research; full_research=True always researches)
     3. Analyze for scams
     4. Generate report
+    
+    If the scraped posting hashes the same as the last stored scan for
+    its job ID and that scan's company research is still fresh, the stored
+    result is returned without re-analysis.
+    Company research is reused while it is within its freshness window.
+    Pass store=False to scan without reading or writing history.
+    
+    deadline: total seconds for the whole scan (default SCAN_DEADLINE,
+    0 = no limit). Each stage gets whatever its predecessors left over.
+    When time runs out, analysis runs on what was gathered and the result
+    is marked incomplete (with the skipped checks listed) rather than
+    blocking.
+    
+    When no posting data could be extracted, a ScrapeFailure (falsy) says
+    why. Expired, missing and login-walled postings are remembered for a
+    while (NEGATIVE_CACHE_TTLS), so asking again fails without a browser.
+    
+    profile: True/False to profile this scan or not; None samples at
+    SCAN_PROFILE_RATE. Profiles go to profile_dir (default
+    SCAN_PROFILE_DIR), see scan_profiler.py.
     """
     
+    with profile_scan(extract_job_id(job_url) or 'scan', profile, profile_dir) as profile_path:
+        result = _scan_linkedin_job(job_url, verbose, store, deadline, full_research)
+    
+    if profile_path and verbose:
+        print(f"[*] Scan profile written to {profile_path}.*")
+    
+    return result
+
+def _scan_linkedin_job(job_url, verbose, store, deadline, full_research):
+    """scan_linkedin_job without the profiling wrapper"""
+    
     if verbose:
         print("\n" + "="*70)
         print("🛡️  LINKEDIN JOB SCAM DETECTOR")
         print("="*70)
     
-    # STEP 1: Scrape the job
-    job_data = scrape_linkedin_job(job_url, verbose=verbose)
+    if store is None:
+        store = get_default_store()
+    
+    deadline = Deadline(SCAN_DEADLINE if deadline is None else deadline)
+    
+    # STEP 1: Scrape the job (recently dead postings fail straight away)
+    job_data = scrape_job(job_url, store, verbose=verbose, deadline=deadline)
     
     if not job_data or job_data['company'] == 'N/A':
+        failure = job_data if isinstance(job_data, ScrapeFailure) else ScrapeFailure('error')
         if verbose:
-            print("\n❌ FAILED: Could not scrape job data")
-        return None
+            print(f"\n❌ FAILED: {FAILURE_MESSAGES[failure.reason]}")
+        return failure
     
-    # STEP 2: Research the company
-    company_research = research_company(job_data['company'], verbose=verbose)
+    # Unchanged posting: reuse the previous verdict
+    job_id, content_hash, previous = check_unchanged(job_url, job_data, store, verbose=verbose)
+    if previous:
+        return previous
+    
+    # STEP 2: Research the company (cached research if still fresh)
+    company_research = tiered_research(
+        job_data, store, verbose=verbose, deadline=deadline, full_research=full_research
+    )
     
     # STEP 3: Analyze for scams
     analysis = analyze_job(job_data, company_research, verbose=verbose)
     
     # STEP 4: Generate final report
     if verbose:
-        print(f"\n{'='*70}")
-        print("📊 FINAL REPORT")
-        print(f"{'='*70}\n")
-        
-        print(f"🏢 Company: {job_data['company']}")
-        print(f"💼 Position: {job_data['job_title']}")
-        print(f"📍 Location: {job_data['location']}")
-        print(f"📅 Posted: {job_data['posted']}")
-        if job_data['applicants'] != 'N/A':
-            print(f"👥 Applicants: {job_data['applicants']}")
-        
-        print(f"\n{analysis['verdict']}")
-        print(f"📊 Risk Score: {analysis['risk_score']}/100")
-        print(f"🚩 Red Flags: {analysis['total_flags']}")
-        
-        print(f"\n💡 Recommendation: {analysis['recommendation']}")
-        
-        if analysis['red_flags']:
-            print(f"\n⚠️  DETECTED RED FLAGS:")
-            for i, flag in enumerate(analysis['red_flags'], 1):
-                print(f"   {i}. {flag}")
-        
-        if company_research['review_sites']:
-            print(f"\n📋 REVIEW SITES TO CHECK:")
-            for site in company_research['review_sites'][:3]:
-                print(f"   • {site['title']}")
-                print(f"     {site['url']}")
-        
-        print(f"\n{'='*70}\n")
+        print_report(job_data, company_research, analysis)
     
-    return {
-        'job_data': job_data,
-        'company_research': company_research,
-        'analysis': analysis
-    }
+    return build_result(job_id, content_hash, job_data, company_research, analysis, store)
+
+TEXT_RESEARCH_MODES = ('cached', 'full', 'none')
+
+def scan_job_text(title, company, description, research='cached', verbose=True, store=None,
+                  deadline=None, location=None, job_url=None):
+    """
+    Scan a posting from its text (pasted from an email, PDF, ...) - no browser
+    
+    Builds the same job_data a scrape would (fields not given are 'N/A')
+    and analyzes it straight away.
+    
+    research: 'cached' uses stored company research, even stale (see
+    cached_research), or the offline reputation index, and skips research
+    otherwise, so the scan takes milliseconds; 'full' researches like a
+    URL scan when nothing is cached (see tiered_research); 'none' never
+    looks the company up
+    
+    Text scans have no job ID, so the result (job_id None) isn't stored.
+    Raises ValueError without a company or description.
+    """
+    
+    if research not in TEXT_RESEARCH_MODES:
+        raise ValueError(f"research must be one of {', '.join(TEXT_RESEARCH_MODES)}, not {research!r}")
+    if not (company or '').strip() or not (description or '').strip():
+        raise ValueError("A company name and a job description are required")
+    
+    if store is None:
+        store = get_default_store()
+    
+    job_data = build_job_data(
+        {'job_title': title, 'company': company, 'description': description, 'location': location}, job_url
+    )
+    company_name = job_data['company']
+    
+    if research == 'none':
+        company_research = skipped_research(company_name, 'not_requested')
+    elif research == 'cached':
+        company_research = (
+            cached_research(company_name, store, verbose=verbose)
+            or indexed_research(company_name, verbose=verbose)
+            or skipped_research(company_name, 'not_cached')
+        )
+    else:
+        company_research = tiered_research(
+            job_data, store, verbose=verbose, deadline=Deadline(SCAN_DEADLINE if deadline is None else deadline)
+        )
+    
+    analysis = analyze_job(job_data, company_research, verbose=verbose)
+    
+    if verbose:
+        print_report(job_data, company_research, analysis)
+    
+    return build_result(None, hash_job_data(job_data), job_data, company_research, analysis, store)
 
 
 # ============================================================================
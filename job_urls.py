@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Job URL Helpers
+Shared by the Streamlit app and the scan engine (no Streamlit import)
+
+Besides single-URL helpers, streams large URL exports (plain text, CSV or
+JSON lines) into canonical view URLs with duplicate job IDs removed:
+
+    python job_urls.py export.csv --output urls.txt
+    python job_urls.py export.jsonl --field url --output urls.txt
+    python job_urls.py dump.txt --seen-filter seen_jobs.bloom --ids
+
+Lines are matched with precompiled patterns, without parsing URLs or
+(unless a --field is given) CSV/JSON. Duplicates are dropped exactly, with
+a Bloom filter whose hits are confirmed in an on-disk table
+(seen_filter.ConfirmedSeen), so memory stays small however long the
+export. A persistent --seen-filter is a plain Bloom filter: about one in
+a thousand IDs it has never seen is dropped as a false positive.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+
+VIEW_URL = "https://www.linkedin.com/jobs/view/{}/"
+
+# Tried in order. /jobs/view/ also matches slugged URLs like
+# /jobs/view/senior-engineer-at-acme-4360972282/
+VIEW_PATTERN = re.compile(r'/jobs/view/(?:[^/?#\s"]*-)?(\d+)')
+CURRENT_JOB_PATTERN = re.compile(r'[?&]currentJobId=(\d+)')
+PATH_PATTERN = re.compile(r'/jobs/(\d+)')
+
+# Dedupe filter error rate when no filter is given; a false positive costs
+# one table lookup, never a dropped job
+DEDUPE_ERROR_RATE = 1e-3
+DEDUPE_INITIAL_CAPACITY = 1_000_000
+DEDUPE_BATCH_SIZE = 4096
+
+def extract_job_id(linkedin_url):
+    """Extract job ID from any LinkedIn job URL format"""
+
+    # Format 1: Already a direct view URL
+    match = VIEW_PATTERN.search(linkedin_url)
+    if match:
+        return match.group(1)
+
+    # Format 2: Search URL with currentJobId parameter
+    match = CURRENT_JOB_PATTERN.search(linkedin_url)
+    if match:
+        return match.group(1)
+
+    # Format 3: Job ID in URL path
+    match = PATH_PATTERN.search(linkedin_url)
+    if match:
+        return match.group(1)
+
+    return None
+
+def convert_to_view_url(linkedin_url):
+    """Convert any LinkedIn job URL to direct view URL"""
+
+    job_id = extract_job_id(linkedin_url)
+
+    if job_id:
+        return VIEW_URL.format(job_id)
+
+    return None
+
+def normalize_job_url(linkedin_url):
+    """(job_id, view_url) for a job URL or bare job ID, or (None, None)"""
+
+    value = linkedin_url.strip()
+    job_id = value if value.isdigit() else extract_job_id(value)
+    return (job_id, VIEW_URL.format(job_id)) if job_id else (None, None)
+
+# ============================================================================
+# STREAMING EXPORTS
+# ============================================================================
+
+def detect_format(path):
+    """'csv', 'jsonl' or 'text' from the file extension"""
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.csv', '.tsv'):
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return 'text'
+
+def iter_values(lines, file_format='text', field=None):
+    """
+    Strings that may hold a job URL, one per record
+
+    Without a field, each raw line is used as is (a URL anywhere in a CSV
+    row or JSON record is found by the patterns); with a field, only that
+    CSV column (by header name) or JSON key is used.
+    """
+
+    if field is None:
+        if file_format == 'jsonl':
+            # JSON may escape slashes: "https:\/\/www.linkedin.com\/jobs\/view\/1\/"
+            return (line.replace('\\/', '/') for line in lines)
+        return lines
+
+    if file_format == 'csv':
+        return (row.get(field) or '' for row in csv.DictReader(lines))
+
+    if file_format == 'jsonl':
+        def values():
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    value = json.loads(line).get(field)
+                except (ValueError, AttributeError):
+                    continue
+                if isinstance(value, str):
+                    yield value
+        return values()
+
+    raise ValueError(f"field only applies to csv and jsonl input, not {file_format}")
+
+def _new_only(batch, add_many):
+    new = add_many([job_id for job_id, _ in batch])
+    return (item for item, is_new in zip(batch, new) if is_new)
+
+def normalize_stream(values, seen=None):
+    """
+    Yield (job_id, view_url) for each job ID not seen before
+
+    seen: anything with add(job_id) -> True if new, e.g. a
+    seen_filter.ScalableBloomFilter (pass a persistent one to also skip IDs
+    from earlier runs; its false positives drop some new IDs). Defaults to
+    a temporary, exact seen_filter.ConfirmedSeen.
+    """
+
+    temporary = None
+    if seen is None:
+        from seen_filter import ConfirmedSeen
+        temporary = tempfile.TemporaryDirectory(prefix='job_urls-')
+        seen = ConfirmedSeen(os.path.join(temporary.name, 'dedupe'),
+                             initial_capacity=DEDUPE_INITIAL_CAPACITY,
+                             error_rate=DEDUPE_ERROR_RATE, temporary=True)
+
+    add_many = getattr(seen, 'add_many', None)
+
+    try:
+        if add_many is None:
+            for value in values:
+                job_id, view_url = normalize_job_url(value)
+                if job_id and seen.add(job_id):
+                    yield job_id, view_url
+            return
+
+        # Batches take the filter's locks once per DEDUPE_BATCH_SIZE IDs
+        batch = []
+        for value in values:
+            job_id, view_url = normalize_job_url(value)
+            if job_id:
+                batch.append((job_id, view_url))
+            if len(batch) >= DEDUPE_BATCH_SIZE:
+                yield from _new_only(batch, add_many)
+                batch = []
+        yield from _new_only(batch, add_many)
+    finally:
+        if temporary:
+            seen.close()
+            temporary.cleanup()
+
+def read_job_urls(path, file_format=None, field=None, seen=None):
+    """Canonical view URLs of the distinct job IDs in a URL export file"""
+
+    file_format = file_format or detect_format(path)
+    with open(path, encoding='utf-8', newline='' if file_format == 'csv' else None) as f:
+        for _, view_url in normalize_stream(iter_values(f, file_format, field), seen):
+            yield view_url
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalize and de-duplicate LinkedIn job URLs')
+    parser.add_argument('input', help='text, CSV or JSON lines export ("-" for stdin)')
+    parser.add_argument('--format', choices=['text', 'csv', 'jsonl'], help='default: from the extension')
+    parser.add_argument('--field', help='CSV column or JSON key holding the URL (default: search whole lines)')
+    parser.add_argument('--output', help='write here instead of stdout')
+    parser.add_argument('--ids', action='store_true', help='write job IDs instead of URLs')
+    parser.add_argument('--seen-filter', help='persistent Bloom filter: also drop IDs seen in earlier runs')
+    args = parser.parse_args()
+
+    file_format = args.format or ('text' if args.input == '-' else detect_format(args.input))
+    source = sys.stdin if args.input == '-' else open(
+        args.input, encoding='utf-8', newline='' if file_format == 'csv' else None
+    )
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    seen = None
+    if args.seen_filter:
+        from seen_filter import ScalableBloomFilter
+        seen = ScalableBloomFilter(args.seen_filter)
+
+    written = 0
+    try:
+        for job_id, view_url in normalize_stream(iter_values(source, file_format, args.field), seen):
+            output.write((job_id if args.ids else view_url) + '\n')
+            written += 1
+    finally:
+        if seen:
+            seen.close()
+        if output is not sys.stdout:
+            output.close()
+        if source is not sys.stdin:
+            source.close()
+
+    print(f"✅ {written:,} distinct job IDs", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import streamlit as st
-from detector_scam import scan_linkedin_job
+from detector_scam import scan_job_text, scan_linkedin_job
+from job_urls import normalize_job_url
+from scan_scheduler import INTERACTIVE, scan_priority
 import time
-import re
-from urllib.parse import urlparse, parse_qs
+
+# Longest the UI waits for one scan; slower stages give a partial result
+UI_SCAN_DEADLINE = 60
 
 # Page configuration
 st.set_page_config(
@@ -11,42 +14,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# ============================================================================
-# URL CONVERTER FUNCTIONS
-# ============================================================================
-
-def extract_job_id(linkedin_url):
-    """Extract job ID from any LinkedIn job URL format"""
-    
-    # Format 1: Already a direct view URL
-    view_match = re.search(r'/jobs/view/(\d+)', linkedin_url)
-    if view_match:
-        return view_match.group(1)
-    
-    # Format 2: Search URL with currentJobId parameter
-    parsed_url = urlparse(linkedin_url)
-    query_params = parse_qs(parsed_url.query)
-    
-    if 'currentJobId' in query_params:
-        return query_params['currentJobId'][0]
-    
-    # Format 3: Job ID in URL path
-    path_match = re.search(r'/jobs/(\d+)', linkedin_url)
-    if path_match:
-        return path_match.group(1)
-    
-    return None
-
-def convert_to_view_url(linkedin_url):
-    """Convert any LinkedIn job URL to direct view URL"""
-    
-    job_id = extract_job_id(linkedin_url)
-    
-    if job_id:
-        return f"https://www.linkedin.com/jobs/view/{job_id}/"
-    
-    return None
-
 # ============================================================================
 # CUSTOM CSS
 # ============================================================================
@@ -106,150 +73,205 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+def show_result(result, posting_url=None):
+    """Verdict, metrics, job details and red flags for a successful scan"""
+    
+    analysis = result['analysis']
+    job_data = result['job_data']
+    company_research = result['company_research']
+    
+    # Display results
+    st.markdown("---")
+    st.markdown("## 📊 Scan Results")
+    
+    # Risk verdict with color coding
+    risk_score = analysis['risk_score']
+    
+    if risk_score >= 70:
+        st.markdown(f"""
+        <div class="risk-high">
+            <h2 style="color: #d63031; margin: 0;">🔴 HIGH RISK - Likely Scam</h2>
+            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    elif risk_score >= 40:
+        st.markdown(f"""
+        <div class="risk-medium">
+            <h2 style="color: #f39c12; margin: 0;">🟡 MEDIUM RISK - Proceed with Caution</h2>
+            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="risk-low">
+            <h2 style="color: #27ae60; margin: 0;">🟢 LOW RISK - Appears Legitimate</h2>
+            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    if result.get('incomplete'):
+        st.warning(
+            "⏱️ **Partial result** - the scan ran out of time before checking: "
+            + ", ".join(analysis['missing_checks']).replace('_', ' ')
+            + ". Try scanning again for a complete verdict."
+        )
+    
+    # Metrics
+    st.markdown("### 📈 Key Metrics")
+    col_m1, col_m2, col_m3 = st.columns(3)
+    
+    with col_m1:
+        st.metric("Risk Score", f"{risk_score}/100")
+    
+    with col_m2:
+        st.metric("Red Flags", analysis['total_flags'])
+    
+    with col_m3:
+        if company_research['trust_score'] is None:
+            st.metric("Company Trust Score", "Not checked",
+                      help="Skipped - the posting alone is already high risk" if posting_url
+                      else "No company research for this text scan")
+        else:
+            st.metric("Company Trust Score", f"{company_research['trust_score']}/100")
+        if company_research.get('stale'):
+            st.caption(f"Company research from {company_research['age_seconds'] // 86400} days ago "
+                       "- refreshing in the background")
+    
+    # Job details
+    st.markdown("### 💼 Job Details")
+    st.write(f"**Company:** {job_data['company']}")
+    st.write(f"**Position:** {job_data['job_title']}")
+    st.write(f"**Location:** {job_data['location']}")
+    st.write(f"**Posted:** {job_data['posted']}")
+    if job_data['applicants'] != 'N/A':
+        st.write(f"**Applicants:** {job_data['applicants']}")
+    
+    # Red flags
+    if analysis['red_flags']:
+        st.markdown("### ⚠️ Detected Red Flags")
+        for i, flag in enumerate(analysis['red_flags'], 1):
+            st.warning(f"**{i}.** {flag}")
+    else:
+        st.success("✅ No red flags detected!")
+    
+    # Review sites
+    if company_research['review_sites']:
+        st.markdown("### 📋 Review Sites to Check")
+        for site in company_research['review_sites'][:3]:
+            st.markdown(f"- [{site['title']}]({site['url']})")
+    
+    # View original posting
+    if posting_url:
+        st.markdown("### 🔗 View Original Posting")
+        st.markdown(f"[Open on LinkedIn]({posting_url})")
+
+
 # Main content
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    st.markdown("### 🔍 Scan a LinkedIn Job")
-    
-    job_url = st.text_input(
-        "Paste LinkedIn Job URL:",
-        placeholder="https://www.linkedin.com/jobs/view/1234567890/ or https://www.linkedin.com/jobs/search/?currentJobId=...",
-        help="Copy and paste any LinkedIn job URL - we'll convert it automatically"
-    )
+    st.markdown("### 🔍 Scan a Job")
     
-    scan_button = st.button("🔍 Scan for Scams", type="primary", use_container_width=True)
+    input_mode = st.radio("Scan from:", ["LinkedIn URL", "Pasted job text"], horizontal=True)
     
-    if scan_button:
-        if not job_url:
-            st.error("⚠️ Please enter a LinkedIn job URL")
-        elif "linkedin.com/jobs" not in job_url:
-            st.error("⚠️ Please enter a valid LinkedIn job URL")
-        else:
-            # Auto-convert URL if needed
-            job_id = extract_job_id(job_url)
-            
-            if not job_id:
-                st.error("⚠️ Could not extract job ID from URL. Please check the URL format.")
-                st.info("""
-                **Supported URL formats:**
-                - Direct view URL: `https://www.linkedin.com/jobs/view/1234567890/`
-                - Search URL: `https://www.linkedin.com/jobs/search/?currentJobId=1234567890&...`
-                - Collections URL: `https://www.linkedin.com/jobs/collections/recommended/?currentJobId=1234567890`
-                """)
+    if input_mode == "LinkedIn URL":
+        job_url = st.text_input(
+            "Paste LinkedIn Job URL:",
+            placeholder="https://www.linkedin.com/jobs/view/1234567890/ or https://www.linkedin.com/jobs/search/?currentJobId=...",
+            help="Copy and paste any LinkedIn job URL - we'll convert it automatically"
+        )
+        
+        scan_button = st.button("🔍 Scan for Scams", type="primary", use_container_width=True)
+        
+        if scan_button:
+            if not job_url:
+                st.error("⚠️ Please enter a LinkedIn job URL")
+            elif "linkedin.com/jobs" not in job_url:
+                st.error("⚠️ Please enter a valid LinkedIn job URL")
             else:
-                # Convert to standard view URL
-                standardized_url = convert_to_view_url(job_url)
-                
-                # Show conversion if URL was modified
-                if standardized_url != job_url:
-                    st.markdown(f"""
-                    <div class="url-converted">
-                        ✅ <strong>URL Auto-Converted:</strong><br>
-                        <small>Job ID: {job_id}</small><br>
-                        <small>Using: {standardized_url}</small>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Progress indicators
-                progress_text = st.empty()
-                progress_bar = st.progress(0)
-                
-                progress_text.text("🔄 Scraping job posting...")
-                progress_bar.progress(25)
-                time.sleep(0.5)
-                
-                progress_text.text("🔍 Researching company...")
-                progress_bar.progress(50)
-                
-                # Run the scan with standardized URL
-                result = scan_linkedin_job(standardized_url, verbose=False)
+                # Auto-convert URL if needed
+                job_id, standardized_url = normalize_job_url(job_url)
                 
-                progress_text.text("⚙️ Analyzing red flags...")
-                progress_bar.progress(75)
-                time.sleep(0.5)
-                
-                progress_bar.progress(100)
-                progress_text.empty()
-                progress_bar.empty()
-                
-                if result:
-                    analysis = result['analysis']
-                    job_data = result['job_data']
-                    company_research = result['company_research']
-                    
-                    # Display results
-                    st.markdown("---")
-                    st.markdown("## 📊 Scan Results")
-                    
-                    # Risk verdict with color coding
-                    risk_score = analysis['risk_score']
-                    
-                    if risk_score >= 70:
-                        st.markdown(f"""
-                        <div class="risk-high">
-                            <h2 style="color: #d63031; margin: 0;">🔴 HIGH RISK - Likely Scam</h2>
-                            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    elif risk_score >= 40:
-                        st.markdown(f"""
-                        <div class="risk-medium">
-                            <h2 style="color: #f39c12; margin: 0;">🟡 MEDIUM RISK - Proceed with Caution</h2>
-                            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
+                if not job_id:
+                    st.error("⚠️ Could not extract job ID from URL. Please check the URL format.")
+                    st.info("""
+                    **Supported URL formats:**
+                    - Direct view URL: `https://www.linkedin.com/jobs/view/1234567890/`
+                    - Search URL: `https://www.linkedin.com/jobs/search/?currentJobId=1234567890&...`
+                    - Collections URL: `https://www.linkedin.com/jobs/collections/recommended/?currentJobId=1234567890`
+                    """)
+                else:
+                    # Show conversion if URL was modified
+                    if standardized_url != job_url:
                         st.markdown(f"""
-                        <div class="risk-low">
-                            <h2 style="color: #27ae60; margin: 0;">🟢 LOW RISK - Appears Legitimate</h2>
-                            <p style="margin: 0.5rem 0 0 0;"><strong>Recommendation:</strong> {analysis['recommendation']}</p>
+                        <div class="url-converted">
+                            ✅ <strong>URL Auto-Converted:</strong><br>
+                            <small>Job ID: {job_id}</small><br>
+                            <small>Using: {standardized_url}</small>
                         </div>
                         """, unsafe_allow_html=True)
                     
-                    # Metrics
-                    st.markdown("### 📈 Key Metrics")
-                    col_m1, col_m2, col_m3 = st.columns(3)
-                    
-                    with col_m1:
-                        st.metric("Risk Score", f"{risk_score}/100")
+                    # Progress indicators
+                    progress_text = st.empty()
+                    progress_bar = st.progress(0)
                     
-                    with col_m2:
-                        st.metric("Red Flags", analysis['total_flags'])
+                    progress_text.text("🔄 Scraping job posting...")
+                    progress_bar.progress(25)
+                    time.sleep(0.5)
                     
-                    with col_m3:
-                        st.metric("Company Trust Score", f"{company_research['trust_score']}/100")
+                    progress_text.text("🔍 Researching company...")
+                    progress_bar.progress(50)
                     
-                    # Job details
-                    st.markdown("### 💼 Job Details")
-                    st.write(f"**Company:** {job_data['company']}")
-                    st.write(f"**Position:** {job_data['job_title']}")
-                    st.write(f"**Location:** {job_data['location']}")
-                    st.write(f"**Posted:** {job_data['posted']}")
-                    if job_data['applicants'] != 'N/A':
-                        st.write(f"**Applicants:** {job_data['applicants']}")
+                    # Run the scan with standardized URL; someone is waiting on it,
+                    # so its browser and searches go ahead of batch work
+                    with scan_priority(INTERACTIVE):
+                        result = scan_linkedin_job(standardized_url, verbose=False, deadline=UI_SCAN_DEADLINE)
                     
-                    # Red flags
-                    if analysis['red_flags']:
-                        st.markdown("### ⚠️ Detected Red Flags")
-                        for i, flag in enumerate(analysis['red_flags'], 1):
-                            st.warning(f"**{i}.** {flag}")
-                    else:
-                        st.success("✅ No red flags detected!")
-                    
-                    # Review sites
-                    if company_research['review_sites']:
-                        st.markdown("### 📋 Review Sites to Check")
-                        for site in company_research['review_sites'][:3]:
-                            st.markdown(f"- [{site['title']}]({site['url']})")
+                    progress_text.text("⚙️ Analyzing red flags...")
+                    progress_bar.progress(75)
+                    time.sleep(0.5)
                     
-                    # View original posting
-                    st.markdown("### 🔗 View Original Posting")
-                    st.markdown(f"[Open on LinkedIn]({standardized_url})")
+                    progress_bar.progress(100)
+                    progress_text.empty()
+                    progress_bar.empty()
                     
-                else:
-                    st.error("❌ Failed to scan job. Please check the URL and try again.")
-                    st.info("💡 **Tip:** Make sure the job posting is public and the URL is correct.")
+                    if result:
+                        show_result(result, standardized_url)
+                        
+                    elif getattr(result, 'reason', None) == 'expired':
+                        st.warning("⌛ This posting has expired or is no longer accepting applications.")
+                    elif getattr(result, 'reason', None) == 'not_found':
+                        st.error("❌ Job posting not found. It may have been removed.")
+                    elif getattr(result, 'reason', None) == 'auth_wall':
+                        st.error("🔒 LinkedIn asked for a login instead of showing the posting. Please try again in a few minutes.")
+                    else:
+                        st.error("❌ Failed to scan job. Please check the URL and try again.")
+                        st.info("💡 **Tip:** Make sure the job posting is public and the URL is correct.")
+    else:
+        title = st.text_input("Job title:")
+        company = st.text_input("Company:")
+        description = st.text_area("Job description:", height=250,
+                                   placeholder="Paste the full posting text from the email, PDF or website")
+        research_online = st.checkbox(
+            "Research the company online if it hasn't been checked before",
+            help="Adds 15-30 seconds; otherwise only research cached from earlier scans is used"
+        )
+        
+        text_button = st.button("🔍 Scan Text for Scams", type="primary", use_container_width=True)
+        
+        if text_button:
+            if not company.strip() or not description.strip():
+                st.error("⚠️ Please enter at least the company name and the job description")
+            else:
+                with st.spinner("⚙️ Analyzing red flags..."), scan_priority(INTERACTIVE):
+                    result = scan_job_text(title, company, description, verbose=False, deadline=UI_SCAN_DEADLINE,
+                                           research='full' if research_online else 'cached')
+                
+                show_result(result)
+                
+                if result['company_research'].get('skip_reason') == 'not_cached':
+                    st.info(f"💡 {company.strip()} hasn't been researched yet - tick the box above "
+                            "to search for scam reports and reviews.")
 
 with col2:
     st.markdown("### 📚 How It Works")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Mock Servers - local stand-ins for LinkedIn pages, for offline testing
+
+Listing server: serves saved search listing pages from a directory.
+Files are named by their start offset: start_0.html, start_25.html, ...
+Any start without a file answers 400, like LinkedIn past the last page.
+
+Job server: serves saved job pages at /jobs/view/<id>/ from <id>.html,
+or synthetic pages for any ID when no directory is given, optionally with
+injected delay and errors (for load tests).
+
+DuckDuckGo server: answers /html/ and /lite/ searches with synthetic
+results in each endpoint's markup, with configurable delay, jitter and
+error rate per endpoint (for exercising hedged search offline).
+
+Usage:
+    python mock_servers.py listings saved_pages/ --port 8765
+    python mock_servers.py jobs saved_jobs/ --port 8766
+    python mock_servers.py jobs --delay 1 --error-rate 0.05   # synthetic pages
+    python mock_servers.py ddg --html-delay 3 --lite-delay 0.2 --port 8767
+    python crawler.py "https://www.linkedin.com/jobs/search/?keywords=x" \\
+        --base-url http://127.0.0.1:8765 --min-delay 0 --max-delay 0
+"""
+
+import argparse
+import html
+import os
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ============================================================================
+# SHARED PLUMBING
+# ============================================================================
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Request handler that doesn't log every hit to stderr"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type='text/html; charset=utf-8'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class Faults:
+    """Injected latency and errors for a mock endpoint"""
+
+    def __init__(self, delay=0.0, jitter=0.0, error_rate=0.0):
+        self.delay = delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    def apply(self):
+        """Sleep for the configured latency; True if this request should fail"""
+
+        time.sleep(max(0.0, self.delay + random.uniform(-self.jitter, self.jitter)))
+        return random.random() < self.error_rate
+
+def start_server(handler_class, port=0, host='127.0.0.1'):
+    """Run a server on a daemon thread; returns (server, base_url)"""
+
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server, f"http://{host}:{server.server_address[1]}"
+
+# ============================================================================
+# SAVED LISTING PAGES
+# ============================================================================
+
+def make_listing_handler(pages_dir):
+    """Handler class serving saved listing pages keyed by ?start="""
+
+    class ListingHandler(QuietHandler):
+        def do_GET(self):
+            query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            start = query.get('start', ['0'])[0]
+            page_path = os.path.join(pages_dir, f"start_{start}.html")
+
+            if not start.isdigit() or not os.path.exists(page_path):
+                self.send_body(400, '')
+                return
+
+            with open(page_path, encoding='utf-8') as f:
+                self.send_body(200, f.read())
+
+    return ListingHandler
+
+def start_listing_server(pages_dir, port=0):
+    """Serve saved listing pages; returns (server, base_url)"""
+    return start_server(make_listing_handler(pages_dir), port)
+
+# ============================================================================
+# SAVED JOB PAGES
+# ============================================================================
+
+JOB_PATH_PATTERN = re.compile(r'/jobs/view/(?:[^/?]*-)?(\d+)')
+
+FAKE_TITLES = [
+    'Data Entry Clerk', 'Remote Intern - $80/hr', 'Senior Software Engineer',
+    'Customer Support Associate', 'Junior Analyst (Remote) $70/hr', 'Warehouse Associate',
+]
+
+def fake_job_page(job_id):
+    """Deterministic synthetic job page using LinkedIn's public markup"""
+
+    rng = random.Random(job_id)
+    title = rng.choice(FAKE_TITLES)
+    company = f"Company {rng.randint(1, 200)}"
+    description = ' '.join(
+        rng.choice(['We are hiring.', 'Work from home.', 'Flexible hours.', 'Great benefits.',
+                    'Apply today.', 'No experience needed.', 'Competitive salary.'])
+        for _ in range(rng.randint(5, 120))
+    )
+
+    return f"""<html><body>
+<h1 class="top-card-layout__title">{html.escape(title)}</h1>
+<a class="topcard__org-name-link">{html.escape(company)}</a>
+<span class="topcard__flavor topcard__flavor--bullet">Remote</span>
+<span class="posted-time-ago__text">{rng.randint(1, 23)} hours ago</span>
+<span class="num-applicants__caption">Over {rng.choice([25, 100, 200])} applicants</span>
+<div class="show-more-less-html__markup">{html.escape(description)}</div>
+</body></html>"""
+
+def make_job_handler(pages_dir=None, faults=None):
+    """
+    Handler class serving saved job pages from <job_id>.html
+
+    Without pages_dir every job ID gets a synthetic page (fake_job_page).
+    """
+
+    faults = faults or Faults()
+
+    class JobHandler(QuietHandler):
+        def do_GET(self):
+            match = JOB_PATH_PATTERN.search(self.path)
+            if not match:
+                self.send_body(404, '<html><body>Page not found</body></html>')
+                return
+
+            if faults.apply():
+                self.send_body(503, 'Service Unavailable')
+                return
+
+            if pages_dir is None:
+                self.send_body(200, fake_job_page(match.group(1)))
+                return
+
+            page_path = os.path.join(pages_dir, f"{match.group(1)}.html")
+            if not os.path.exists(page_path):
+                self.send_body(404, '<html><body>Page not found</body></html>')
+                return
+
+            with open(page_path, encoding='utf-8') as f:
+                self.send_body(200, f.read())
+
+    return JobHandler
+
+def start_job_server(pages_dir=None, port=0, faults=None):
+    """Serve saved (or synthetic) job pages; returns (server, base_url)"""
+    return start_server(make_job_handler(pages_dir, faults), port)
+
+# ============================================================================
+# DUCKDUCKGO STAND-IN
+# ============================================================================
+
+REVIEW_HOSTS = ['www.glassdoor.com', 'www.trustpilot.com', 'www.reddit.com', 'www.indeed.com']
+
+def fake_search_results(query, count=10):
+    """Deterministic synthetic (title, url, snippet) results for a query"""
+
+    rng = random.Random(query)
+    subject = query.split('"')[1] if query.count('"') >= 2 else query
+    results = []
+
+    for index in range(count):
+        host = rng.choice(REVIEW_HOSTS + ['www.example.com', 'news.example.org'])
+        results.append((
+            f"{subject} - {rng.choice(['Reviews', 'Company profile', 'Jobs', 'Is it legit?'])} ({index + 1})",
+            f"https://{host}/{urllib.parse.quote(subject)}/{index}",
+            f"What people say about {subject}. " + rng.choice(['', 'Some call it a scam.', 'Great place to work.']),
+        ))
+
+    return results
+
+def render_html_results(results):
+    rows = ''.join(
+        f'<div class="result"><a class="result__a" href="//duckduckgo.com/l/?uddg={urllib.parse.quote(url)}">'
+        f'{html.escape(title)}</a><a class="result__snippet">{html.escape(snippet)}</a></div>'
+        for title, url, snippet in results
+    )
+    return f'<html><body>{rows}</body></html>'
+
+def render_lite_results(results):
+    rows = ''.join(
+        f'<tr><td><a class="result-link" href="{html.escape(url)}">{html.escape(title)}</a></td></tr>'
+        f'<tr><td class="result-snippet">{html.escape(snippet)}</td></tr>'
+        for title, url, snippet in results
+    )
+    return f'<html><body><table>{rows}</table></body></html>'
+
+def make_ddg_handler(html_faults=None, lite_faults=None):
+    """Handler class answering /html/ and /lite/ with per-endpoint faults"""
+
+    endpoints = {
+        '/html/': (html_faults or Faults(), render_html_results),
+        '/lite/': (lite_faults or Faults(), render_lite_results),
+    }
+
+    class DuckDuckGoHandler(QuietHandler):
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            endpoint = endpoints.get(parsed.path)
+            if not endpoint:
+                self.send_body(404, '')
+                return
+
+            faults, render = endpoint
+            if faults.apply():
+                self.send_body(503, 'Service Unavailable')
+                return
+
+            query = urllib.parse.parse_qs(parsed.query).get('q', [''])[0]
+            try:
+                self.send_body(200, render(fake_search_results(query)))
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client gave up (e.g. a cancelled hedge)
+
+    return DuckDuckGoHandler
+
+def start_ddg_server(html_faults=None, lite_faults=None, port=0):
+    """DuckDuckGo stand-in; returns (server, base_url)"""
+    return start_server(make_ddg_handler(html_faults, lite_faults), port)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local mock server')
+    subparsers = parser.add_subparsers(dest='kind', required=True)
+
+    listings = subparsers.add_parser('listings', help='serve saved search listing pages')
+    listings.add_argument('pages_dir')
+    listings.add_argument('--port', type=int, default=8765)
+
+    jobs = subparsers.add_parser('jobs', help='serve saved job pages')
+    jobs.add_argument('pages_dir', nargs='?', help='directory of <job_id>.html (synthetic pages if omitted)')
+    jobs.add_argument('--port', type=int, default=8766)
+    jobs.add_argument('--delay', type=float, default=0.0, help='seconds per request')
+    jobs.add_argument('--jitter', type=float, default=0.0, help='+/- seconds')
+    jobs.add_argument('--error-rate', type=float, default=0.0, help='fraction answering 503')
+
+    ddg = subparsers.add_parser('ddg', help='DuckDuckGo html/lite stand-in')
+    ddg.add_argument('--port', type=int, default=8767)
+    for endpoint in ('html', 'lite'):
+        ddg.add_argument(f'--{endpoint}-delay', type=float, default=0.0, help='seconds per request')
+        ddg.add_argument(f'--{endpoint}-jitter', type=float, default=0.0, help='+/- seconds')
+        ddg.add_argument(f'--{endpoint}-error-rate', type=float, default=0.0, help='fraction answering 503')
+
+    args = parser.parse_args()
+
+    if args.kind == 'listings':
+        server, base_url = start_listing_server(args.pages_dir, args.port)
+    elif args.kind == 'jobs':
+        server, base_url = start_job_server(
+            args.pages_dir, args.port, Faults(args.delay, args.jitter, args.error_rate)
+        )
+    elif args.kind == 'ddg':
+        server, base_url = start_ddg_server(
+            Faults(args.html_delay, args.html_jitter, args.html_error_rate),
+            Faults(args.lite_delay, args.lite_jitter, args.lite_error_rate),
+            args.port,
+        )
+
+    print(f"[*] Mock {args.kind} server on {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Page Archive - compressed, content-addressed store of fetched raw HTML
+
+Every job page and search result page the scanner fetches can be kept so
+rule and selector changes can be backtested offline (see reanalyze.py).
+Pages are stored once per distinct content (SHA-256, zlib-compressed);
+each fetch records which content a (kind, key) pair had and when:
+
+    kind 'job'      key = job ID,       source = None
+    kind 'search'   key = query string, source = search backend name
+
+Archiving is off unless PAGE_ARCHIVE_PATH is set.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# Where raw pages are archived (unset or empty = don't archive)
+DEFAULT_ARCHIVE_PATH = os.environ.get('PAGE_ARCHIVE_PATH', '')
+
+COMPRESSION_LEVEL = 6
+
+class PageArchive:
+    """Thread-safe SQLite archive of raw pages"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                url TEXT,
+                source TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (kind, key, content_hash)
+            );
+            CREATE INDEX IF NOT EXISTS pages_latest ON pages (kind, key, fetched_at);
+        """)
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchall()
+            self._conn.commit()
+            return rows
+
+    def put(self, kind, key, url, html, source=None):
+        """Archive a fetched page; returns its content hash"""
+
+        raw = html.encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            exists = self._conn.execute(
+                'SELECT 1 FROM blobs WHERE content_hash = ?', (content_hash,)
+            ).fetchone()
+            if not exists:
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO blobs (content_hash, size, data) VALUES (?, ?, ?)',
+                    (content_hash, len(raw), zlib.compress(raw, COMPRESSION_LEVEL)),
+                )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (kind, key, content_hash, url, source, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (kind, key, content_hash, url, source, time.time()),
+            )
+            self._conn.commit()
+
+        return content_hash
+
+    def get_blob(self, content_hash):
+        """Decompressed HTML for a content hash, or None"""
+
+        rows = self._execute('SELECT data FROM blobs WHERE content_hash = ?', (content_hash,))
+        return zlib.decompress(rows[0][0]).decode('utf-8') if rows else None
+
+    def latest(self, kind, key):
+        """Most recent fetch of (kind, key) with its HTML, or None"""
+
+        rows = self._execute(
+            'SELECT p.content_hash, p.url, p.source, p.fetched_at, b.data '
+            'FROM pages p JOIN blobs b ON b.content_hash = p.content_hash '
+            'WHERE p.kind = ? AND p.key = ? ORDER BY p.fetched_at DESC LIMIT 1',
+            (kind, key),
+        )
+        if not rows:
+            return None
+
+        content_hash, url, source, fetched_at, data = rows[0]
+        return {
+            'content_hash': content_hash,
+            'url': url,
+            'source': source,
+            'fetched_at': fetched_at,
+            'html': zlib.decompress(data).decode('utf-8'),
+        }
+
+    def iter_latest(self, kind):
+        """(key, url, content_hash) of the most recent fetch per key"""
+
+        rows = self._execute(
+            'SELECT key, url, content_hash, MAX(fetched_at) FROM pages WHERE kind = ? GROUP BY key',
+            (kind,),
+        )
+        for key, url, content_hash, _ in rows:
+            yield key, url, content_hash
+
+    def stats(self):
+        (pages,), = self._execute('SELECT COUNT(*) FROM pages')
+        blobs, raw_bytes, stored_bytes = self._execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs'
+        )[0]
+        return {
+            'fetches': pages,
+            'distinct_pages': blobs,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+def get_default_archive():
+    """Process-wide archive at PAGE_ARCHIVE_PATH (None when disabled)"""
+
+    global _default_archive
+
+    if not DEFAULT_ARCHIVE_PATH:
+        return None
+
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = PageArchive(DEFAULT_ARCHIVE_PATH)
+        return _default_archive
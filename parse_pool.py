@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Parse Pool - run CPU-bound HTML parsing in worker processes
+
+BeautifulSoup parsing is pure Python and holds the GIL, so scrape and
+search threads that all parse in-process share one core between them.
+With a pool active, fetching threads hand raw HTML to worker processes
+and get back only the parsed fields (a job dict or a result list).
+
+Callers use offload(func, *args): func runs in the active pool when there
+is one and inline otherwise. func must be a module-level function (it is
+sent to the worker by name).
+
+    with ParsePool(workers=4) as pool:
+        set_parse_pool(pool)
+        ...   # scrape_linkedin_job / hedged_search now parse in the pool
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes for batch runs (0 = parse inline in the fetching thread)
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', os.cpu_count() or 1))
+
+class ParsePool:
+    """Process pool for parse functions"""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        # spawn, not fork: the callers are threaded and forking a process
+        # whose other threads hold locks can deadlock the child
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def run(self, func, *args):
+        """func(*args) in a worker process; blocks the calling thread"""
+        return self._executor.submit(func, *args).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if _active_pool is self:
+            set_parse_pool(None)
+        self.close()
+
+
+_active_pool = None
+
+def set_parse_pool(pool):
+    """Make pool the one offload() uses (None = parse inline)"""
+
+    global _active_pool
+    _active_pool = pool
+
+def get_parse_pool():
+    return _active_pool
+
+def offload(func, *args):
+    """func(*args) in the active parse pool, or inline without one"""
+
+    pool = _active_pool
+    if pool is None:
+        return func(*args)
+    return pool.run(func, *args)
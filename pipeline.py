@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Staged Batch Pipeline - scrape, research and analyze concurrently
+
+    URLs ──▶ [scrape x N] ──queue──▶ [research x M] ──queue──▶ [analyze x 1] ──▶ results
+
+Each stage has its own worker count and a bounded input queue, so a slow
+stage applies backpressure upstream instead of buffering without limit.
+The research queue is sized so browsers keep scraping while searches run.
+HTML parsing (job pages and search results) runs in a process pool shared
+by all stages, so it isn't limited to the one core the threads share.
+The worker counts are starting points: adaptive limits (adaptive_limits.py)
+raise or lower concurrent scrapes and searches from observed latency and
+failures, up to --max-scrapes / --max-searches. Every scrape and search
+runs in the batch priority class (scan_scheduler.py), so interactive scans
+in the same process go first.
+
+Usage:
+    python pipeline.py urls.txt --scrape-workers 2 --research-workers 8 --output results.jsonl
+    python pipeline.py urls.txt --full-research    # research even clear HIGH RISK postings
+    python pipeline.py dump.txt --skip-seen        # drop job IDs seen in earlier runs
+    python pipeline.py urls.txt --parse-workers 0  # parse in the stage threads
+    python pipeline.py urls.txt --fixed-concurrency   # exactly the given worker counts
+"""
+
+import argparse
+import json
+import queue
+import threading
+from concurrent.futures import Future
+
+from detector_scam import (
+    scrape_job,
+    check_unchanged,
+    get_company_research,
+    tiered_research,
+    analyze_job,
+    build_result,
+    score_postings,
+    ScrapeFailure,
+    RESEARCH_SEARCHES,
+)
+from adaptive_limits import (
+    SCRAPE_LIMIT_MAX, SEARCH_LIMIT_MAX, format_limits, limits_metrics, make_limits,
+    report_periodically, set_limits,
+)
+from job_urls import read_job_urls
+from scan_scheduler import BATCH, format_waits, scan_priority, scheduler_metrics
+from parse_pool import PARSE_WORKERS, ParsePool, set_parse_pool
+from scan_store import get_default_store, normalize_company
+
+# Default per-stage concurrency
+SCRAPE_WORKERS = 2
+RESEARCH_WORKERS = 8
+ANALYZE_WORKERS = 1
+
+# Most postings the analyzer scores with the text model in one call
+ANALYZE_BATCH_SIZE = 256
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# ============================================================================
+# COMPANY RESEARCH DE-DUPLICATION
+# ============================================================================
+
+class ResearchCoordinator:
+    """Ensures only one research worker searches a given company at a time"""
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def research(self, company_name):
+        key = normalize_company(company_name)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(get_company_research(company_name, self.store, verbose=False))
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        return future.result()
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+def _run_stage(workers, in_queue, handle, on_finished, batch_size=None):
+    """
+    Start a worker pool draining in_queue; calls on_finished once all exit
+
+    With batch_size, handle() receives a list: whatever is already queued
+    (up to batch_size items) is taken together with the item waited for.
+    """
+
+    remaining = [workers]
+    remaining_lock = threading.Lock()
+
+    def worker():
+        finished = False
+        while not finished:
+            item = in_queue.get()
+            if item is _DONE:
+                break
+
+            if not batch_size:
+                handle(item)
+                continue
+
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    item = in_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                batch.append(item)
+            handle(batch)
+
+        with remaining_lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            on_finished()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+def run_pipeline(job_urls, scrape_workers=SCRAPE_WORKERS, research_workers=RESEARCH_WORKERS,
+                 analyze_workers=ANALYZE_WORKERS, queue_size=None, store=None, full_research=False,
+                 parse_workers=PARSE_WORKERS, adaptive=True, max_scrapes=SCRAPE_LIMIT_MAX,
+                 max_searches=SEARCH_LIMIT_MAX, priority=BATCH):
+    """
+    Scan many job URLs through concurrent stages
+
+    Yields (job_url, result) as scans finish (completion order, not input
+    order). result is falsy when the posting couldn't be scanned: a
+    ScrapeFailure with the reason if scraping failed, otherwise None.
+    Company research is skipped for postings that are HIGH RISK on their
+    own unless full_research is set (see tiered_research).
+
+    parse_workers: processes that parse fetched HTML (0 = parse inline in
+    the scrape and research threads)
+
+    adaptive: scrape_workers and research_workers are only the starting
+    concurrency; AIMD limits move it between 1 and max_scrapes /
+    max_searches (see adaptive_limits.py); otherwise they stay fixed
+
+    priority: scan_scheduler class for the run's scrapes and searches
+    """
+
+    if store is None:
+        store = get_default_store()
+
+    # Start a thread per slot the limit may grow to; the limits decide how
+    # many of them scrape or search at once
+    limits = make_limits(scrape_workers, research_workers, max_scrapes, max_searches, fixed=not adaptive)
+    set_limits(limits)
+    scrape_workers = limits['scrape'].maximum
+    research_workers = limits['search'].maximum
+
+    # Bounded queues: the research queue holds enough work for every
+    # research worker plus a full batch from each browser.
+    scrape_queue = queue.Queue(maxsize=queue_size or scrape_workers * 2)
+    research_queue = queue.Queue(maxsize=queue_size or research_workers * 2 + scrape_workers)
+    analyze_queue = queue.Queue(maxsize=queue_size or research_workers * 2)
+    results = queue.Queue()
+
+    coordinator = ResearchCoordinator(store)
+
+    # Active for every stage while the run lasts
+    parse_pool = ParsePool(parse_workers) if parse_workers else None
+    if parse_pool:
+        set_parse_pool(parse_pool)
+
+    def scrape(job_url):
+        try:
+            with scan_priority(priority):
+                job_data = scrape_job(job_url, store, verbose=False)
+
+            if not job_data:
+                # ScrapeFailure: the reason goes back with the result
+                results.put((job_url, job_data))
+                return
+
+            job_id, content_hash, previous = check_unchanged(job_url, job_data, store, verbose=False)
+            if previous:
+                results.put((job_url, previous))
+                return
+
+            research_queue.put((job_url, job_id, content_hash, job_data))
+        except Exception:
+            results.put((job_url, None))
+
+    def research(item):
+        job_url, job_id, content_hash, job_data = item
+        try:
+            with scan_priority(priority):
+                company_research = tiered_research(
+                    job_data, store, verbose=False, full_research=full_research,
+                    research=coordinator.research,
+                )
+            analyze_queue.put((job_url, job_id, content_hash, job_data, company_research))
+        except Exception:
+            results.put((job_url, None))
+
+    def analyze(batch):
+        # One vectorized text-model call for everything waiting to be analyzed
+        try:
+            probabilities = score_postings([item[3] for item in batch]) if score_postings else None
+        except Exception:
+            probabilities = None
+
+        for index, (job_url, job_id, content_hash, job_data, company_research) in enumerate(batch):
+            try:
+                analysis = analyze_job(
+                    job_data, company_research, verbose=False,
+                    model_probability=probabilities[index] if probabilities else None,
+                )
+                results.put((job_url, build_result(
+                    job_id, content_hash, job_data, company_research, analysis, store
+                )))
+            except Exception:
+                results.put((job_url, None))
+
+    def close(next_queue, workers):
+        def finished():
+            for _ in range(workers):
+                next_queue.put(_DONE)
+        return finished
+
+    _run_stage(analyze_workers, analyze_queue, analyze, lambda: results.put(_DONE),
+               batch_size=ANALYZE_BATCH_SIZE)
+    _run_stage(research_workers, research_queue, research, close(analyze_queue, analyze_workers))
+    _run_stage(scrape_workers, scrape_queue, scrape, close(research_queue, research_workers))
+
+    # Feed input on its own thread so results stream while URLs are queued
+    def feed():
+        try:
+            for job_url in job_urls:
+                scrape_queue.put(job_url)
+        finally:
+            for _ in range(scrape_workers):
+                scrape_queue.put(_DONE)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        if parse_pool:
+            set_parse_pool(None)
+            parse_pool.close()
+        set_limits(None)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan a batch of LinkedIn jobs through a staged pipeline')
+    parser.add_argument('input', help='LinkedIn job URLs: text (one per line), CSV or JSON lines export')
+    parser.add_argument('--field', help='CSV column or JSON key holding the URL (default: whole lines)')
+    parser.add_argument('--output', help='write results as JSON lines to this file')
+    parser.add_argument('--scrape-workers', type=int, default=SCRAPE_WORKERS)
+    parser.add_argument('--research-workers', type=int, default=RESEARCH_WORKERS)
+    parser.add_argument('--analyze-workers', type=int, default=ANALYZE_WORKERS)
+    parser.add_argument('--queue-size', type=int, help='override every stage queue bound')
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS,
+                        help='processes for HTML parsing (0 = parse in the stage threads)')
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help='keep the worker counts fixed instead of adapting them')
+    parser.add_argument('--max-scrapes', type=int, default=SCRAPE_LIMIT_MAX, help='adaptive scrape limit ceiling')
+    parser.add_argument('--max-searches', type=int, default=SEARCH_LIMIT_MAX, help='adaptive search limit ceiling')
+    parser.add_argument('--limits-interval', type=float, default=30,
+                        help='seconds between adaptive limit reports (0 = only at the end)')
+    parser.add_argument('--full-research', action='store_true',
+                        help='research every company, even for postings already HIGH RISK on their own')
+    parser.add_argument('--skip-seen', action='store_true',
+                        help='skip job IDs handed out by an earlier run (Bloom filter + seen-ID table)')
+    parser.add_argument('--seen-filter', help='Bloom filter path (defaults to SEEN_FILTER_PATH)')
+    args = parser.parse_args()
+
+    # Canonical view URLs, each job ID once
+    job_urls = read_job_urls(args.input, field=args.field)
+    if args.skip_seen:
+        from seen_filter import ConfirmedSeen, SeenJobs, DEFAULT_FILTER_PATH
+        seen = SeenJobs(ConfirmedSeen(args.seen_filter or DEFAULT_FILTER_PATH))
+        job_urls = seen.filter_urls(job_urls)
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    analyzed = skipped = 0
+    final_limits = {}
+
+    stop_reports = threading.Event()
+    if args.limits_interval > 0:
+        report_periodically(args.limits_interval, stop_reports)
+
+    try:
+        for job_url, result in run_pipeline(
+            job_urls,
+            scrape_workers=args.scrape_workers,
+            research_workers=args.research_workers,
+            analyze_workers=args.analyze_workers,
+            queue_size=args.queue_size,
+            full_research=args.full_research,
+            parse_workers=args.parse_workers,
+            adaptive=not args.fixed_concurrency,
+            max_scrapes=args.max_scrapes,
+            max_searches=args.max_searches,
+        ):
+            # Limits are cleared when the run ends; keep the last snapshot
+            final_limits = limits_metrics() or final_limits
+
+            if result and not result['unchanged']:
+                analyzed += 1
+                # Index answers never needed searching; only count tiered skips
+                research = result['company_research']
+                if research.get('skipped_checks') and not research.get('reputation'):
+                    skipped += 1
+
+            failure = result.to_dict() if isinstance(result, ScrapeFailure) else None
+            if result:
+                print(f"{result['analysis']['risk_score']:>3}/100  {job_url}")
+            else:
+                print(f"  ❌     {job_url}" + (f"  ({failure['reason']})" if failure else ''))
+
+            if output:
+                record = {'url': job_url, 'result': result or None}
+                if failure:
+                    record['failure'] = failure
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        stop_reports.set()
+        if output:
+            output.close()
+
+    if final_limits:
+        print(f"\nFinal limits: {format_limits(final_limits)}")
+        print(f"Queue wait: {format_waits(scheduler_metrics())}")
+
+    if analyzed:
+        print(f"\nResearch skipped for {skipped}/{analyzed} analyzed postings "
+              f"({skipped * RESEARCH_SEARCHES} searches saved)")
+
+
+if __name__ == "__main__":
+    main()
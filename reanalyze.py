@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Offline Re-analysis - replay archived pages through today's parser and rules
+
+For every job in the page archive (latest fetch per job ID), re-parses the
+raw HTML with parse_job_html, re-runs company research against archived
+search result pages, re-runs analyze_job, and compares the verdict with
+the one stored in the scan store. No network access: a company whose
+searches weren't archived keeps the research stored with its old result.
+
+Work is spread over a process pool; each worker opens the archive and the
+store itself, so only job IDs and small diff records cross processes.
+
+Usage:
+    PAGE_ARCHIVE_PATH=pages.db python detector_scam.py ...    # archive while scanning
+    python reanalyze.py --archive pages.db --output diff.jsonl
+    python reanalyze.py --archive pages.db --workers 8 --changed-only --update-store
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from page_archive import DEFAULT_ARCHIVE_PATH, PageArchive
+from scan_store import DEFAULT_STORE_PATH, ScanStore
+
+# Job IDs handed to a worker at a time
+CHUNK_SIZE = 200
+
+# Per-process state set up by _init_worker
+_archive = None
+_store = None
+_with_result = False
+
+# ============================================================================
+# WORKER SIDE
+# ============================================================================
+
+def _init_worker(archive_path, store_path, with_result):
+    global _archive, _store, _with_result
+    _archive = PageArchive(archive_path)
+    _store = ScanStore(store_path) if store_path else None
+    _with_result = with_result
+
+def _archived_search(missing):
+    """search_duckduckgo stand-in that answers from archived result pages"""
+
+    from search_providers import PARSERS
+
+    def search(query, num_results=10, verbose=True, timeout=15, deadline=None):
+        page = _archive.latest('search', query)
+        if page is None or page['source'] not in PARSERS:
+            missing.append(query)
+            return []
+        return PARSERS[page['source']](page['html'], num_results)
+
+    return search
+
+def _band(verdict):
+    """HIGH / MEDIUM / LOW from a verdict string"""
+    return verdict.split()[1] if verdict else None
+
+def _summary(analysis):
+    return {
+        'risk_score': analysis['risk_score'],
+        'verdict': analysis['verdict'],
+        'red_flags': analysis['red_flags'],
+    }
+
+def reanalyze_job(job_id, url):
+    """Diff record for one archived job (None if its page can't be parsed)"""
+
+    from detector_scam import (
+        analyze_job, build_result, parse_job_html, research_company, skipped_research,
+    )
+    from scan_store import hash_job_data
+
+    page = _archive.latest('job', job_id)
+    if not page:
+        return None
+
+    job_data = parse_job_html(page['html'], url or page['url'])
+    if job_data['company'] == 'N/A':
+        return {'job_id': job_id, 'url': url, 'error': 'no company on archived page'}
+
+    previous = _store.get_scan(job_id) if _store else None
+    old_result = previous['result'] if previous else None
+
+    missing = []
+    company_research = research_company(job_data['company'], verbose=False, search=_archived_search(missing))
+    if missing:
+        # Searches weren't archived: keep the research the old verdict used
+        company_research = (old_result or {}).get('company_research') or skipped_research(job_data['company'], 'not_archived')
+
+    analysis = analyze_job(job_data, company_research, verbose=False)
+    new = _summary(analysis)
+    old = _summary(old_result['analysis']) if old_result else None
+
+    record = {
+        'job_id': job_id,
+        'url': url,
+        'old': old,
+        'new': new,
+        'research_replayed': not missing,
+        'score_changed': bool(old) and old['risk_score'] != new['risk_score'],
+        'band_changed': bool(old) and _band(old['verdict']) != _band(new['verdict']),
+        'added_flags': [flag for flag in new['red_flags'] if not old or flag not in old['red_flags']],
+        'removed_flags': [flag for flag in old['red_flags'] if flag not in new['red_flags']] if old else [],
+    }
+
+    # Full result for --update-store only (dropped before the record is written)
+    if _with_result:
+        record['_result'] = build_result(job_id, hash_job_data(job_data), job_data, company_research, analysis, None)
+    return record
+
+def reanalyze_chunk(jobs):
+    records = []
+    for job_id, url in jobs:
+        try:
+            record = reanalyze_job(job_id, url)
+        except Exception as e:
+            record = {'job_id': job_id, 'url': url, 'error': str(e)}
+        if record:
+            records.append(record)
+    return records
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def run_reanalysis(archive_path, store_path=DEFAULT_STORE_PATH, workers=None, with_results=False):
+    """
+    Yield diff records for every archived job, as chunks finish
+
+    with_results: also attach the full new result as record['_result']
+    """
+
+    archive = PageArchive(archive_path)
+    jobs = [(job_id, url) for job_id, url, _ in archive.iter_latest('job')]
+    archive.close()
+
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(archive_path, store_path, with_results)) as executor:
+        chunks = _chunks(jobs, CHUNK_SIZE)
+        pending = set()
+
+        # Keep a few chunks per worker in flight rather than submitting all
+        while True:
+            while len(pending) < workers * 3:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(reanalyze_chunk, chunk))
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-run parsing and analysis on archived pages')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH or 'pages.db')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='scan store with the old verdicts')
+    parser.add_argument('--workers', type=int, help='processes (default: CPU count)')
+    parser.add_argument('--output', default='reanalysis.jsonl', help='diff records as JSON lines')
+    parser.add_argument('--changed-only', action='store_true', help='only write jobs whose score changed')
+    parser.add_argument('--update-store', action='store_true', help='save the new results to the store')
+    args = parser.parse_args()
+
+    store = ScanStore(args.store) if args.update_store and args.store else None
+
+    totals = {'jobs': 0, 'errors': 0, 'no_old_verdict': 0, 'score_changed': 0, 'band_changed': 0,
+              'research_replayed': 0}
+    transitions = {}
+    start = time.perf_counter()
+
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for record in run_reanalysis(args.archive, args.store, args.workers, with_results=store is not None):
+            totals['jobs'] += 1
+            result = record.pop('_result', None)
+
+            if 'error' in record:
+                totals['errors'] += 1
+            else:
+                totals['score_changed'] += record['score_changed']
+                totals['band_changed'] += record['band_changed']
+                totals['research_replayed'] += record['research_replayed']
+                if record['old'] is None:
+                    totals['no_old_verdict'] += 1
+                elif record['band_changed']:
+                    transition = f"{_band(record['old']['verdict'])} -> {_band(record['new']['verdict'])}"
+                    transitions[transition] = transitions.get(transition, 0) + 1
+
+                if store and result:
+                    store.save_scan(record['job_id'], result['content_hash'], result)
+
+            if not args.changed_only or record.get('score_changed') or record.get('old') is None:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+            if totals['jobs'] % 10000 == 0:
+                print(f"   {totals['jobs']:,} jobs...")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Re-analyzed {totals['jobs']:,} archived jobs in {elapsed:.1f}s "
+          f"({totals['jobs'] / max(elapsed, 0.001):,.0f}/s)")
+    print(f"   score changed: {totals['score_changed']:,}   verdict band changed: {totals['band_changed']:,}")
+    print(f"   no stored verdict: {totals['no_old_verdict']:,}   errors: {totals['errors']:,}   "
+          f"research replayed from archive: {totals['research_replayed']:,}")
+    for transition, count in sorted(transitions.items(), key=lambda item: -item[1]):
+        print(f"   {transition:<18} {count:,}")
+    print(f"   diff written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
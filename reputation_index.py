@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Reputation Index - offline lookup of known-legitimate and known-scam employers
+
+CSV sources (name,domain,status[,note]; status is legit or scam) are
+compiled into one memory-mapped file:
+
+    header     magic, version, record count, string table offset
+    keys       sorted uint64 hashes of every lookup key
+    records    uint32 per key: status in the top byte, entry index below
+    entries    uint32 string table offset per company
+    strings    "name\\tstatus\\tnote\\n" per company
+
+Each company is keyed by its exact name (case and whitespace folded) and
+its domain. Scam listings also get their normalized name (punctuation and
+legal suffixes like "Inc." removed), so "Acme Staffing LLC" still catches
+"ACME Staffing"; legit listings don't, or "Google Holdings Group" would be
+whitelisted as Google. A lookup is a binary search over the mapped key array, so
+opening the index costs nothing and pages are only read when touched.
+
+Usage:
+    python reputation_index.py build data/reputation/*.csv --output data/reputation.idx
+    python reputation_index.py lookup "Microsoft"
+"""
+
+import argparse
+import bisect
+import csv
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import urllib.parse
+
+# The bundled index (rebuild with: python reputation_index.py build ...)
+DEFAULT_INDEX_PATH = os.environ.get(
+    'REPUTATION_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'reputation.idx'),
+)
+
+MAGIC = b'REPIDX\x00\x01'
+HEADER = struct.Struct('<8sII')   # magic, key count, string table offset
+
+STATUSES = ('legit', 'scam')
+
+# Trailing words that don't distinguish one company from another
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'sas', 'bv', 'nv', 'pty', 'pvt', 'private',
+    'group', 'holdings',
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def exact_key(name):
+    """Company name with case and whitespace folded"""
+    return ' '.join(name.casefold().split())
+
+def normalized_key(name):
+    """Company name without punctuation, a leading "the" or legal suffixes"""
+
+    words = _PUNCTUATION.sub(' ', name.casefold().replace('&', ' and ')).split()
+    if words and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def domain_key(domain_or_url):
+    """Bare hostname of a domain or URL, without www."""
+
+    value = domain_or_url.strip().lower()
+    if '//' not in value:
+        value = '//' + value
+    host = (urllib.parse.urlsplit(value).hostname or '').rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+def _hash(kind, key):
+    digest = hashlib.blake2b(f"{kind}:{key}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def read_sources(paths):
+    """(name, domain, status, note) rows from CSV files with a header line"""
+
+    for path in paths:
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = csv.DictReader(line for line in f if not line.startswith('#'))
+            for row in rows:
+                name = (row.get('name') or '').strip()
+                status = (row.get('status') or '').strip().lower()
+                if not name or status not in STATUSES:
+                    continue
+                yield name, (row.get('domain') or '').strip(), status, (row.get('note') or '').strip()
+
+def build_index(source_paths, output_path):
+    """
+    Compile CSV sources into an index file
+
+    When two rows claim the same key with different statuses, scam wins.
+    Returns counts of companies, keys and conflicting keys.
+    """
+
+    entries = []
+    keys = {}
+    conflicts = 0
+
+    for name, domain, status, note in read_sources(source_paths):
+        entry = len(entries)
+        entries.append(f"{name}\t{status}\t{note}".replace('\n', ' ') + '\n')
+        status_code = STATUSES.index(status)
+
+        # Normalized names only ever point at scams: near-misses of a legit
+        # name are exactly what impersonators use
+        candidate_keys = {_hash('name', exact_key(name))}
+        if status == 'scam':
+            candidate_keys.add(_hash('norm', normalized_key(name)))
+        if domain:
+            candidate_keys.add(_hash('domain', domain_key(domain)))
+
+        for key in candidate_keys:
+            existing = keys.get(key)
+            if existing is not None and existing[0] != status_code:
+                conflicts += 1
+                if existing[0] > status_code:
+                    continue
+            keys[key] = (status_code, entry)
+
+    ordered = sorted(keys.items())
+
+    strings = bytearray()
+    offsets = []
+    for text in entries:
+        offsets.append(len(strings))
+        strings += text.encode('utf-8')
+
+    count = len(ordered)
+    strings_at = HEADER.size + count * 8 + count * 4 + len(entries) * 4
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, count, strings_at))
+        f.write(struct.pack(f'<{count}Q', *(key for key, _ in ordered)))
+        f.write(struct.pack(f'<{count}I', *((status << 24) | entry for _, (status, entry) in ordered)))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(strings)
+    os.replace(tmp_path, output_path)
+
+    return {'companies': len(entries), 'keys': count, 'conflicts': conflicts}
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class ReputationIndex:
+    """Read-only memory-mapped reputation index"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, self._strings_at = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a reputation index")
+
+        keys_at = HEADER.size
+        records_at = keys_at + self.count * 8
+        entries_at = records_at + self.count * 4
+
+        # Casts are views into the mapping: nothing is copied or parsed
+        view = memoryview(self._map)
+        self._keys = view[keys_at:records_at].cast('Q')
+        self._records = view[records_at:entries_at].cast('I')
+        self._entries = view[entries_at:self._strings_at].cast('I')
+
+    def _find(self, key):
+        position = bisect.bisect_left(self._keys, key)
+        if position < self.count and self._keys[position] == key:
+            return self._records[position]
+        return None
+
+    def _entry(self, entry):
+        start = self._strings_at + self._entries[entry]
+        end = self._map.find(b'\n', start)
+        name, status, note = self._map[start:end].decode('utf-8').split('\t')
+        return {'name': name, 'status': status, 'note': note}
+
+    def lookup(self, company_name=None, domain=None):
+        """
+        Reputation for a company, or None if it isn't listed
+
+        Tries the exact name, then the normalized name (scam listings
+        only), then the domain; a scam listing on any of them wins over a
+        legit one.
+        Returns {'name', 'status', 'note', 'match'}.
+        """
+
+        candidates = []
+        if company_name:
+            candidates.append(('exact', _hash('name', exact_key(company_name))))
+            candidates.append(('normalized', _hash('norm', normalized_key(company_name))))
+        if domain:
+            candidates.append(('domain', _hash('domain', domain_key(domain))))
+
+        found = None
+        for match, key in candidates:
+            record = self._find(key)
+            if record is None:
+                continue
+
+            status = STATUSES[record >> 24]
+            if match == 'normalized' and status != 'scam':
+                # Indexes built before legit names stopped being normalized
+                continue
+
+            result = self._entry(record & 0xFFFFFF)
+            result['status'] = status
+            result['match'] = match
+            if result['status'] == 'scam':
+                return result
+            found = found or result
+
+        return found
+
+    def close(self):
+        self._keys.release()
+        self._records.release()
+        self._entries.release()
+        self._map.close()
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_reputation_index():
+    """Process-wide bundled index (None when the file is missing)"""
+
+    global _default_index
+
+    with _default_index_lock:
+        if _default_index is None and DEFAULT_INDEX_PATH and os.path.exists(DEFAULT_INDEX_PATH):
+            _default_index = ReputationIndex(DEFAULT_INDEX_PATH)
+        return _default_index
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the offline reputation index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='compile CSV sources (name,domain,status[,note])')
+    build.add_argument('sources', nargs='+')
+    build.add_argument('--output', default=DEFAULT_INDEX_PATH)
+
+    lookup = subparsers.add_parser('lookup', help='look up a company name and/or domain')
+    lookup.add_argument('name', nargs='?')
+    lookup.add_argument('--domain')
+    lookup.add_argument('--index', default=DEFAULT_INDEX_PATH)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        stats = build_index(args.sources, args.output)
+        print(f"✅ {stats['companies']} companies, {stats['keys']} keys -> {args.output} "
+              f"({os.path.getsize(args.output):,} bytes)")
+        if stats['conflicts']:
+            print(f"[!] {stats['conflicts']} keys listed as both legit and scam (kept as scam)")
+    else:
+        if not args.name and not args.domain:
+            parser.error('give a company name and/or --domain')
+        result = ReputationIndex(args.index).lookup(args.name, args.domain)
+        if not result:
+            print("Not listed")
+            sys.exit(1)
+        print(f"{result['status'].upper()}: {result['name']} (matched by {result['match']})"
+              + (f" - {result['note']}" if result['note'] else ''))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Research Refresh - stale-while-revalidate for cached company research
+
+Cached research has two ages (scan_store.py):
+
+    younger than RESEARCH_MAX_AGE (soft)        fresh, used as is
+    up to RESEARCH_HARD_MAX_AGE (hard)          stale: returned right away,
+                                                marked 'stale', and refreshed
+                                                in the background
+    older                                       researched before the scan
+                                                goes on
+
+A ResearchRefresher runs the background refreshes on a few threads, at
+most one per company at a time. A refresh that fails (or comes back
+incomplete) leaves the stale entry in place and isn't retried for
+RETRY_AFTER seconds. Refreshes are daemon threads: a one-off CLI scan that
+exits first simply leaves the entry stale for the next scan.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scan_store import normalize_company
+
+# Concurrent background refreshes per process
+REFRESH_WORKERS = int(os.environ.get('RESEARCH_REFRESH_WORKERS', 2))
+
+# Wait this long before refreshing a company again after a failed refresh
+RETRY_AFTER = 600
+
+def mark_stale(research, researched_at):
+    """Copy of cached research flagged as stale, with its age in seconds"""
+
+    return {**research, 'stale': True, 'age_seconds': int(time.time() - researched_at)}
+
+class ResearchRefresher:
+    """
+    Background refreshes, one per company at a time
+
+    refresh: callable(company_name, store) that researches the company and
+    saves the result; returns False (or raises) if it couldn't
+    """
+
+    def __init__(self, refresh, workers=REFRESH_WORKERS, retry_after=RETRY_AFTER):
+        self._refresh = refresh
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='research-refresh')
+        self._lock = threading.Lock()
+        self._inflight = set()
+        self._failed_at = {}
+        self._counters = {'stale_served': 0, 'started': 0, 'refreshed': 0, 'failed': 0, 'deduplicated': 0}
+
+    def refresh(self, company_name, store):
+        """Start a background refresh unless one is running or recently failed; True if started"""
+
+        key = normalize_company(company_name)
+
+        with self._lock:
+            self._counters['stale_served'] += 1
+            if key in self._inflight or time.time() - self._failed_at.get(key, 0) < self.retry_after:
+                self._counters['deduplicated'] += 1
+                return False
+            self._inflight.add(key)
+            self._counters['started'] += 1
+
+        self._executor.submit(self._run, key, company_name, store)
+        return True
+
+    def _run(self, key, company_name, store):
+        try:
+            ok = self._refresh(company_name, store) is not False
+        except Exception:
+            ok = False
+
+        with self._lock:
+            self._inflight.discard(key)
+            if ok:
+                self._counters['refreshed'] += 1
+                self._failed_at.pop(key, None)
+            else:
+                self._counters['failed'] += 1
+                self._failed_at[key] = time.time()
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._inflight), **self._counters}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Scan Profiler - opt-in cProfile + tracemalloc for individual scans
+
+A profiled scan writes three files to SCAN_PROFILE_DIR:
+    <stamp>-<job_id>.prof      cProfile stats (pstats, snakeviz, flameprof)
+    <stamp>-<job_id>.folded    wall-clock stack samples in folded format
+                               (flamegraph.pl, speedscope, inferno)
+    <stamp>-<job_id>.txt       top functions by cumulative time and the
+                               top allocation sites from tracemalloc
+
+cProfile only counts CPU spent in Python calls. The stack sampler also sees
+time spent blocked (page loads, sleeps, waiting on searches), so together
+they show whether a slow scan was parsing, waiting or interpreter overhead.
+
+Turn it on per call (scan_linkedin_job(url, profile=True)) or for a random
+fraction of scans with SCAN_PROFILE_RATE=0.01. Only one scan per process
+is profiled at a time; others that are picked meanwhile run unprofiled.
+tracemalloc is process-wide, so allocations from concurrent scans show up
+in the allocation report too.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+# Fraction of scans profiled when not chosen explicitly (0 = off)
+PROFILE_RATE = float(os.environ.get('SCAN_PROFILE_RATE', 0))
+
+# Where profiles are written
+PROFILE_DIR = os.environ.get('SCAN_PROFILE_DIR', 'scan_profiles')
+
+# Seconds between wall-clock stack samples
+STACK_SAMPLE_INTERVAL = float(os.environ.get('SCAN_PROFILE_INTERVAL', 0.005))
+
+# Lines in each section of the text report
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+# Stack depth tracemalloc records per allocation
+TRACEMALLOC_FRAMES = 10
+
+# Held while a scan is being profiled
+_active = threading.Lock()
+
+def should_profile(profile=None):
+    """Explicit choice if given, otherwise sample at PROFILE_RATE"""
+
+    if profile is not None:
+        return bool(profile)
+    return PROFILE_RATE > 0 and random.random() < PROFILE_RATE
+
+# ============================================================================
+# WALL-CLOCK STACK SAMPLER
+# ============================================================================
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack on an interval, as folded stacks"""
+
+    def __init__(self, thread_id, interval=STACK_SAMPLE_INTERVAL):
+        super().__init__(daemon=True, name='scan-profiler')
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+
+            # Skip the profiler's own frames at the top of the sampled stack
+            stack = [name for name in stack if 'scan_profiler.py' not in name]
+            self.counts[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def folded(self):
+        """Collapsed stacks, one 'frame;frame;frame count' line each"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+# ============================================================================
+# PROFILING CONTEXT
+# ============================================================================
+
+def _report(label, elapsed, profiler, snapshot, peak_bytes):
+    out = io.StringIO()
+    out.write(f"Scan profile: {label}\n")
+    out.write(f"Wall time: {elapsed:.3f}s\n")
+    out.write(f"Peak traced memory: {peak_bytes / 1024 / 1024:.1f} MB\n")
+
+    out.write(f"\n=== Top {TOP_FUNCTIONS} functions by cumulative time ===\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+    out.write(f"\n=== Top {TOP_ALLOCATIONS} allocation sites (live at end of scan) ===\n")
+    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        out.write(f"{stat.size / 1024:>10.1f} KiB {stat.count:>8} blocks  {frame.filename}:{frame.lineno}\n")
+
+    return out.getvalue()
+
+@contextmanager
+def profile_scan(label, profile=None, output_dir=None):
+    """
+    Profile the enclosed block if chosen (see should_profile)
+
+    Yields the base path the profile files will be written to, or None
+    when this scan isn't profiled.
+    """
+
+    if not should_profile(profile) or not _active.acquire(blocking=False):
+        yield None
+        return
+
+    output_dir = output_dir or PROFILE_DIR
+    safe_label = re.sub(r'[^\w.-]+', '_', str(label))[:80]
+    base_path = os.path.join(output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}")
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+
+    sampler = StackSampler(threading.get_ident())
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+
+    try:
+        sampler.start()
+        profiler.enable()
+        try:
+            yield base_path
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+
+            snapshot = tracemalloc.take_snapshot()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+
+            # Never let a reporting problem break the scan itself
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+                profiler.dump_stats(base_path + '.prof')
+                with open(base_path + '.folded', 'w', encoding='utf-8') as f:
+                    f.write(sampler.folded())
+                with open(base_path + '.txt', 'w', encoding='utf-8') as f:
+                    f.write(_report(label, elapsed, profiler, snapshot, peak_bytes))
+            except Exception as e:
+                print(f"[!] Could not write scan profile: {e}")
+    finally:
+        _active.release()
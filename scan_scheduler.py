@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Scan Scheduler - priority classes in front of browser and search capacity
+
+Two classes of work compete for the same browsers and searches:
+
+    interactive   a person waiting on a result (Streamlit UI, POST /scan)
+    batch         bulk ingestion (pipeline.py, worker.py, POST /scan/batch)
+
+A PriorityScheduler hands out slots of one resource. When several classes
+are waiting, slots are shared by weight (weighted fair queueing: each grant
+costs a class 1/weight of virtual time, and the class furthest behind goes
+next), so interactive scans get 4 of every 5 free slots by default without
+starving batch work. While interactive work is waiting, running or was
+seen in the last RESERVE_HOLD seconds, batch can't hold the last
+RESERVED_INTERACTIVE slots, so a user scanning during a large batch doesn't
+wait behind it. A process that only runs batch work (pipeline.py,
+worker.py) never holds anything back and uses every slot.
+
+The priority of the current scan is a context variable:
+
+    with scan_priority(BATCH):
+        scan_linkedin_job(url)      # its scrape and searches queue as batch
+
+Work that doesn't set a priority is interactive. Capacity follows the
+active adaptive limits (adaptive_limits.py) when a batch run has set them,
+otherwise SCRAPE_SLOTS / SEARCH_SLOTS.
+"""
+
+import collections
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from adaptive_limits import SlotTimeout, get_limits, limited
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Share of contended slots: interactive gets 4 for every batch 1
+DEFAULT_WEIGHTS = {INTERACTIVE: 4, BATCH: 1}
+
+# Slots batch work can't take while interactive work is around...
+RESERVED_INTERACTIVE = int(os.environ.get('RESERVED_INTERACTIVE_SLOTS', 1))
+# ...i.e. waiting, running, or seen within this many seconds
+RESERVE_HOLD = 60
+
+# Capacity when no adaptive limits are active
+SCRAPE_SLOTS = int(os.environ.get('SCRAPE_SLOTS', 4))
+SEARCH_SLOTS = int(os.environ.get('SEARCH_SLOTS', 16))
+
+# Wait samples kept per class for percentiles
+WAIT_SAMPLES = 500
+
+_priority = contextvars.ContextVar('scan_priority', default=INTERACTIVE)
+
+class _Waiter:
+    __slots__ = ('priority', 'enqueued_at', 'granted')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+class PriorityScheduler:
+    """
+    Slots of one resource, handed out by priority class
+
+    capacity: slot count, or a callable returning the current count
+    (re-read whenever a slot could be handed out)
+    """
+
+    def __init__(self, name, capacity, weights=None, reserved=RESERVED_INTERACTIVE):
+        self.name = name
+        self._capacity = capacity if callable(capacity) else (lambda: capacity)
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.reserved = reserved
+
+        self._cond = threading.Condition()
+        self._waiting = {priority: collections.deque() for priority in self.weights}
+        self._running = dict.fromkeys(self.weights, 0)
+        self._virtual = dict.fromkeys(self.weights, 0.0)
+        self._granted = dict.fromkeys(self.weights, 0)
+        self._waits = {priority: collections.deque(maxlen=WAIT_SAMPLES) for priority in self.weights}
+        self._interactive_seen = None
+
+    def capacity(self):
+        return max(1, int(self._capacity()))
+
+    def _reserve_held(self):
+        if INTERACTIVE not in self.weights:
+            return False
+        if self._waiting[INTERACTIVE] or self._running[INTERACTIVE]:
+            return True
+        return self._interactive_seen is not None and time.monotonic() - self._interactive_seen < RESERVE_HOLD
+
+    def _class_limit(self, priority, capacity):
+        """Most slots a class may hold: batch leaves the reserve free while it's held"""
+
+        if priority == INTERACTIVE or not self._reserve_held():
+            return capacity
+        # Never reserve the only slot, or batch would stop entirely
+        return capacity - min(self.reserved, capacity - 1)
+
+    def _dispatch(self):
+        """Grant free slots to waiters, fairest class first (lock held)"""
+
+        capacity = self.capacity()
+        granted = False
+
+        while sum(self._running.values()) < capacity:
+            eligible = [priority for priority, queue in self._waiting.items()
+                        if queue and self._running[priority] < self._class_limit(priority, capacity)]
+            if not eligible:
+                break
+
+            priority = min(eligible, key=lambda p: (self._virtual[p], p != INTERACTIVE))
+            waiter = self._waiting[priority].popleft()
+            waiter.granted = True
+            self._running[priority] += 1
+            self._granted[priority] += 1
+            self._virtual[priority] += 1 / self.weights[priority]
+            self._waits[priority].append(time.monotonic() - waiter.enqueued_at)
+            granted = True
+
+        if granted:
+            self._cond.notify_all()
+
+    def acquire(self, priority=INTERACTIVE, timeout=None):
+        """Wait for a slot in this priority class; False if none came free within timeout seconds"""
+
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority {priority!r} (expected one of {', '.join(self.weights)})")
+
+        waiter = _Waiter(priority)
+        with self._cond:
+            # A class that was idle rejoins at the others' virtual time,
+            # so it can't bank credit while it had nothing to run
+            if not self._waiting[priority] and not self._running[priority]:
+                busy = [self._virtual[p] for p in self.weights if p != priority
+                        and (self._waiting[p] or self._running[p])]
+                if busy:
+                    self._virtual[priority] = max(self._virtual[priority], min(busy))
+
+            self._waiting[priority].append(waiter)
+            self._dispatch()
+            try:
+                if not self._cond.wait_for(lambda: waiter.granted, timeout):
+                    self._waiting[priority].remove(waiter)
+                    return False
+            except BaseException:
+                # Interrupted: give back the slot or leave the queue
+                if waiter.granted:
+                    self._running[priority] -= 1
+                    self._dispatch()
+                else:
+                    self._waiting[priority].remove(waiter)
+                raise
+        return True
+
+    def release(self, priority=INTERACTIVE):
+        with self._cond:
+            self._running[priority] -= 1
+            if priority == INTERACTIVE:
+                self._interactive_seen = time.monotonic()
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority=INTERACTIVE, timeout=None):
+        if not self.acquire(priority, timeout):
+            raise SlotTimeout(f"No {self.name} slot free for {priority} work within {timeout:.1f}s")
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def metrics(self):
+        """Capacity, plus waiting/running counts and queue wait (seconds) per class"""
+
+        with self._cond:
+            classes = {}
+            for priority in self.weights:
+                waits = sorted(self._waits[priority])
+                classes[priority] = {
+                    'waiting': len(self._waiting[priority]),
+                    'running': self._running[priority],
+                    'granted': self._granted[priority],
+                    'wait_p50': round(waits[len(waits) // 2], 3) if waits else None,
+                    'wait_p95': round(waits[min(len(waits) - 1, int(0.95 * len(waits)))], 3) if waits else None,
+                    'wait_max': round(waits[-1], 3) if waits else None,
+                }
+            return {'capacity': self.capacity(), 'reserved_interactive': self.reserved,
+                    'reserve_held': self._reserve_held(), **classes}
+
+# ============================================================================
+# PROCESS-WIDE SCHEDULERS
+# ============================================================================
+
+def _limit_capacity(kind, default):
+    """Capacity that follows the active adaptive limit for kind"""
+
+    def capacity():
+        limits = get_limits()
+        return limits[kind].limit if limits and kind in limits else default
+    return capacity
+
+_schedulers = None
+_schedulers_lock = threading.Lock()
+
+def get_schedulers():
+    """The process's scrape and search schedulers, created on first use"""
+
+    global _schedulers
+    with _schedulers_lock:
+        if _schedulers is None:
+            _schedulers = {
+                'scrape': PriorityScheduler('scrape', _limit_capacity('scrape', SCRAPE_SLOTS)),
+                'search': PriorityScheduler('search', _limit_capacity('search', SEARCH_SLOTS)),
+            }
+        return _schedulers
+
+def scheduler_metrics():
+    """metrics() of each process-wide scheduler"""
+    return {kind: scheduler.metrics() for kind, scheduler in get_schedulers().items()}
+
+def current_priority():
+    return _priority.get()
+
+@contextmanager
+def scan_priority(priority):
+    """Run the enclosed scans (in this thread) in a priority class"""
+
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r} (expected one of {', '.join(PRIORITIES)})")
+
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+@contextmanager
+def scheduled(kind, timeout=None):
+    """
+    A slot of the `kind` scheduler in the current priority class, then a
+    slot of the adaptive limit; yields the adaptive_limits.Outcome
+
+    timeout: most seconds to wait for both (None = as long as it takes);
+    raises SlotTimeout when it runs out
+    """
+
+    priority = current_priority()
+    started = time.monotonic()
+    with get_schedulers()[kind].slot(priority, timeout):
+        left = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+        with limited(kind, left) as outcome:
+            yield outcome
+
+def format_waits(metrics):
+    """One-line per-class wait summary, e.g. for progress output"""
+
+    parts = []
+    for kind, scheduler in metrics.items():
+        classes = ', '.join(
+            f"{priority} p95 {scheduler[priority]['wait_p95'] or 0:.2f}s ({scheduler[priority]['granted']})"
+            for priority in PRIORITIES if priority in scheduler
+        )
+        parts.append(f"{kind} wait: {classes}")
+    return '   '.join(parts)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Scan Store - SQLite persistence for incremental re-scans
+Keeps a content hash + last result per job ID, cached company research and
+recent scrape failures (a short-lived negative cache)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Where scan history lives (set SCAN_STORE_PATH="" to disable persistence)
+DEFAULT_STORE_PATH = os.environ.get('SCAN_STORE_PATH', 'scan_store.db')
+
+# How long company research stays fresh before we search again (seconds)
+RESEARCH_MAX_AGE = int(os.environ.get('RESEARCH_MAX_AGE', 7 * 24 * 3600))
+
+# Research older than RESEARCH_MAX_AGE but younger than this is still served
+# (marked stale) while it is refreshed in the background
+RESEARCH_HARD_MAX_AGE = int(os.environ.get('RESEARCH_HARD_MAX_AGE', 30 * 24 * 3600))
+
+# Fields of job_data that make up the content hash. 'posted' ("2 days ago")
+# and 'applicants' change daily without the posting changing, so they're
+# left out; rules that read them are re-checked on reuse (detector_scam.py)
+HASHED_FIELDS = ('job_title', 'company', 'location', 'description')
+
+# ============================================================================
+# CONTENT HASHING
+# ============================================================================
+
+def hash_job_data(job_data):
+    """Stable SHA-256 of the extracted posting fields (URL excluded)"""
+
+    payload = json.dumps(
+        [job_data.get(field, 'N/A') for field in HASHED_FIELDS],
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def normalize_company(company_name):
+    """Key used for the company research cache"""
+    return ' '.join(company_name.lower().split())
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+class ScanStore:
+    """Thread-safe SQLite store shared by the UI, batch tools and workers"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scans (
+                job_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                scanned_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS company_research (
+                company_key TEXT PRIMARY KEY,
+                research TEXT NOT NULL,
+                researched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                job_id TEXT PRIMARY KEY,
+                reason TEXT NOT NULL,
+                detail TEXT,
+                failed_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            rows = cursor.fetchall()
+            self._conn.commit()
+            return rows
+
+    # ---- scans -------------------------------------------------------------
+
+    def get_scan(self, job_id):
+        """Last stored scan for a job ID, or None"""
+
+        rows = self._execute(
+            'SELECT content_hash, result, scanned_at FROM scans WHERE job_id = ?',
+            (job_id,),
+        )
+        if not rows:
+            return None
+
+        content_hash, result, scanned_at = rows[0]
+        return {
+            'content_hash': content_hash,
+            'result': json.loads(result),
+            'scanned_at': scanned_at,
+        }
+
+    def save_scan(self, job_id, content_hash, result):
+        """Store (or replace) the scan result for a job ID"""
+
+        self._execute(
+            'INSERT OR REPLACE INTO scans (job_id, content_hash, result, scanned_at) '
+            'VALUES (?, ?, ?, ?)',
+            (job_id, content_hash, json.dumps(result, ensure_ascii=False), time.time()),
+        )
+
+    def iter_scans(self):
+        """Every stored scan (job_id, content_hash, result, scanned_at)"""
+
+        for job_id, content_hash, result, scanned_at in self._execute(
+            'SELECT job_id, content_hash, result, scanned_at FROM scans'
+        ):
+            yield {
+                'job_id': job_id,
+                'content_hash': content_hash,
+                'result': json.loads(result),
+                'scanned_at': scanned_at,
+            }
+
+    # ---- company research --------------------------------------------------
+
+    def get_company_research(self, company_name, max_age=RESEARCH_MAX_AGE):
+        """Cached research for a company if younger than max_age seconds"""
+
+        entry = self.get_company_research_entry(company_name, max_age)
+        return entry['research'] if entry else None
+
+    def get_company_research_entry(self, company_name, max_age=RESEARCH_HARD_MAX_AGE):
+        """{'research', 'researched_at'} for a company if younger than max_age seconds"""
+
+        rows = self._execute(
+            'SELECT research, researched_at FROM company_research WHERE company_key = ?',
+            (normalize_company(company_name),),
+        )
+        if not rows:
+            return None
+
+        research, researched_at = rows[0]
+        if time.time() - researched_at > max_age:
+            return None
+        return {'research': json.loads(research), 'researched_at': researched_at}
+
+    def save_company_research(self, company_name, research):
+        """Cache research results for a company"""
+
+        self._execute(
+            'INSERT OR REPLACE INTO company_research (company_key, research, researched_at) '
+            'VALUES (?, ?, ?)',
+            (normalize_company(company_name), json.dumps(research, ensure_ascii=False), time.time()),
+        )
+
+    # ---- negative cache ----------------------------------------------------
+
+    def get_failure(self, job_id):
+        """Unexpired scrape failure recorded for a job ID, or None"""
+
+        rows = self._execute(
+            'SELECT reason, detail, failed_at FROM failures WHERE job_id = ? AND expires_at > ?',
+            (job_id, time.time()),
+        )
+        if not rows:
+            return None
+
+        reason, detail, failed_at = rows[0]
+        return {'reason': reason, 'detail': detail, 'failed_at': failed_at}
+
+    def save_failure(self, job_id, reason, detail, ttl):
+        """Remember that scraping a job ID failed, for ttl seconds"""
+
+        now = time.time()
+        self._execute(
+            'INSERT OR REPLACE INTO failures (job_id, reason, detail, failed_at, expires_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (job_id, reason, detail, now, now + ttl),
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_default_store():
+    """Process-wide store at SCAN_STORE_PATH (None when disabled)"""
+
+    global _default_store
+
+    if not DEFAULT_STORE_PATH:
+        return None
+
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ScanStore(DEFAULT_STORE_PATH)
+        return _default_store
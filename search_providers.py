@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Search Providers - hedged search across several DuckDuckGo endpoints
+
+Each query goes to the backend with the lowest expected latency: the mean
+of its recent requests, where an error counts as at least ERROR_PENALTY
+seconds and a request abandoned for a faster hedge counts as the time it
+had been running. A backend with no samples yet ranks after every tested
+one. A small share of queries (EXPLORE_RATE) goes to a lower-ranked
+backend first, so a backend that lost once gets new samples and can win
+its place back. If the primary hasn't answered within its observed p95
+(successful requests only), a second (hedged) request goes to the next
+backend, the first good answer wins and the loser's connection is
+closed. Per-backend stats are available via backend_stats().
+
+Backend URLs can be pointed at local stand-ins (see mock_servers.py ddg)
+with set_backends(make_backends(html_url=..., lite_url=...)).
+"""
+
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+from bs4 import BeautifulSoup
+
+from page_archive import get_default_archive
+from parse_pool import offload
+
+DDG_HTML_URL = 'https://html.duckduckgo.com/html/'
+DDG_LITE_URL = 'https://lite.duckduckgo.com/lite/'
+
+# Hedge delay before a backend has enough samples for a p95
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_HEDGE_DELAY = 0.25
+MIN_SAMPLES_FOR_P95 = 20
+
+# Latency samples kept per backend
+STATS_WINDOW = 200
+
+# Least a failed request counts for when ranking backends, so one that
+# errors right away doesn't look fast
+ERROR_PENALTY = 5.0
+
+# Share of queries sent to a lower-ranked backend first, to re-measure it
+EXPLORE_RATE = float(os.environ.get('SEARCH_EXPLORE_RATE', 0.05))
+
+# ============================================================================
+# RESULT PARSERS
+# ============================================================================
+
+def _unwrap_redirect(href):
+    """Extract actual URL from DuckDuckGo redirect"""
+
+    if 'uddg=' in href:
+        parsed = urllib.parse.parse_qs(urllib.parse.urlparse(href).query)
+        if 'uddg' in parsed:
+            return parsed['uddg'][0]
+    return href
+
+def parse_html_results(html, num_results=10):
+    """Results from the html.duckduckgo.com page"""
+
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    result_divs = soup.find_all('div', class_='result')
+
+    for div in result_divs[:num_results]:
+        link = div.find('a', class_='result__a')
+        if link:
+            title = link.get_text(strip=True)
+            href = _unwrap_redirect(link.get('href', ''))
+
+            if href.startswith('http'):
+                snippet_elem = div.find('a', class_='result__snippet')
+                snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+
+                results.append({
+                    'title': title,
+                    'url': href,
+                    'snippet': snippet[:200] if snippet else ""
+                })
+
+    return results
+
+def parse_lite_results(html, num_results=10):
+    """Results from the lite.duckduckgo.com table layout"""
+
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+
+    links = soup.find_all('a', class_='result-link')
+    snippets = soup.find_all('td', class_='result-snippet')
+
+    for index, link in enumerate(links[:num_results]):
+        href = _unwrap_redirect(link.get('href', ''))
+
+        if href.startswith('http'):
+            snippet = snippets[index].get_text(strip=True) if index < len(snippets) else ""
+
+            results.append({
+                'title': link.get_text(strip=True),
+                'url': href,
+                'snippet': snippet[:200] if snippet else ""
+            })
+
+    return results
+
+# ============================================================================
+# BACKENDS + LATENCY STATS
+# ============================================================================
+
+class SearchBackend:
+    """One search endpoint with its own latency history"""
+
+    def __init__(self, name, url, parser):
+        self.name = name
+        self.url = url
+        self.parser = parser
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=STATS_WINDOW)
+        self._costs = deque(maxlen=STATS_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.abandoned = 0
+        self.wins = 0
+        self.hedged = 0
+
+    def record(self, latency, ok, abandoned=False):
+        """
+        One finished request: ok, failed, or abandoned (still running when
+        another backend answered; latency is how long it had run by then)
+        """
+
+        with self._lock:
+            self.requests += 1
+            if ok:
+                self._latencies.append(latency)
+                self._costs.append(latency)
+            elif abandoned:
+                self.abandoned += 1
+                self._costs.append(latency)
+            else:
+                self.errors += 1
+                self._costs.append(max(latency, ERROR_PENALTY))
+
+    def expected_latency(self):
+        """Mean cost of recent requests, failures included; None if untested"""
+
+        with self._lock:
+            if not self._costs:
+                return None
+            return sum(self._costs) / len(self._costs)
+
+    def rank_key(self):
+        """Sort key: tested backends by expected latency, then untested ones"""
+
+        expected = self.expected_latency()
+        return (expected is None, expected or 0.0)
+
+    def percentile(self, fraction):
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def hedge_delay(self, timeout):
+        """How long to wait on this backend before hedging"""
+
+        with self._lock:
+            enough = len(self._latencies) >= MIN_SAMPLES_FOR_P95
+        delay = self.percentile(0.95) if enough else DEFAULT_HEDGE_DELAY
+        return min(max(delay, MIN_HEDGE_DELAY), timeout)
+
+    def stats(self):
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'abandoned': self.abandoned,
+            'wins': self.wins,
+            'hedged_to': self.hedged,
+            'p50': rounded(self.percentile(0.50)),
+            'p95': rounded(self.percentile(0.95)),
+            'p99': rounded(self.percentile(0.99)),
+            'expected': rounded(self.expected_latency()),
+        }
+
+# Result page parser per backend name (also used to replay archived pages)
+PARSERS = {
+    'ddg-html': parse_html_results,
+    'ddg-lite': parse_lite_results,
+}
+
+def make_backends(html_url=DDG_HTML_URL, lite_url=DDG_LITE_URL):
+    """The DuckDuckGo HTML and lite endpoints"""
+
+    return [
+        SearchBackend('ddg-html', html_url, PARSERS['ddg-html']),
+        SearchBackend('ddg-lite', lite_url, PARSERS['ddg-lite']),
+    ]
+
+_backends = make_backends()
+
+def set_backends(backends):
+    """Replace the backend list (e.g. with local stand-in servers)"""
+
+    global _backends
+    _backends = backends
+
+def backend_stats():
+    """Latency and outcome stats per backend"""
+    return {backend.name: backend.stats() for backend in _backends}
+
+# ============================================================================
+# HEDGED SEARCH
+# ============================================================================
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='search')
+
+class SearchError(Exception):
+    """Every backend failed for a query"""
+
+class _Attempt:
+    """
+    One request to one backend, recorded exactly once: by the request when
+    it finishes, or by hedged_search when it gives up on it (whichever
+    comes first; the other is a no-op)
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.session = requests.Session()
+        self.launched = time.monotonic()
+        self._lock = threading.Lock()
+        self._recorded = False
+
+    def finish(self, ok, abandoned=False):
+        with self._lock:
+            if self._recorded:
+                return
+            self._recorded = True
+            self.backend.record(time.monotonic() - self.launched, ok=ok, abandoned=abandoned)
+
+def _fetch(attempt, query, num_results, headers, timeout):
+    """One backend request; raises on transport errors and non-200 answers"""
+
+    backend = attempt.backend
+    try:
+        response = attempt.session.get(backend.url, params={'q': query}, headers=headers, timeout=timeout)
+        if response.status_code != 200:
+            raise SearchError(f"{backend.name} answered HTTP {response.status_code}")
+        # In the active parse pool, if any: only the result list comes back
+        results = offload(backend.parser, response.text, num_results)
+    except Exception:
+        attempt.finish(ok=False)
+        raise
+
+    attempt.finish(ok=True)
+
+    archive = get_default_archive()
+    if archive:
+        archive.put('search', query, response.url, response.text, source=backend.name)
+
+    return results
+
+def hedged_search(query, num_results=10, headers=None, timeout=15):
+    """
+    Search with a hedged second request; returns the first good result list
+
+    Raises SearchError when every attempted backend fails or times out.
+    """
+
+    backends = sorted(_backends, key=lambda backend: backend.rank_key())
+    if len(backends) > 1 and random.random() < EXPLORE_RATE:
+        # Re-measure a lower-ranked backend; the hedge still covers a slow one
+        explored = random.choice(backends[1:])
+        backends.remove(explored)
+        backends.insert(0, explored)
+    primary, fallbacks = backends[0], backends[1:]
+    deadline = time.monotonic() + timeout
+
+    attempts = {}
+
+    def launch(backend):
+        attempt = _Attempt(backend)
+        remaining = max(deadline - time.monotonic(), 0.1)
+        attempts[_executor.submit(_fetch, attempt, query, num_results, headers, remaining)] = attempt
+
+    launch(primary)
+    pending = set(attempts)
+    hedge_at = time.monotonic() + primary.hedge_delay(timeout)
+    last_error = None
+
+    try:
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            # Wait until something finishes, or until it's time to hedge
+            hedge_pending = bool(fallbacks) and len(attempts) == 1
+            wake_at = min(hedge_at, deadline) if hedge_pending else deadline
+            done, pending = wait(pending, timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                backend = attempts[future].backend
+                try:
+                    results = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                backend.wins += 1
+                return results
+
+            # Hedge on a slow primary, or fail over right away if it errored
+            if hedge_pending and (time.monotonic() >= hedge_at or not pending):
+                fallback = fallbacks[0]
+                fallback.hedged += 1
+                launch(fallback)
+                pending |= {future for future in attempts if not future.done()}
+    finally:
+        # Cancel the losers: queued ones never start, running ones have
+        # their connections closed under them and count as abandoned
+        for future, attempt in attempts.items():
+            if not future.done() and not future.cancel():
+                attempt.finish(ok=False, abandoned=True)
+            attempt.session.close()
+
+    raise SearchError(f"No search backend answered for {query!r}: {last_error or 'timed out'}")
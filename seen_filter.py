@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Seen Filter - compact, persistent "have we seen this job ID?" check
+
+A scalable Bloom filter stored as memory-mapped bit arrays, one file per
+slice (<path>.0, <path>.1, ...). When a slice fills up to its capacity, a
+new one twice as large with a tighter error rate is added, so the overall
+false positive rate stays under the configured target however many IDs
+arrive. Memory stays at about 1.8 bytes per ID at a 0.1% error rate and
+the OS pages in only the bits that are touched.
+
+Bloom filters never miss an ID they have seen, but can wrongly claim to
+have seen a new one. ConfirmedSeen (used by SeenJobs) confirms every
+"seen" answer against a table of every ID it was given, so a false
+positive only costs one lookup.
+
+Usage:
+    python seen_filter.py add urls.txt         # mark IDs as seen
+    python seen_filter.py check 4360972282
+    python seen_filter.py stats
+"""
+
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows - one writer process only
+    fcntl = None
+
+from job_urls import extract_job_id
+
+# Default filter location and sizing (override with environment variables)
+DEFAULT_FILTER_PATH = os.environ.get('SEEN_FILTER_PATH', 'seen_jobs.bloom')
+INITIAL_CAPACITY = int(os.environ.get('SEEN_FILTER_CAPACITY', 1_000_000))
+ERROR_RATE = float(os.environ.get('SEEN_FILTER_ERROR_RATE', 0.001))
+
+# Filter hits confirmed per SQLite query (ConfirmedSeen)
+CONFIRM_BATCH_SIZE = 500
+
+# Each new slice holds GROWTH times more IDs at TIGHTENING times the error
+GROWTH = 2
+TIGHTENING = 0.5
+
+MAGIC = b'BLOOM\x00\x00\x01'
+HEADER = struct.Struct('<8sQdQQQ')   # magic, capacity, error rate, bits, hashes, count
+COUNT_OFFSET = HEADER.size - 8
+
+# ============================================================================
+# ONE BLOOM FILTER SLICE
+# ============================================================================
+
+def _bit_positions(key, num_bits, num_hashes):
+    """num_hashes bit positions by double hashing one 128-bit digest"""
+
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+class BloomSlice:
+    """Fixed-capacity Bloom filter backed by a memory-mapped file"""
+
+    def __init__(self, path, capacity=None, error_rate=None):
+        """Open the slice at path, creating it with capacity/error_rate if missing"""
+
+        self.path = path
+
+        if not os.path.exists(path):
+            num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+            num_bytes = (num_bits + 7) // 8
+
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, capacity, error_rate, num_bits, num_hashes, 0))
+                f.truncate(HEADER.size + num_bytes)   # sparse: zero bits cost no disk
+            os.replace(tmp_path, path)
+
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, self.capacity, self.error_rate, self.num_bits, self.num_hashes, _ = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Bloom filter slice")
+
+    @property
+    def count(self):
+        return struct.unpack_from('<Q', self._map, COUNT_OFFSET)[0]
+
+    def full(self):
+        return self.count >= self.capacity
+
+    def __contains__(self, key):
+        bits = self._map
+        for position in _bit_positions(key, self.num_bits, self.num_hashes):
+            if not bits[HEADER.size + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, key):
+        """
+        Set key's bits (caller holds the write lock)
+
+        Returns True if any bit was unset, i.e. the key wasn't present;
+        only then does the count go up.
+        """
+
+        bits = self._map
+        new = False
+        for position in _bit_positions(key, self.num_bits, self.num_hashes):
+            index = HEADER.size + (position >> 3)
+            mask = 1 << (position & 7)
+            if not bits[index] & mask:
+                bits[index] |= mask
+                new = True
+        if new:
+            struct.pack_into('<Q', bits, COUNT_OFFSET, self.count + 1)
+        return new
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+# ============================================================================
+# SCALABLE FILTER
+# ============================================================================
+
+class ScalableBloomFilter:
+    """
+    Growing Bloom filter made of BloomSlice files
+
+    Safe to share between threads and between processes on one host:
+    writers take an flock on <path>.lock and pick up slices other
+    processes have added.
+    """
+
+    def __init__(self, path=DEFAULT_FILTER_PATH, initial_capacity=INITIAL_CAPACITY,
+                 error_rate=ERROR_RATE):
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._lock_file = open(f"{path}.lock", 'a+b')
+        self.slices = []
+
+        with self._lock, self._file_lock():
+            self._open_slices()
+            if not self.slices:
+                self._add_slice()
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open_slices(self):
+        """Open slice files that appeared since we last looked"""
+
+        while os.path.exists(f"{self.path}.{len(self.slices)}"):
+            self.slices.append(BloomSlice(f"{self.path}.{len(self.slices)}"))
+
+    def _add_slice(self):
+        level = len(self.slices)
+        # Error rates form a geometric series: the total stays below error_rate
+        self.slices.append(BloomSlice(
+            f"{self.path}.{level}",
+            capacity=self.initial_capacity * GROWTH ** level,
+            error_rate=self.error_rate * (1 - TIGHTENING) * TIGHTENING ** level,
+        ))
+
+    def __contains__(self, key):
+        with self._lock:
+            self._open_slices()
+            slices = list(self.slices)
+        return any(key in bloom_slice for bloom_slice in reversed(slices))
+
+    def _add(self, key):
+        """add() with the locks held"""
+
+        *older, newest = self.slices
+        if any(key in bloom_slice for bloom_slice in older):
+            return False
+        if newest.full():
+            if key in newest:
+                return False
+            self._add_slice()
+            newest = self.slices[-1]
+        # Checks and sets the newest slice's bits in one pass
+        return newest.add(key)
+
+    def add(self, key):
+        """Add key; returns False if it (probably) was already present"""
+
+        with self._lock, self._file_lock():
+            self._open_slices()
+            return self._add(key)
+
+    def add_many(self, keys):
+        """add() for a batch of keys under one lock; returns a list of bools"""
+
+        with self._lock, self._file_lock():
+            self._open_slices()
+            return [self._add(key) for key in keys]
+
+    def __len__(self):
+        return sum(bloom_slice.count for bloom_slice in self.slices)
+
+    def stats(self):
+        return {
+            'ids': len(self),
+            'slices': len(self.slices),
+            'bytes': sum(bloom_slice.num_bits // 8 for bloom_slice in self.slices),
+            'error_rate': self.error_rate,
+        }
+
+    def flush(self):
+        for bloom_slice in self.slices:
+            bloom_slice.flush()
+
+    def close(self):
+        for bloom_slice in self.slices:
+            bloom_slice.close()
+        self._lock_file.close()
+
+# ============================================================================
+# JOB ID DEDUPLICATION
+# ============================================================================
+
+class SeenJobs:
+    """
+    Seen-before check for job IDs across dumps, exact (ConfirmedSeen)
+
+    An ID counts as seen once it has been handed out, whether its scan is
+    still queued, finished, or failed for good (a dead posting): retrying
+    is the task queue's job, not the next dump's.
+    """
+
+    def __init__(self, seen=None):
+        self.seen = seen if seen is not None else ConfirmedSeen(DEFAULT_FILTER_PATH)
+
+    def is_new(self, job_id):
+        """True if job_id should be scanned; marks it as seen"""
+        return self.seen.add(job_id)
+
+    def filter_urls(self, job_urls):
+        """Yield only URLs whose job ID hasn't been seen (IDs are marked seen)"""
+
+        for job_url in job_urls:
+            job_id = extract_job_id(job_url)
+            if not job_id or self.is_new(job_id):
+                yield job_url
+
+class ConfirmedSeen:
+    """
+    Exact seen-before set: Bloom filter first, a SQLite table to confirm
+
+    Every added ID goes into the table (<path>.ids); the table is only
+    read for filter hits (duplicates and the rare false positive), so new
+    IDs cost one batched insert. For dedupe where dropping a unique ID as
+    a false positive isn't acceptable.
+
+    temporary: skip the journal and fsyncs (for a throwaway set)
+    """
+
+    def __init__(self, path, initial_capacity=INITIAL_CAPACITY, error_rate=ERROR_RATE, temporary=False):
+        self.bloom = ScalableBloomFilter(path, initial_capacity=initial_capacity, error_rate=error_rate)
+        self._db = sqlite3.connect(f"{path}.ids", check_same_thread=False, timeout=30)
+        if temporary:
+            self._db.execute('PRAGMA journal_mode=OFF')
+            self._db.execute('PRAGMA synchronous=OFF')
+        else:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS ids (id TEXT PRIMARY KEY) WITHOUT ROWID')
+        self._lock = threading.Lock()
+
+    def _stored(self, keys):
+        """The keys already in the table"""
+
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), CONFIRM_BATCH_SIZE):
+            chunk = keys[start:start + CONFIRM_BATCH_SIZE]
+            rows = self._db.execute(
+                f"SELECT id FROM ids WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def add_many(self, keys):
+        """Add keys; returns a list of bools, True where the key is new (exact)"""
+
+        with self._lock:
+            probably_new = self.bloom.add_many(keys)
+            stored = self._stored({key for key, new in zip(keys, probably_new) if not new})
+
+            added = set()
+            result = []
+            for key, new in zip(keys, probably_new):
+                is_new = new or (key not in stored and key not in added)
+                if is_new:
+                    added.add(key)
+                result.append(is_new)
+
+            with self._db:
+                self._db.executemany('INSERT OR IGNORE INTO ids (id) VALUES (?)', ((key,) for key in added))
+            return result
+
+    def add(self, key):
+        return self.add_many([key])[0]
+
+    def close(self):
+        self._db.close()
+        self.bloom.close()
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Bloom filter of job IDs already seen')
+    parser.add_argument('--filter', default=DEFAULT_FILTER_PATH, help='filter path prefix')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add = subparsers.add_parser('add', help='mark every job ID in a URL file as seen')
+    add.add_argument('input', help='file with one job URL or ID per line')
+
+    check = subparsers.add_parser('check', help='is this job ID (probably) seen?')
+    check.add_argument('job_ids', nargs='+')
+
+    subparsers.add_parser('stats', help='size and slice count')
+
+    args = parser.parse_args()
+    bloom = ScalableBloomFilter(args.filter)
+
+    if args.command == 'add':
+        added = total = 0
+        with open(args.input, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                job_id = line if line.isdigit() else extract_job_id(line)
+                if job_id:
+                    total += 1
+                    added += bloom.add(job_id)
+        bloom.flush()
+        print(f"✅ {added} new of {total} job IDs")
+    elif args.command == 'check':
+        for job_id in args.job_ids:
+            print(f"{job_id}: {'seen' if job_id in bloom else 'new'}")
+    else:
+        for key, value in bloom.stats().items():
+            print(f"{key}: {value}")
+
+    bloom.close()
+
+
+if __name__ == "__main__":
+    main()
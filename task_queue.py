@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Shared Task Queue - scan tasks for distributed workers
+
+Backends (chosen by URL):
+    sqlite:///tasks.db      file-based, for one host or a shared volume
+    redis://host:6379/0     Redis, for many machines (pip install redis)
+
+Tasks are keyed by job ID, so enqueueing a job that is already queued or
+running is a no-op. A claimed task is invisible to other workers until its
+visibility timeout passes; if the worker doesn't ack it by then, another
+worker picks it up. Tasks that fail max_attempts times go to the dead list.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+DEFAULT_VISIBILITY_TIMEOUT = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Task states
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+DEAD = 'dead'
+
+def open_task_queue(url, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Open a task queue from a sqlite:/// or redis:// URL"""
+
+    if url.startswith('sqlite:///'):
+        return SQLiteTaskQueue(url[len('sqlite:///'):], max_attempts=max_attempts)
+    if url.startswith(('redis://', 'rediss://')):
+        return RedisTaskQueue(url, max_attempts=max_attempts)
+
+    raise ValueError(f"Unsupported task queue URL: {url}")
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+class SQLiteTaskQueue:
+    """Task queue in a SQLite file (safe across processes on one host)"""
+
+    def __init__(self, path, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                job_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                lease TEXT,
+                last_error TEXT,
+                result TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, visible_at);
+        """)
+
+    def _transaction(self, func):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                value = func(self._conn)
+                self._conn.execute('COMMIT')
+                return value
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def enqueue(self, job_id, url):
+        """Queue a scan; returns False if the job is already queued or running"""
+
+        def run(conn):
+            now = time.time()
+            row = conn.execute('SELECT status FROM tasks WHERE job_id = ?', (job_id,)).fetchone()
+
+            if row and row[0] in (PENDING, CLAIMED):
+                return False
+
+            # New job, or a re-check of a finished/dead one
+            conn.execute(
+                'INSERT OR REPLACE INTO tasks (job_id, url, status, attempts, visible_at, updated_at) '
+                'VALUES (?, ?, ?, 0, ?, ?)',
+                (job_id, url, PENDING, now, now),
+            )
+            return True
+
+        return self._transaction(run)
+
+    def claim(self, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT):
+        """Lease the next ready task, or None when nothing is ready"""
+
+        def run(conn):
+            now = time.time()
+
+            # Leases that expired past the last attempt are dead
+            conn.execute(
+                'UPDATE tasks SET status = ?, updated_at = ? '
+                'WHERE status = ? AND visible_at <= ? AND attempts >= ?',
+                (DEAD, now, CLAIMED, now, self.max_attempts),
+            )
+
+            row = conn.execute(
+                'SELECT job_id, url, attempts FROM tasks '
+                'WHERE status IN (?, ?) AND visible_at <= ? '
+                'ORDER BY visible_at LIMIT 1',
+                (PENDING, CLAIMED, now),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            job_id, url, attempts = row
+            lease = uuid.uuid4().hex
+            conn.execute(
+                'UPDATE tasks SET status = ?, attempts = ?, visible_at = ?, lease = ?, updated_at = ? '
+                'WHERE job_id = ?',
+                (CLAIMED, attempts + 1, now + visibility_timeout, lease, now, job_id),
+            )
+            return {'job_id': job_id, 'url': url, 'attempts': attempts + 1, 'lease': lease}
+
+        return self._transaction(run)
+
+    def ack(self, task, result):
+        """Mark a claimed task done and store its result"""
+
+        def run(conn):
+            cursor = conn.execute(
+                'UPDATE tasks SET status = ?, result = ?, lease = NULL, updated_at = ? '
+                'WHERE job_id = ? AND lease = ?',
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), task['job_id'], task['lease']),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(run)
+
+    def fail(self, task, error, retry_delay=30, permanent=False):
+        """
+        Release a claimed task for retry (or to the dead list when out of
+        attempts, or right away if the failure is permanent)
+        """
+
+        def run(conn):
+            now = time.time()
+            status = DEAD if permanent or task['attempts'] >= self.max_attempts else PENDING
+            cursor = conn.execute(
+                'UPDATE tasks SET status = ?, visible_at = ?, lease = NULL, last_error = ?, updated_at = ? '
+                'WHERE job_id = ? AND lease = ?',
+                (status, now + retry_delay, str(error), now, task['job_id'], task['lease']),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(run)
+
+    def get_task(self, job_id):
+        """Status, attempts and result for a job ID (None if never queued)"""
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT url, status, attempts, last_error, result FROM tasks WHERE job_id = ?',
+                (job_id,),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        url, status, attempts, last_error, result = row
+        return {
+            'job_id': job_id,
+            'url': url,
+            'status': status,
+            'attempts': attempts,
+            'last_error': last_error,
+            'result': json.loads(result) if result else None,
+        }
+
+    def stats(self):
+        """Task counts by status"""
+
+        with self._lock:
+            rows = self._conn.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+# ============================================================================
+# REDIS BACKEND
+# ============================================================================
+
+# Move expired leases back to pending (or dead when out of attempts)
+_REDIS_REQUEUE = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+for _, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], job_id)
+    local key = ARGV[3] .. job_id
+    if tonumber(redis.call('HGET', key, 'attempts') or '0') >= tonumber(ARGV[2]) then
+        redis.call('HSET', key, 'status', 'dead')
+    else
+        redis.call('HSET', key, 'status', 'pending')
+        redis.call('LPUSH', KEYS[2], job_id)
+    end
+end
+return #expired
+"""
+
+# Pop the next pending task and lease it
+_REDIS_CLAIM = """
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then return nil end
+local key = ARGV[3] .. job_id
+redis.call('ZADD', KEYS[2], ARGV[1], job_id)
+local attempts = redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('HSET', key, 'status', 'claimed', 'lease', ARGV[2])
+return {job_id, redis.call('HGET', key, 'url'), attempts}
+"""
+
+# Finish a task only if the caller still holds its lease
+_REDIS_FINISH = """
+local key = ARGV[3] .. ARGV[1]
+if redis.call('HGET', key, 'lease') ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', key, 'lease')
+redis.call('HSET', key, 'status', ARGV[4], ARGV[5], ARGV[6])
+if ARGV[4] == 'pending' then
+    redis.call('ZADD', KEYS[2], ARGV[7], ARGV[1])
+end
+return 1
+"""
+
+class RedisTaskQueue:
+    """Task queue in Redis (pending list + in-flight sorted set + task hashes)"""
+
+    def __init__(self, url, prefix='scamdetector', max_attempts=DEFAULT_MAX_ATTEMPTS):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Redis task queue needs the 'redis' package: pip install redis")
+
+        self.max_attempts = max_attempts
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.pending_key = f"{prefix}:pending"
+        self.inflight_key = f"{prefix}:inflight"
+        self.task_prefix = f"{prefix}:task:"
+
+        self._requeue = self.client.register_script(_REDIS_REQUEUE)
+        self._claim = self.client.register_script(_REDIS_CLAIM)
+        self._finish = self.client.register_script(_REDIS_FINISH)
+
+    def enqueue(self, job_id, url):
+        """Queue a scan; returns False if the job is already queued or running"""
+
+        key = self.task_prefix + job_id
+        status = self.client.hget(key, 'status')
+
+        if status in (PENDING, CLAIMED):
+            return False
+
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={'url': url, 'status': PENDING, 'attempts': 0})
+        pipe.lpush(self.pending_key, job_id)
+        pipe.execute()
+        return True
+
+    def claim(self, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT):
+        """Lease the next ready task, or None when nothing is ready"""
+
+        now = time.time()
+        self._requeue(
+            keys=[self.inflight_key, self.pending_key],
+            args=[now, self.max_attempts, self.task_prefix],
+        )
+
+        lease = uuid.uuid4().hex
+        row = self._claim(
+            keys=[self.pending_key, self.inflight_key],
+            args=[now + visibility_timeout, lease, self.task_prefix],
+        )
+        if not row:
+            return None
+
+        job_id, url, attempts = row
+        return {'job_id': job_id, 'url': url, 'attempts': int(attempts), 'lease': lease}
+
+    def ack(self, task, result):
+        """Mark a claimed task done and store its result"""
+
+        return bool(self._finish(
+            keys=[self.inflight_key, self.inflight_key],
+            args=[task['job_id'], task['lease'], self.task_prefix,
+                  DONE, 'result', json.dumps(result, ensure_ascii=False), 0],
+        ))
+
+    def fail(self, task, error, retry_delay=30, permanent=False):
+        """
+        Release a claimed task for retry (or to the dead list when out of
+        attempts, or right away if the failure is permanent)
+        """
+
+        # Retries wait in the in-flight set until retry_delay passes,
+        # then the requeue script moves them back to pending.
+        status = DEAD if permanent or task['attempts'] >= self.max_attempts else PENDING
+        return bool(self._finish(
+            keys=[self.inflight_key, self.inflight_key],
+            args=[task['job_id'], task['lease'], self.task_prefix,
+                  status, 'last_error', str(error), time.time() + retry_delay],
+        ))
+
+    def get_task(self, job_id):
+        """Status, attempts and result for a job ID (None if never queued)"""
+
+        task = self.client.hgetall(self.task_prefix + job_id)
+        if not task:
+            return None
+
+        return {
+            'job_id': job_id,
+            'url': task.get('url'),
+            'status': task.get('status'),
+            'attempts': int(task.get('attempts', 0)),
+            'last_error': task.get('last_error'),
+            'result': json.loads(task['result']) if task.get('result') else None,
+        }
+
+    def stats(self):
+        """Approximate task counts (pending and in-flight)"""
+
+        return {
+            PENDING: self.client.llen(self.pending_key),
+            CLAIMED: self.client.zcard(self.inflight_key),
+        }
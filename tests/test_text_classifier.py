@@ -0,0 +1,35 @@
+"""Regression tests for text_classifier.py feature hashing"""
+
+import numpy as np
+
+from text_classifier import FEATURE_BITS, TextClassifier, featurize
+
+def _classifier():
+    rng = np.random.default_rng(0)
+    return TextClassifier(rng.normal(size=2 ** FEATURE_BITS).astype(np.float32), bias=0.1)
+
+def test_nul_inside_a_posting_does_not_shift_postings():
+    titles = ['Data entry clerk', 'Software engineer', 'Remote assistant']
+    descriptions = ['Pay a\0 fee\0\0 to start', 'Build services in Python', 'Send your bank details']
+
+    probabilities = _classifier().predict_proba(titles, descriptions)
+
+    blanked = [text.replace('\0', ' ') for text in descriptions]
+    assert probabilities.shape == (3,)
+    assert np.allclose(probabilities, _classifier().predict_proba(titles, blanked))
+
+def test_postings_score_the_same_alone_and_batched():
+    titles = ['Data entry clerk', 'Software\0engineer']
+    descriptions = ['Pay a fee to start', 'Build services\0in Python']
+    classifier = _classifier()
+
+    batched = classifier.predict_proba(titles, descriptions)
+    alone = [classifier.predict_proba([title], [description])[0]
+             for title, description in zip(titles, descriptions)]
+
+    assert np.allclose(batched, alone)
+
+def test_features_stay_within_their_posting():
+    docs, _, scale = featurize(['a\0b\0c', 'd'], ['x', 'y\0z'])[0]
+    assert docs.max() < 2
+    assert len(scale) == 2
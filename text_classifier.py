@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Text Classifier - hashed n-gram logistic regression for job postings
+
+Features are hashed char 3-5 grams plus word unigrams/bigrams of the title
+and description (kept apart so "intern" in a title and in a description
+get separate weights). Hashing is fully vectorized: every posting in a
+batch is packed into one byte buffer and each n-gram's hash comes from a
+polynomial prefix-hash array, so scoring thousands of postings is a
+handful of numpy operations.
+
+The model is a weight vector in a compressed .npz file (SCAM_MODEL_PATH).
+Train it offline from labeled scan history:
+
+    python text_classifier.py train --labels labels.csv --store scan_store.db
+    python text_classifier.py train --jsonl labeled_postings.jsonl
+    python text_classifier.py score --store scan_store.db
+
+labels.csv has columns job_id,label (1 = scam, 0 = legitimate). The JSONL
+form has job_title, description and label per line.
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.environ.get('SCAM_MODEL_PATH', 'scam_model.npz')
+
+# Hashed feature space (2^18 float32 weights = 1 MB before compression)
+FEATURE_BITS = 18
+CHAR_NGRAMS = (3, 4, 5)
+
+# Postings hashed per numpy batch (bounds temporary memory)
+BATCH_SIZE = 2000
+
+# Longest description text used for features
+MAX_TEXT_CHARS = 3000
+
+# Hash arithmetic is mod 2^32: plenty of entropy for 2^18 buckets and half
+# the memory traffic of 64-bit lanes
+_P = np.uint32(0x01000193)                # odd multiplier (FNV-32 prime)
+_P_INV = np.uint32(pow(0x01000193, -1, 2 ** 32))
+_MIX = np.uint32(0x9E3779B1)
+_SPACE = np.uint32(ord(' ') + 1)
+_SEPARATOR = np.uint32(1)                 # byte 0 + 1: boundary between postings
+
+# Byte table: lowercase letters/digits/$/% kept, everything else -> space
+# (NUL is kept: it separates postings in a packed batch, so _pack blanks
+# any NUL inside a posting first)
+_KEEP = set(b'abcdefghijklmnopqrstuvwxyz0123456789$%\0')
+_NORMALIZE_TABLE = bytes(
+    byte if byte in _KEEP else (byte + 32 if 65 <= byte <= 90 else 32)
+    for byte in range(256)
+)
+_SPACES = re.compile(rb' {2,}')
+
+# ============================================================================
+# VECTORIZED FEATURE HASHING
+# ============================================================================
+
+def _pack(texts):
+    """One normalized byte buffer for a batch: ' words ... \\0 words ... '"""
+
+    joined = ' \0 '.join((text or '')[:MAX_TEXT_CHARS].replace('\0', ' ') for text in texts)
+    normalized = _SPACES.sub(b' ', f' {joined} '.encode('utf-8', 'ignore').translate(_NORMALIZE_TABLE))
+    return np.frombuffer(normalized, dtype=np.uint8).astype(np.uint32) + np.uint32(1)
+
+_power_tables = (np.ones(1, dtype=np.uint32), np.ones(1, dtype=np.uint32))
+
+def _powers(length):
+    """P^i and P^-i mod 2^32 for i < length (cached, grown by doubling)"""
+
+    global _power_tables
+
+    powers, inverse_powers = _power_tables
+    if len(powers) < length:
+        size = max(length, 2 * len(powers))
+        with np.errstate(over='ignore'):
+            powers = np.empty(size, dtype=np.uint32)
+            powers[0] = 1
+            powers[1:] = np.cumprod(np.full(size - 1, _P, dtype=np.uint32), dtype=np.uint32)
+            inverse_powers = np.empty(size, dtype=np.uint32)
+            inverse_powers[0] = 1
+            inverse_powers[1:] = np.cumprod(np.full(size - 1, _P_INV, dtype=np.uint32), dtype=np.uint32)
+        _power_tables = (powers, inverse_powers)
+
+    return powers[:length], inverse_powers[:length]
+
+def _hash_features(texts, salt, feature_bits=FEATURE_BITS):
+    """
+    Hashed n-gram features for a list of texts
+
+    Returns (doc_index, feature_index, doc_scale): one entry per feature
+    occurrence, plus a per-text scale giving each text a unit L2 norm.
+    """
+
+    codes = _pack(texts)
+    length = len(codes)
+    powers, inverse_powers = _powers(length + 1)
+
+    with np.errstate(over='ignore'):
+        # Polynomial hash of codes[a:b] = (G[b] - G[a]) * P^(b-1), mod 2^32
+        prefix = np.zeros(length + 1, dtype=np.uint32)
+        prefix[1:] = np.cumsum(codes * inverse_powers[:length], dtype=np.uint32)
+
+        shift = np.uint32(32 - feature_bits)
+
+        def bucket(hashes, kind):
+            hashes = (hashes ^ np.uint32(salt * 131 + kind)) * _MIX
+            return (hashes >> shift).astype(np.intp)
+
+        def substring_hashes(starts, ends, kind):
+            return bucket((prefix[ends] - prefix[starts]) * powers[ends - 1], kind)
+
+        # separators[i] = separators before position i = the posting index,
+        # and windows that contain a separator span two postings (dropped)
+        separators = np.zeros(length + 1, dtype=np.int32)
+        separators[1:] = np.cumsum(codes == _SEPARATOR, dtype=np.int32)
+
+        doc_parts, feature_parts = [], []
+
+        # Char n-gram windows are contiguous, so everything here is slicing
+        for n in CHAR_NGRAMS:
+            if length < n:
+                continue
+            valid = separators[n:] == separators[:-n]
+            hashes = (prefix[n:] - prefix[:-n]) * powers[n - 1:-1]
+            doc_parts.append(separators[:-n][valid])
+            feature_parts.append(bucket(hashes[valid], n))
+
+        # Words: every word is bounded by single spaces after normalization
+        is_space = (codes == _SPACE) | (codes == _SEPARATOR)
+        word_starts = np.flatnonzero(~is_space[1:] & is_space[:-1]) + 1
+        word_ends = np.flatnonzero(~is_space[:-1] & is_space[1:]) + 1
+        word_docs = separators[word_starts]
+
+        doc_parts.append(word_docs)
+        feature_parts.append(substring_hashes(word_starts, word_ends, 1))
+
+        same_doc = word_docs[:-1] == word_docs[1:]
+        doc_parts.append(word_docs[:-1][same_doc])
+        feature_parts.append(substring_hashes(word_starts[:-1][same_doc], word_ends[1:][same_doc], 2))
+
+    # Each part is sorted by posting, so per-posting counts are a searchsorted away
+    boundaries = np.arange(len(texts) + 1)
+    counts = sum(np.diff(np.searchsorted(part, boundaries)) for part in doc_parts)
+    doc_scale = 1.0 / np.sqrt(np.maximum(counts, 1))
+
+    return np.concatenate(doc_parts), np.concatenate(feature_parts), doc_scale
+
+def featurize(titles, descriptions, feature_bits=FEATURE_BITS):
+    """
+    Sparse features of postings: title and description hashed apart
+
+    Returns a list of (doc_index, feature_index, doc_scale) blocks.
+    """
+
+    return [
+        _hash_features(titles, 1, feature_bits),
+        _hash_features(descriptions, 2, feature_bits),
+    ]
+
+def _logits(blocks, weights, bias, count):
+    logits = np.full(count, bias, dtype=np.float64)
+    for docs, features, doc_scale in blocks:
+        logits += np.bincount(docs, weights=weights[features], minlength=count) * doc_scale
+    return logits
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -30, 30)))
+
+# ============================================================================
+# MODEL
+# ============================================================================
+
+class TextClassifier:
+    """Linear model over hashed features"""
+
+    def __init__(self, weights, bias=0.0, feature_bits=FEATURE_BITS):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.feature_bits = feature_bits
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        with np.load(path) as data:
+            return cls(data['weights'], float(data['bias']), int(data['feature_bits']))
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        np.savez_compressed(
+            path,
+            weights=self.weights.astype(np.float16),
+            bias=np.float32(self.bias),
+            feature_bits=np.int32(self.feature_bits),
+        )
+
+    def predict_proba(self, titles, descriptions):
+        """Scam probability for each posting (vectorized, batched)"""
+
+        probabilities = []
+
+        for offset in range(0, len(titles), BATCH_SIZE):
+            batch_titles = titles[offset:offset + BATCH_SIZE]
+            blocks = featurize(batch_titles, descriptions[offset:offset + BATCH_SIZE], self.feature_bits)
+            probabilities.append(_sigmoid(_logits(blocks, self.weights, self.bias, len(batch_titles))))
+
+        return np.concatenate(probabilities) if probabilities else np.zeros(0)
+
+def train(titles, descriptions, labels, feature_bits=FEATURE_BITS, epochs=300,
+          learning_rate=0.5, l2=1e-4, verbose=True):
+    """Fit logistic regression with full-batch Adagrad on hashed features"""
+
+    labels = np.asarray(labels, dtype=np.float32)
+    blocks = featurize(titles, descriptions, feature_bits)
+
+    dimension = 2 ** feature_bits
+    weights = np.zeros(dimension, dtype=np.float32)
+    bias = 0.0
+    accumulated = np.full(dimension, 1e-8, dtype=np.float32)
+    bias_accumulated = 1e-8
+
+    for epoch in range(epochs):
+        logits = _logits(blocks, weights, bias, len(labels))
+        errors = _sigmoid(logits) - labels
+
+        gradient = np.zeros(dimension, dtype=np.float64)
+        for docs, features, doc_scale in blocks:
+            gradient += np.bincount(features, weights=(errors * doc_scale)[docs], minlength=dimension)
+        gradient = gradient.astype(np.float32) / len(labels) + l2 * weights
+        accumulated += gradient ** 2
+        weights -= learning_rate * gradient / np.sqrt(accumulated)
+
+        bias_gradient = float(errors.mean())
+        bias_accumulated += bias_gradient ** 2
+        bias -= learning_rate * bias_gradient / np.sqrt(bias_accumulated)
+
+        if verbose and (epoch + 1) % 50 == 0:
+            probabilities = np.clip(_sigmoid(logits), 1e-7, 1 - 1e-7)
+            loss = -np.mean(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities))
+            print(f"   epoch {epoch + 1:>4}  log loss {loss:.4f}")
+
+    return TextClassifier(weights, bias, feature_bits)
+
+# ============================================================================
+# SCORING HOOK FOR analyze_job
+# ============================================================================
+
+_model = None
+_model_loaded = False
+
+def get_model(path=DEFAULT_MODEL_PATH):
+    """The trained model at SCAM_MODEL_PATH, or None if there isn't one"""
+
+    global _model, _model_loaded
+
+    if not _model_loaded:
+        _model_loaded = True
+        if path and os.path.exists(path):
+            _model = TextClassifier.load(path)
+
+    return _model
+
+def score_postings(job_datas):
+    """Scam probabilities for job_data dicts (None when no model is trained)"""
+
+    model = get_model()
+    if model is None or not job_datas:
+        return None
+
+    probabilities = model.predict_proba(
+        [job_data.get('job_title', '') for job_data in job_datas],
+        [job_data.get('description', '') for job_data in job_datas],
+    )
+    return [float(p) for p in probabilities]
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def load_labeled_jsonl(path):
+    titles, descriptions, labels = [], [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                titles.append(row.get('job_title', ''))
+                descriptions.append(row.get('description', ''))
+                labels.append(int(row['label']))
+    return titles, descriptions, labels
+
+def load_labeled_history(labels_path, store):
+    titles, descriptions, labels = [], [], []
+    with open(labels_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            scan = store.get_scan(row['job_id'])
+            if scan:
+                job_data = scan['result']['job_data']
+                titles.append(job_data['job_title'])
+                descriptions.append(job_data['description'])
+                labels.append(int(row['label']))
+    return titles, descriptions, labels
+
+def main():
+    parser = argparse.ArgumentParser(description='Train or run the posting text classifier')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='fit the model from labeled postings')
+    train_parser.add_argument('--labels', help='CSV of job_id,label joined with the scan store')
+    train_parser.add_argument('--store', help='scan store path (defaults to SCAN_STORE_PATH)')
+    train_parser.add_argument('--jsonl', help='JSONL with job_title, description, label')
+    train_parser.add_argument('--epochs', type=int, default=300)
+
+    score_parser = subparsers.add_parser('score', help='score every posting in the scan store')
+    score_parser.add_argument('--store', help='scan store path (defaults to SCAN_STORE_PATH)')
+
+    args = parser.parse_args()
+
+    from scan_store import ScanStore, DEFAULT_STORE_PATH
+    store = ScanStore(args.store or DEFAULT_STORE_PATH) if (args.command == 'score' or args.labels) else None
+
+    if args.command == 'train':
+        if args.jsonl:
+            titles, descriptions, labels = load_labeled_jsonl(args.jsonl)
+        elif args.labels:
+            titles, descriptions, labels = load_labeled_history(args.labels, store)
+        else:
+            parser.error('train needs --labels or --jsonl')
+
+        print(f"[*] Training on {len(labels)} postings ({sum(labels)} scams)...")
+        model = train(titles, descriptions, labels, epochs=args.epochs)
+        model.save(args.model)
+        print(f"✅ Saved model to {args.model} ({os.path.getsize(args.model):,} bytes)")
+
+    elif args.command == 'score':
+        model = TextClassifier.load(args.model)
+        scans = list(store.iter_scans())
+        probabilities = model.predict_proba(
+            [scan['result']['job_data']['job_title'] for scan in scans],
+            [scan['result']['job_data']['description'] for scan in scans],
+        )
+        for scan, probability in sorted(zip(scans, probabilities), key=lambda pair: -pair[1]):
+            print(f"{probability:6.1%}  {scan['job_id']}  {scan['result']['job_data']['job_title'][:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Scan Worker - pulls scan tasks from a shared queue and runs the scanner
+
+Run one worker per host (each with a few browser threads); adding hosts
+that point at the same queue raises throughput roughly linearly.
+--concurrency is the most browsers a host runs at once; an adaptive limit
+(adaptive_limits.py) starts at half of it and follows scrape latency and
+failures, so a struggling host claims fewer tasks. Scans run in the batch
+priority class (scan_scheduler.py).
+
+Usage:
+    python worker.py enqueue urls.txt --queue sqlite:///tasks.db
+    python worker.py enqueue dump.txt --skip-seen      # drop IDs seen in earlier dumps
+    python worker.py run --queue sqlite:///tasks.db --concurrency 2
+    python worker.py run --queue redis://queue-host:6379/0 --store /shared/scan_store.db
+    python worker.py run --concurrency 4 --fixed-concurrency   # always 4 browsers
+    python worker.py stats --queue sqlite:///tasks.db
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+
+from adaptive_limits import format_limits, limits_metrics, make_limits, report_periodically, set_limits
+from job_urls import normalize_job_url, read_job_urls
+from scan_scheduler import BATCH, scan_priority
+from task_queue import open_task_queue, DEFAULT_VISIBILITY_TIMEOUT, DEFAULT_MAX_ATTEMPTS
+
+DEFAULT_QUEUE_URL = os.environ.get('SCAN_QUEUE_URL', 'sqlite:///tasks.db')
+
+# ============================================================================
+# ENQUEUE
+# ============================================================================
+
+def enqueue_urls(task_queue, job_urls, seen=None):
+    """
+    Queue scan tasks for LinkedIn job URLs; returns (queued, skipped)
+
+    seen: optional seen_filter.SeenJobs; job IDs it has seen before are
+    skipped
+    """
+
+    queued = skipped = 0
+
+    for job_url in job_urls:
+        job_id, view_url = normalize_job_url(job_url)
+        if not job_id or (seen and not seen.is_new(job_id)):
+            skipped += 1
+            continue
+
+        if task_queue.enqueue(job_id, view_url):
+            queued += 1
+        else:
+            skipped += 1
+
+    return queued, skipped
+
+# ============================================================================
+# WORKER LOOP
+# ============================================================================
+
+class ClaimGate:
+    """
+    Claimed tasks per host, kept within the current scrape limit
+
+    A thread reserves a place before claiming and gives it back once the
+    task is done (or nothing was claimed). The limit is re-read on every
+    wait, so the gate follows it as it adapts.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.claimed = 0
+        self._cond = threading.Condition()
+
+    def reserve(self, timeout):
+        """Wait up to timeout seconds for a place; False if none came free"""
+
+        with self._cond:
+            if self.claimed >= self.limit.limit:
+                # Work is waiting on the limit, so it may grow
+                self.limit.mark_saturated()
+            if not self._cond.wait_for(lambda: self.claimed < self.limit.limit, timeout):
+                return False
+            self.claimed += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.claimed -= 1
+            self._cond.notify_all()
+
+def run_worker(task_queue, concurrency=2, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT,
+               poll_interval=5, store=None, stop_event=None, verbose=True, adaptive=True,
+               report_interval=60):
+    """
+    Claim and scan tasks on `concurrency` threads until stop_event is set
+
+    Each task is scanned with scan_linkedin_job; its result is written to
+    the task queue's result store (and the scan store, if one is given).
+
+    At most as many tasks as the scrape limit allows are claimed at once
+    (ClaimGate), so leases aren't taken for work that would wait for a
+    browser. adaptive: the limit follows scrape latency and failures
+    (otherwise it's concurrency)
+    """
+
+    from detector_scam import scan_linkedin_job
+
+    stop_event = stop_event or threading.Event()
+    worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+    if adaptive:
+        limits = make_limits(scrapes=max(1, concurrency // 2), max_scrapes=concurrency)
+    else:
+        limits = make_limits(scrapes=concurrency, fixed=True)
+    set_limits(limits)
+    if verbose and report_interval:
+        report_periodically(report_interval, stop_event, output=lambda line: print(f"[{worker_name}] {line}"))
+
+    gate = ClaimGate(limits['scrape'])
+
+    def scan(thread_index, task):
+        if verbose:
+            print(f"[{worker_name}/{thread_index}] Scanning {task['url']} (attempt {task['attempts']})")
+
+        try:
+            with scan_priority(BATCH):
+                result = scan_linkedin_job(task['url'], verbose=False, store=store)
+        except Exception as e:
+            result = None
+            error = e
+        else:
+            error = result if result is not None else 'error: Could not scrape job data'
+
+        if result:
+            if not task_queue.ack(task, result) and verbose:
+                print(f"   [!] Lease on {task['job_id']} expired before ack")
+        else:
+            # Expired and missing postings go straight to the dead list
+            task_queue.fail(task, error, permanent=getattr(result, 'permanent', False))
+            if verbose:
+                print(f"   [!] {task['job_id']} failed: {error}")
+
+    def loop(thread_index):
+        while not stop_event.is_set():
+            # Take a slot before claiming, so no lease waits for a browser
+            if not gate.reserve(poll_interval):
+                continue
+
+            task = task_queue.claim(visibility_timeout)
+
+            if not task:
+                gate.release()
+                stop_event.wait(poll_interval)
+                continue
+
+            try:
+                scan(thread_index, task)
+            finally:
+                gate.release()
+
+    threads = [threading.Thread(target=loop, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        if verbose:
+            print("\n[*] Stopping after in-flight scans finish...")
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        if verbose:
+            print(f"[{worker_name}] Final limits: {format_limits(limits_metrics())}")
+        set_limits(None)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Distributed scan worker')
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_URL, help='sqlite:///path or redis://host')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = subparsers.add_parser('enqueue', help='queue job URLs from a file')
+    enqueue.add_argument('input', help='LinkedIn job URLs: text (one per line), CSV or JSON lines export')
+    enqueue.add_argument('--field', help='CSV column or JSON key holding the URL (default: whole lines)')
+    enqueue.add_argument('--skip-seen', action='store_true',
+                         help='skip job IDs handed out by an earlier run (Bloom filter + seen-ID table)')
+    enqueue.add_argument('--seen-filter', help='Bloom filter path (defaults to SEEN_FILTER_PATH)')
+
+    run = subparsers.add_parser('run', help='claim and scan tasks')
+    run.add_argument('--concurrency', type=int, default=2, help='browser threads on this host')
+    run.add_argument('--visibility-timeout', type=float, default=DEFAULT_VISIBILITY_TIMEOUT)
+    run.add_argument('--poll-interval', type=float, default=5)
+    run.add_argument('--store', help='scan store path (defaults to SCAN_STORE_PATH)')
+    run.add_argument('--fixed-concurrency', action='store_true',
+                     help='always run --concurrency browsers instead of adapting')
+
+    subparsers.add_parser('stats', help='show task counts')
+
+    args = parser.parse_args()
+    task_queue = open_task_queue(args.queue, max_attempts=args.max_attempts)
+
+    if args.command == 'enqueue':
+        seen = None
+        if args.skip_seen:
+            from seen_filter import ConfirmedSeen, SeenJobs, DEFAULT_FILTER_PATH
+            seen = SeenJobs(ConfirmedSeen(args.seen_filter or DEFAULT_FILTER_PATH))
+
+        # Duplicate job IDs within the file are dropped while reading
+        queued, skipped = enqueue_urls(task_queue, read_job_urls(args.input, field=args.field), seen)
+        print(f"✅ Queued {queued} task(s), skipped {skipped} (already queued or seen)")
+
+    elif args.command == 'run':
+        store = None
+        if args.store:
+            from scan_store import ScanStore
+            store = ScanStore(args.store)
+
+        run_worker(
+            task_queue,
+            concurrency=args.concurrency,
+            visibility_timeout=args.visibility_timeout,
+            poll_interval=args.poll_interval,
+            store=store,
+            adaptive=not args.fixed_concurrency,
+        )
+
+    elif args.command == 'stats':
+        for status, count in sorted(task_queue.stats().items()):
+            print(f"{status:>8}: {count}")
+
+
+if __name__ == "__main__":
+    main()